@@ -3,10 +3,11 @@ from logging.config import fileConfig
 
 from alembic import context
 from environs import Env
-from sqlalchemy import pool
+from sqlalchemy import inspect, pool
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
+from app.database.backends import get_backend
 from app.database.models import BaseModel
 
 # this is the Alembic Config object, which provides
@@ -55,6 +56,15 @@ def run_migrations_offline() -> None:
 def do_run_migrations(connection: Connection) -> None:
     context.configure(connection=connection, target_metadata=target_metadata)
 
+    backend = get_backend(connection.dialect.name)
+    if backend.name != "sqlite" and not inspect(connection).has_table("alembic_version"):
+        # The revisions replay the SQLite schema's history; other backends
+        # start from the current models and only apply later revisions.
+        with context.begin_transaction():
+            backend.create_schema(connection)
+            context.get_context().stamp(context.script, "head")
+        return
+
     with context.begin_transaction():
         context.run_migrations()
 
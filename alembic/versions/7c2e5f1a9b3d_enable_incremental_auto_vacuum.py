@@ -0,0 +1,37 @@
+"""Enable incremental auto_vacuum on SQLite
+
+Revision ID: 7c2e5f1a9b3d
+Revises: d793ea79a475
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5f1a9b3d'
+down_revision: Union[str, Sequence[str], None] = 'd793ea79a475'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _set_auto_vacuum(mode: str) -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    # The mode of an existing database only changes with a full VACUUM,
+    # which rewrites the file and can't run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.execute(f"PRAGMA auto_vacuum = {mode}")
+        op.execute("VACUUM")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _set_auto_vacuum("INCREMENTAL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _set_auto_vacuum("NONE")
@@ -1,9 +1,14 @@
+import argparse
+import asyncio
 import logging
+import signal
 import time
 from contextlib import suppress
 
 from aiogram import Dispatcher, Bot
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.exceptions import TelegramRetryAfter
 from aiogram.fsm.storage.base import DefaultKeyBuilder
 from aiogram.fsm.storage.redis import RedisStorage
@@ -15,84 +20,212 @@ from .api.mytonprovider import MytonproviderClient
 from .api.toncenter import ToncenterClient
 from .bot import commands, middlewares, handlers, dialogs
 from .bot.broadcaster import Broadcaster
+from .bot.outbox import Outbox, OutboxConsumer
 from .bot.utils.i18n import I18N
-from .config import BOT_TOKEN, REDIS_URL
+from .bot.utils.profiles import UserProfiles
+from .bot.utils.snapshots import ProvidersIndex
+from .bot.webhook import run_webhook
+from .cache import MetricsCache
+from .config import (
+    BOT_TOKEN,
+    CPU_WORKERS,
+    LOCALES_RELOAD_INTERVAL,
+    LOOP_LAG_INTERVAL,
+    LOOP_LAG_WARN,
+    METRICS_HOST,
+    METRICS_PORT,
+    PROVIDERS_INDEX_POLL_INTERVAL,
+    REDIS_URL,
+    SERIES_DIR,
+    SQL_PROFILER,
+    SQL_PROFILER_SLOW_MS,
+    TELEGRAM_API_URL,
+    USER_PROFILE_TTL,
+    WEBHOOK_URL,
+)
 from .context import Context, set_context
 from .database.database import Database
+from .database.series import SeriesStore
+from .events import EventBus
 from .logging import setup_logging
+from .monitoring import MetricsServer, SqlProfiler
+from .roles import Roles
+from .runtime import CpuPool, LoopLagMonitor
 from .scheduler.scheduler import Scheduler
 
-setup_logging()
 logger = logging.getLogger("app.main")
 
 
+def runs_bot(ctx: Context) -> bool:
+    return ctx.role in (Roles.BOT, Roles.ALL)
+
+
+def runs_worker(ctx: Context) -> bool:
+    return ctx.role in (Roles.WORKER, Roles.ALL)
+
+
 async def on_startup(ctx: Context) -> None:
-    logger.info("App startup initiated...")
+    logger.info("App startup initiated (role: %s)...", ctx.role.value)
 
     ctx.started_at = time.time()
+    ctx.loop_lag.start()
+    if ctx.metrics_server is not None:
+        await ctx.metrics_server.start()
     await ctx.db.start()
-    await ctx.scheduler.start()
-
-    middlewares.register(ctx.dp, ctx.bot)
-    handlers.register(ctx.dp)
-    dialogs.register(ctx.dp)
-    setup_dialogs(ctx.dp)
-    await ctx.mytonprovider.ensure_session()
-    await ctx.toncenter.ensure_session()
-
-    with suppress(TelegramRetryAfter):
-        await commands.setup(ctx)
+    if LOCALES_RELOAD_INTERVAL > 0:
+        ctx.i18n.start_watching(LOCALES_RELOAD_INTERVAL)
+
+    if runs_bot(ctx):
+        if ctx.role == Roles.BOT:
+            ctx.providers_index.start_following(
+                ctx.db.read_session_factory,
+                ctx.metrics_cache,
+                PROVIDERS_INDEX_POLL_INTERVAL,
+            )
+            ctx.outbox_consumer.start()
+        await ctx.providers_index.rebuild(ctx.db.read_session_factory)
+
+        middlewares.register(ctx.dp, ctx.bot)
+        handlers.register(ctx.dp)
+        dialogs.register(ctx.dp)
+        setup_dialogs(ctx.dp)
+        if ctx.sql_profiler is not None:
+            middlewares.register_sql_profiler(ctx.dp, ctx.sql_profiler)
+
+    if runs_worker(ctx):
+        ctx.cpu.start()
+        await ctx.mytonprovider.ensure_session()
+        await ctx.toncenter.ensure_session()
+        await ctx.scheduler.start()
+
+    if runs_bot(ctx):
+        with suppress(TelegramRetryAfter):
+            await commands.setup(ctx)
     logger.info("App startup complete")
 
 
 async def on_shutdown(ctx: Context) -> None:
     logger.info("App shutdown initiated...")
 
-    with suppress(TelegramRetryAfter):
-        await commands.delete(ctx)
-    await ctx.bot.session.close()
-
-    await ctx.mytonprovider.close()
-    await ctx.toncenter.close()
-
-    await ctx.scheduler.shutdown()
+    if runs_worker(ctx):
+        await ctx.scheduler.shutdown()
+        await ctx.mytonprovider.close()
+        await ctx.toncenter.close()
+        await ctx.cpu.shutdown()
+
+    if runs_bot(ctx):
+        with suppress(TelegramRetryAfter):
+            await commands.delete(ctx)
+        if ctx.role == Roles.BOT:
+            await ctx.outbox_consumer.shutdown()
+            await ctx.providers_index.shutdown()
+        await ctx.bot.session.close()
+
+    await ctx.i18n.shutdown()
+    await ctx.events.shutdown()
     await ctx.db.shutdown()
+    await ctx.loop_lag.shutdown()
+    if ctx.metrics_server is not None:
+        await ctx.metrics_server.shutdown()
     logger.info("App shutdown complete")
 
 
-async def main() -> None:
-    logger.info("Preparing app...")
-
+def build_context(role: Roles) -> Context:
     ctx = Context()
+    ctx.role = role
     ctx.db = Database()
-    ctx.scheduler = Scheduler()
+    ctx.series = SeriesStore(SERIES_DIR) if SERIES_DIR else None
+    ctx.events = EventBus()
     ctx.redis = Redis.from_url(url=REDIS_URL)
-
-    properties = DefaultBotProperties(
-        parse_mode=SULGUK_PARSE_MODE,
-        link_preview_is_disabled=True,
-    )
-    storage = RedisStorage(
-        redis=ctx.redis,
-        key_builder=DefaultKeyBuilder(with_destiny=True),
+    ctx.metrics_cache = MetricsCache(ctx.redis)
+    ctx.i18n = I18N()
+    ctx.loop_lag = LoopLagMonitor(LOOP_LAG_INTERVAL, LOOP_LAG_WARN)
+    ctx.metrics_server = (
+        MetricsServer(METRICS_HOST, METRICS_PORT) if METRICS_PORT else None
     )
-    ctx.bot = Bot(BOT_TOKEN, default=properties)
-    ctx.dp = Dispatcher(storage=storage, ctx=ctx)
 
-    ctx.broadcaster = Broadcaster(ctx.bot)
-    ctx.toncenter = ToncenterClient()
-    ctx.mytonprovider = MytonproviderClient()
-    ctx.i18n = I18N()
+    if runs_bot(ctx):
+        properties = DefaultBotProperties(
+            parse_mode=SULGUK_PARSE_MODE,
+            link_preview_is_disabled=True,
+        )
+        storage = RedisStorage(
+            redis=ctx.redis,
+            key_builder=DefaultKeyBuilder(with_destiny=True),
+        )
+        session = (
+            AiohttpSession(api=TelegramAPIServer.from_base(TELEGRAM_API_URL))
+            if TELEGRAM_API_URL
+            else None
+        )
+        ctx.bot = Bot(BOT_TOKEN, session=session, default=properties)
+        ctx.dp = Dispatcher(storage=storage, ctx=ctx)
+        ctx.providers_index = ProvidersIndex()
+        ctx.user_profiles = UserProfiles(USER_PROFILE_TTL)
+        ctx.sql_profiler = (
+            SqlProfiler(SQL_PROFILER_SLOW_MS / 1000) if SQL_PROFILER else None
+        )
+
+    if role == Roles.ALL:
+        ctx.broadcaster = Broadcaster(ctx.bot)
+    elif role == Roles.BOT:
+        # Messages from separate worker processes arrive through the outbox.
+        ctx.broadcaster = Broadcaster(ctx.bot)
+        ctx.outbox_consumer = OutboxConsumer(ctx.redis, ctx.broadcaster)
+    else:
+        ctx.broadcaster = Outbox(ctx.redis)
+
+    if runs_worker(ctx):
+        ctx.scheduler = Scheduler()
+        ctx.cpu = CpuPool(CPU_WORKERS)
+        ctx.toncenter = ToncenterClient()
+        ctx.mytonprovider = MytonproviderClient()
+    return ctx
+
+
+async def run_worker(ctx: Context) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await on_startup(ctx)
+    try:
+        await stop.wait()
+    finally:
+        await on_shutdown(ctx)
+
+
+async def main(role: Roles) -> None:
+    logger.info("Preparing app...")
+
+    ctx = build_context(role)
+    set_context(ctx)
+
+    if not runs_bot(ctx):
+        await run_worker(ctx)
+        return
 
     ctx.dp.startup.register(on_startup)
     ctx.dp.shutdown.register(on_shutdown)
-    set_context(ctx)
 
     allowed_updates = ctx.dp.resolve_used_update_types()
-    await ctx.dp.start_polling(ctx.bot, allowed_updates=allowed_updates)
+    if WEBHOOK_URL:
+        await run_webhook(ctx, allowed_updates)
+    else:
+        await ctx.bot.delete_webhook()
+        await ctx.dp.start_polling(ctx.bot, allowed_updates=allowed_updates)
 
 
 if __name__ == "__main__":
-    import asyncio
-
-    asyncio.run(main())
+    # Not at import time: spawned CpuPool workers import this module too.
+    setup_logging()
+    parser = argparse.ArgumentParser(prog="python -m app")
+    parser.add_argument(
+        "role",
+        nargs="?",
+        choices=[role.value for role in Roles],
+        default=Roles.ALL.value,
+        help="bot: handle updates; worker: run scheduled jobs; all: both (default)",
+    )
+    asyncio.run(main(Roles(parser.parse_args().role)))
@@ -10,6 +10,8 @@ from ..database.models import ProviderModel, TelemetryModel, TelemetryHistoryMod
 
 
 class AlertDetector:
+    # Base alerts that depend on the current time, not only on telemetry.
+    TIME_BASED_ALERTS: t.FrozenSet[AlertTypes] = frozenset({AlertTypes.PROVIDER_OFFLINE})
 
     def __init__(
         self,
@@ -54,6 +56,13 @@ class AlertDetector:
 
         return set(triggered)
 
+    def get_triggered_time_based_alerts(self) -> t.Set[t.Union[AlertTypes, str]]:
+        """Return the subset of base alerts in TIME_BASED_ALERTS that are triggered."""
+        triggered = set()
+        if self.is_provider_offline():
+            triggered.add(AlertTypes.PROVIDER_OFFLINE)
+        return triggered
+
     def get_triggered_service_alerts(
         self,
     ) -> t.List[t.Tuple[AlertTypes, t.Dict[str, t.Any]]]:
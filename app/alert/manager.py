@@ -1,17 +1,20 @@
+import hashlib
+import json
 import logging
 import typing as t
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from sqlalchemy import inspect
 
 from .detector import AlertDetector
 from .repository import AlertRepository
 from .types import AlertTypes, AlertStages
-from ..bot.utils.i18n import Localizer
 from ..config import TIMEZONE
 from ..context import Context
 from ..database.models import (
+    BaseModel,
     UserModel,
     ProviderModel,
     TelemetryModel,
@@ -30,6 +33,22 @@ def _ensure_aware(dt: datetime) -> datetime:
     return dt
 
 
+def _encode_payload(value: t.Any) -> t.Any:
+    # Rows are loaded once per cycle and not modified while alerts are sent,
+    # so their identity stands in for their content.
+    if isinstance(value, BaseModel):
+        identity = inspect(value).identity
+        if identity is not None:
+            return [value.__tablename__, *identity]
+        return value.model_dump()
+    return str(value)
+
+
+def _payload_digest(payload: t.Dict[str, t.Any]) -> bytes:
+    data = json.dumps(payload, sort_keys=True, default=_encode_payload)
+    return hashlib.blake2b(data.encode(), digest_size=16).digest()
+
+
 @dataclass
 class DispatchContext:
     entries: list = field(default_factory=list)
@@ -42,13 +61,30 @@ class AlertManager:
     def __init__(self, ctx: Context) -> None:
         self.ctx = ctx
         self.broadcaster = ctx.broadcaster
+        # Rendered messages, shared by subscribers with the same locale and
+        # payload. An AlertManager lives for one dispatch cycle or job run.
+        self._rendered: t.Dict[t.Tuple, t.Tuple[str, InlineKeyboardMarkup]] = {}
 
-    async def dispatch(self) -> None:
+    async def dispatch(
+        self,
+        pubkeys: t.Optional[t.Set[str]] = None,
+        time_based_only: bool = False,
+    ) -> None:
+        """Evaluate alerts for all providers, or only for the given pubkeys.
+
+        With ``time_based_only``, only alerts that change as time passes
+        (``AlertDetector.TIME_BASED_ALERTS``) are evaluated. Everything else
+        was evaluated when the data arrived, and re-checking unchanged data
+        would send edge-triggered service alerts twice.
+        """
         dc = DispatchContext()
+        self._rendered.clear()
 
         async with UnitOfWork(self.ctx.db.session_factory) as uow:
             repo = AlertRepository(uow)
-            dc.entries = await repo.get_providers_telemetry_with_prev_telemetry()
+            dc.entries = await repo.get_providers_telemetry_with_prev_telemetry(
+                pubkeys
+            )
             for provider, telemetry, telemetry_history in dc.entries:
                 users = await repo.get_subscribed_users(provider.pubkey)
                 dc.users_by_provider[provider.pubkey] = users
@@ -62,7 +98,7 @@ class AlertManager:
             users = dc.users_by_provider[provider.pubkey]
             for user in users:
                 await self._process_user_alerts(
-                    dc, user, provider, telemetry, telemetry_history
+                    dc, user, provider, telemetry, telemetry_history, time_based_only
                 )
 
     async def _process_user_alerts(
@@ -72,6 +108,7 @@ class AlertManager:
         provider: ProviderModel,
         telemetry: TelemetryModel,
         telemetry_history: TelemetryHistoryModel,
+        time_based_only: bool = False,
     ) -> None:
         bot_started_at = getattr(self.ctx, "started_at", None)
         alert_detector = AlertDetector(
@@ -82,8 +119,14 @@ class AlertManager:
             bot_started_at=bot_started_at,
         )
         enabled = {AlertTypes(a) for a in user.alert_settings.types or []}
+        if time_based_only:
+            enabled &= AlertDetector.TIME_BASED_ALERTS
+            triggered_service = []
+            triggered_base = alert_detector.get_triggered_time_based_alerts()
+        else:
+            triggered_service = alert_detector.get_triggered_service_alerts()
+            triggered_base = alert_detector.get_triggered_base_alerts()
 
-        triggered_service = alert_detector.get_triggered_service_alerts()
         for alert_type, alert_payload in triggered_service:
             if alert_type not in enabled:
                 continue
@@ -103,7 +146,6 @@ class AlertManager:
                     user.user_id,
                 )
 
-        triggered_base = alert_detector.get_triggered_base_alerts()
         key = (user.user_id, provider.pubkey)
         active = dc.active_alerts.get(key, {})
         now = datetime.now(TIMEZONE)
@@ -195,13 +237,35 @@ class AlertManager:
         alert_stage: AlertStages,
         **kwargs: t.Any,
     ) -> None:
-        localizer = Localizer(
-            self.ctx.i18n.jinja_env,
-            self.ctx.i18n.locales_data[user.language_code],
+        text, reply_markup = await self._render(
+            user.language_code, alert_type, alert_stage, kwargs
         )
-        text = await localizer(f"alerts.{alert_type}.{alert_stage}", **kwargs)
-        button = await localizer("buttons.common.hide", **kwargs)
+        await self.ctx.broadcaster.send_message(user.user_id, text, reply_markup)
+
+    async def _render(
+        self,
+        locale: str,
+        alert_type: AlertTypes,
+        alert_stage: AlertStages,
+        payload: t.Dict[str, t.Any],
+    ) -> t.Tuple[str, InlineKeyboardMarkup]:
+        provider = payload.get("provider")
+        key = (
+            locale,
+            alert_type,
+            alert_stage,
+            getattr(provider, "pubkey", None),
+            _payload_digest(payload),
+        )
+        rendered = self._rendered.get(key)
+        if rendered is not None:
+            return rendered
+
+        localizer = self.ctx.i18n.localizer(locale)
+        text = await localizer(f"alerts.{alert_type}.{alert_stage}", **payload)
+        button = await localizer("buttons.common.hide", **payload)
 
         inline_keyboard = [[InlineKeyboardButton(text=button, callback_data="hide")]]
         reply_markup = InlineKeyboardMarkup(inline_keyboard=inline_keyboard)
-        await self.ctx.broadcaster.send_message(user.user_id, text, reply_markup)
+        self._rendered[key] = text, reply_markup
+        return text, reply_markup
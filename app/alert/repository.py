@@ -29,6 +29,7 @@ class AlertRepository:
 
     async def get_providers_telemetry_with_prev_telemetry(
         self,
+        pubkeys: t.Optional[t.Iterable[str]] = None,
     ) -> list[tuple[ProviderModel, TelemetryModel, t.Optional[TelemetryHistoryModel]]]:
         t_alias = aliased(TelemetryModel)
         th_alias = aliased(TelemetryHistoryModel)
@@ -56,6 +57,8 @@ class AlertRepository:
                 ),
             )
         )
+        if pubkeys is not None:
+            stmt = stmt.where(ProviderModel.pubkey.in_(list(pubkeys)))
 
         res = await self.uow.session.execute(stmt)
         return [
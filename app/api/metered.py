@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import time
+import typing as t
+
+from aiohttp import ClientResponse, ClientSession
+from pyapiq import AsyncClientAPI
+from pyapiq.types import HTTPMethod
+
+from ..monitoring.metrics import API_REQUEST_DURATION, API_REQUESTS, API_RETRIES
+
+
+class MeteredClientAPI(AsyncClientAPI):
+    """AsyncClientAPI that records latency, outcomes and 429 retries.
+
+    Endpoints are labelled by their path below ``base_url``, so the
+    labels stay bounded whatever the query parameters.
+    """
+
+    metrics_name: str = ""
+
+    def _endpoint(self, url: str) -> str:
+        base = str(self.base_url).rstrip("/")
+        path = url[len(base):] if url.startswith(base) else url
+        return path.split("?", 1)[0] or "/"
+
+    async def request(self, method: HTTPMethod, url: str, **kwargs: t.Any) -> t.Any:
+        endpoint = self._endpoint(url)
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await super().request(method, url, **kwargs)
+            outcome = "ok"
+            return result
+        finally:
+            API_REQUEST_DURATION.labels(self.metrics_name, endpoint).observe(
+                time.perf_counter() - started
+            )
+            API_REQUESTS.labels(self.metrics_name, endpoint, outcome).inc()
+
+    async def _make_request(
+        self,
+        session: ClientSession,
+        method: HTTPMethod,
+        url: str,
+        **kwargs: t.Any,
+    ) -> ClientResponse:
+        response = await super()._make_request(session, method, url, **kwargs)
+        if response.status == 429:
+            # safe_request tries again (or gives up) after a 429.
+            API_RETRIES.labels(self.metrics_name, self._endpoint(url)).inc()
+        return response
@@ -1,13 +1,19 @@
-from pyapiq import AsyncClientAPI, AsyncAPINamespace, async_endpoint
-from pyapiq.types import HTTPMethod
+import typing as t
+
+import ijson
+from aiohttp import ClientResponse
+from pyapiq import AsyncAPINamespace, async_endpoint
+from pyapiq.types import HTTPMethod, ReturnType
 
 from .models import (
     ProvidersResponse,
     ProviderSearchPayload,
+    Telemetry,
     TelemetryResponse,
     ContractBagsRequest,
     ContractBagsResponse,
 )
+from ..metered import MeteredClientAPI
 from ...config import MYTONPROVIDER_API_KEY
 
 
@@ -27,7 +33,8 @@ class Contracts(AsyncAPINamespace):
         pass
 
 
-class MytonproviderClient(AsyncClientAPI):
+class MytonproviderClient(MeteredClientAPI):
+    metrics_name = "mytonprovider"
     headers = {"Authorization": MYTONPROVIDER_API_KEY}
     base_url = "https://mytonprovider.org/api/"
     version = "v1"
@@ -49,3 +56,22 @@ class MytonproviderClient(AsyncClientAPI):
     @async_endpoint(HTTPMethod.GET, path="/providers", return_as=TelemetryResponse)
     async def telemetry(self) -> TelemetryResponse:
         pass
+
+    @async_endpoint(HTTPMethod.GET, path="/providers", return_as=ReturnType.BYTES)
+    async def telemetry_raw(self) -> bytes:
+        pass
+
+    @async_endpoint(HTTPMethod.GET, path="/providers", return_as=ReturnType.RESPONSE)
+    async def telemetry_response(self) -> ClientResponse:
+        pass
+
+    async def iter_telemetry(self) -> t.AsyncIterator[Telemetry]:
+        """Yield telemetry items one by one while the response is downloaded."""
+        response = await self.telemetry_response()
+        try:
+            async for item in ijson.items_async(
+                response.content, "providers.item", use_float=True
+            ):
+                yield Telemetry.model_validate(item)
+        finally:
+            response.release()
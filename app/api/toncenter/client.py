@@ -1,13 +1,15 @@
 import typing as t
 
-from pyapiq import AsyncClientAPI, async_endpoint
+from pyapiq import async_endpoint
 from pyapiq.types import HTTPMethod
 
 from .models import TransactionList
+from ..metered import MeteredClientAPI
 from ...config import TONCENTER_API_KEY
 
 
-class ToncenterClient(AsyncClientAPI):
+class ToncenterClient(MeteredClientAPI):
+    metrics_name = "toncenter"
     headers = {"X-API-Key": TONCENTER_API_KEY}
     base_url = "https://toncenter.com/api"
     version = "v3"
@@ -5,6 +5,8 @@ from aiogram import Bot
 from aiogram.exceptions import TelegramRetryAfter
 from aiogram.types import InlineKeyboardMarkup, BufferedInputFile
 
+from ..monitoring.metrics import BROADCASTER_QUEUE, BROADCASTER_SENT
+
 
 class Broadcaster:
 
@@ -18,6 +20,22 @@ class Broadcaster:
         *args,
         max_retries: int = 10,
         **kwargs,
+    ) -> bool:
+        BROADCASTER_QUEUE.inc()
+        sent = False
+        try:
+            sent = await self._attempt(func, *args, max_retries=max_retries, **kwargs)
+        finally:
+            BROADCASTER_QUEUE.dec()
+            BROADCASTER_SENT.labels("sent" if sent else "failed").inc()
+        return sent
+
+    async def _attempt(
+        self,
+        func: t.Callable[..., t.Awaitable],
+        *args,
+        max_retries: int,
+        **kwargs,
     ) -> bool:
         for _ in range(max_retries):
             async with self._lock:
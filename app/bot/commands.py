@@ -37,7 +37,7 @@ async def setup(ctx: Context) -> None:
     try:
         for locale in SUPPORTED_LOCALES:
             lang_code = LOCALE_TO_TELEGRAM.get(locale, locale)
-            localizer = Localizer(ctx.i18n.jinja_env, ctx.i18n.locales_data[locale])
+            localizer = ctx.i18n.localizer(locale)
             commands = await build_commands(localizer)
 
             if not commands:
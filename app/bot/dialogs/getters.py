@@ -10,9 +10,13 @@ from app.database.metrics import (
 )
 from .consts import DEFAULT_PROVIDER_TAB, DEFAULT_ALERT_TAB
 from ..utils.i18n import Localizer
+from ..utils.profiles import UserProfile
+from ..utils.snapshots import ProviderView
 from ...alert.thresholds import THRESHOLDS
+from ...cache import CacheNamespaces
 from ...config import ADMIN_IDS
-from ...database.models import ContractModel, UserModel
+from ...context import Context
+from ...database.models import ContractModel
 from ...database.models.contract import REASON_DESCRIPTIONS
 from ...database.unitofwork import UnitOfWork
 from .widgets import BAGS_PER_PAGE, build_pagination_buttons
@@ -22,9 +26,9 @@ async def main_menu(
     dialog_manager: DialogManager,
     **_,
 ):
-    user_model: UserModel = dialog_manager.middleware_data["user_model"]
+    user_model: UserProfile = dialog_manager.middleware_data["user_model"]
     enabled_alerts = user_model.alert_settings.enabled
-    uow: UnitOfWork = dialog_manager.middleware_data["uow"]
+    uow: UnitOfWork = dialog_manager.middleware_data["read_uow"]
 
     list_providers_count = await uow.provider.count()
     my_providers_count = len(user_model.subscriptions)
@@ -50,14 +54,22 @@ async def stats_menu(
 ):
     from ...context import get_context
 
-    uow: UnitOfWork = dialog_manager.middleware_data["uow"]
-    stats = await build_stats_summary(uow.session)
-
+    uow: UnitOfWork = dialog_manager.middleware_data["read_uow"]
     ctx = get_context()
+    stats = await ctx.metrics_cache.get_or_build(
+        "stats",
+        "summary",
+        (CacheNamespaces.PROVIDERS,),
+        lambda: build_stats_summary(uow.session),
+    )
+
     started_at = getattr(ctx, "started_at", None)
     stats["bot_started_at"] = int(started_at) if started_at is not None else None
 
-    return {"stats": stats}
+    sql_profiler = getattr(ctx, "sql_profiler", None)
+    sql_profile = sql_profiler.summary(limit=10) if sql_profiler is not None else []
+
+    return {"stats": stats, "sql_profile": sql_profile}
 
 
 async def provider_menu(
@@ -67,23 +79,43 @@ async def provider_menu(
     provider_tab = dialog_manager.start_data.get("provider_tab", DEFAULT_PROVIDER_TAB)
     dialog_manager.current_context().widget_data["provider_tab"] = provider_tab
 
-    user: UserModel = dialog_manager.middleware_data["user_model"]
-    uow: UnitOfWork = dialog_manager.middleware_data["uow"]
+    user: UserProfile = dialog_manager.middleware_data["user_model"]
+    uow: UnitOfWork = dialog_manager.middleware_data["read_uow"]
     pubkey = dialog_manager.start_data.get("provider_pubkey")
     dialog_manager.dialog_data["provider_pubkey"] = pubkey
 
-    provider = await uow.provider.get(pubkey=pubkey)
+    ctx: Context = dialog_manager.middleware_data["ctx"]
+    provider = ctx.providers_index.get(pubkey)
+    if provider is None:
+        # Synced after the last index rebuild.
+        provider = ProviderView.from_row(await uow.provider.get(pubkey=pubkey))
     telemetry = await uow.telemetry.get(provider_pubkey=pubkey)
-    provider_wallet_metrics = await build_provider_wallet_metrics(uow.session, pubkey)
-    provider_traffic_metrics = await build_provider_traffic_metrics(uow.session, pubkey)
-    provider_storage_metrics = await build_provider_storage_metrics(uow.session, pubkey)
-    provider_last_month_report = await build_monthly_report(uow.session, pubkey)
-    result = await uow.session.execute(
-        select(func.count()).select_from(ContractModel).where(
-            and_(ContractModel.provider_pubkey == pubkey, ContractModel.reason.isnot(None))
+
+    async def build_metrics() -> dict:
+        series = ctx.series
+        result = await uow.session.execute(
+            select(func.count()).select_from(ContractModel).where(
+                and_(
+                    ContractModel.provider_pubkey == pubkey,
+                    ContractModel.reason.isnot(None),
+                )
+            )
         )
+        return {
+            "wallet": await build_provider_wallet_metrics(uow.session, pubkey, series),
+            "traffic": await build_provider_traffic_metrics(uow.session, pubkey, series),
+            "storage": await build_provider_storage_metrics(uow.session, pubkey, series),
+            "last_month": await build_monthly_report(uow.session, pubkey, series),
+            "bags_count": result.scalar() or 0,
+        }
+
+    # Tab switches re-run this getter; the metrics only change with the syncs.
+    metrics = await ctx.metrics_cache.get_or_build(
+        "provider",
+        pubkey,
+        tuple(CacheNamespaces),
+        build_metrics,
     )
-    provider_bags_count = result.scalar() or 0
 
     subscription = next(
         (
@@ -112,14 +144,14 @@ async def provider_menu(
         "access_granted": access_granted,
         "password_invalid": password_invalid,
         "provider": provider,
-        "telemetry": provider.telemetry_model,
+        "telemetry": provider.telemetry,
         "provider_pubkey": pubkey,
         "provider_address": provider.address,
-        "provider_wallet_metrics": provider_wallet_metrics,
-        "provider_traffic_metrics": provider_traffic_metrics,
-        "provider_storage_metrics": provider_storage_metrics,
-        "provider_last_month_report": provider_last_month_report,
-        "provider_bags_count": provider_bags_count,
+        "provider_wallet_metrics": metrics["wallet"],
+        "provider_traffic_metrics": metrics["traffic"],
+        "provider_storage_metrics": metrics["storage"],
+        "provider_last_month_report": metrics["last_month"],
+        "provider_bags_count": metrics["bags_count"],
     }
 
 
@@ -135,7 +167,7 @@ async def provider_bags(
     dialog_manager: DialogManager,
     **_,
 ):
-    uow: UnitOfWork = dialog_manager.middleware_data["uow"]
+    uow: UnitOfWork = dialog_manager.middleware_data["read_uow"]
     pubkey = dialog_manager.dialog_data.get("provider_pubkey")
     bags_tab = dialog_manager.dialog_data.get("bags_tab", "all")
     bags_page = int(dialog_manager.dialog_data.get("bags_page", 0))
@@ -218,7 +250,7 @@ async def provider_bags_detail(
     dialog_manager: DialogManager,
     **_,
 ):
-    uow: UnitOfWork = dialog_manager.middleware_data["uow"]
+    uow: UnitOfWork = dialog_manager.middleware_data["read_uow"]
     contract_address = dialog_manager.dialog_data.get("contract_address")
     contract_pubkey = dialog_manager.dialog_data.get("contract_pubkey")
 
@@ -241,7 +273,7 @@ async def alert_settings_menu(
     dialog_manager: DialogManager,
     **_,
 ):
-    user_model: UserModel = dialog_manager.middleware_data["user_model"]
+    user_model: UserProfile = dialog_manager.middleware_data["user_model"]
 
     alert_tab = dialog_manager.dialog_data.get("alert_tab", DEFAULT_ALERT_TAB)
     dialog_manager.current_context().widget_data["alert_tab"] = alert_tab
@@ -259,7 +291,7 @@ async def alert_settings_set_threshold(
     localizer: Localizer,
     **_,
 ):
-    user_model: UserModel = dialog_manager.middleware_data["user_model"]
+    user_model: UserProfile = dialog_manager.middleware_data["user_model"]
 
     key = dialog_manager.dialog_data.get("edit_threshold_key")
     name = await localizer(f"buttons.alert_settings.types.options.{key}")
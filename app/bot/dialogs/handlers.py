@@ -4,8 +4,9 @@ from aiogram_dialog import DialogManager, ShowMode
 
 from . import states
 from ..utils import generate_passwd_hash, is_valid_pubkey
+from ..utils.profiles import UserProfile, load_user_model, refresh_profile
 from ...config import ADMIN_IDS, ADMIN_PASSWORD
-from ...database.models import UserModel, UserSubscriptionModel
+from ...database.models import UserSubscriptionModel
 from ...database.unitofwork import UnitOfWork
 
 
@@ -49,12 +50,12 @@ async def enter_password(
         return
 
     uow: UnitOfWork = manager.middleware_data["uow"]
-    user: UserModel = manager.middleware_data["user_model"]
+    profile: UserProfile = manager.middleware_data["user_model"]
     pubkey = manager.dialog_data.get("provider_pubkey")
     telemetry = await uow.telemetry.get(provider_pubkey=pubkey)
     telemetry_pass = telemetry.telemetry_pass if telemetry else None
 
-    if user.user_id in ADMIN_IDS and message.text.lower() == ADMIN_PASSWORD:
+    if profile.user_id in ADMIN_IDS and message.text.lower() == ADMIN_PASSWORD:
         password_ok = True
         user_telemetry_pass = telemetry_pass
     else:
@@ -67,6 +68,7 @@ async def enter_password(
 
     manager.dialog_data["incorrect_password"] = False
 
+    user = await load_user_model(manager.middleware_data)
     subscription = next(
         (s for s in user.subscriptions or [] if s.provider_pubkey == pubkey),
         None,
@@ -82,6 +84,7 @@ async def enter_password(
             )
         )
     await uow.session.flush()
+    refresh_profile(manager.middleware_data, user)
 
     await manager.start(
         state=states.ProviderMenu.MAIN,
@@ -2,11 +2,10 @@ from aiogram_dialog import DialogManager
 from aiogram_dialog.widgets.kbd import Button
 
 from . import states
-from ..utils.i18n import Localizer
 from ...alert.thresholds import THRESHOLDS
 from ...alert.types import AlertTypes
+from ..utils.profiles import UserProfile, load_user_model, refresh_profile
 from ...context import Context
-from ...database.models import UserModel
 from ...database.unitofwork import UnitOfWork
 
 
@@ -25,8 +24,8 @@ async def unsubscribe(
     __,
     manager: DialogManager,
 ) -> None:
-    user: UserModel = manager.middleware_data["user_model"]
     uow: UnitOfWork = manager.middleware_data["uow"]
+    user = await load_user_model(manager.middleware_data)
     pubkey = manager.start_data.get("provider_pubkey")
 
     subscription = next(
@@ -36,6 +35,7 @@ async def unsubscribe(
     if subscription:
         user.subscriptions.remove(subscription)
         await uow.session.flush()
+        refresh_profile(manager.middleware_data, user)
 
     manager.dialog_data["is_subscribed"] = False
     await manager.show()
@@ -57,16 +57,13 @@ async def select_language(
 ) -> None:
     ctx: Context = manager.middleware_data["ctx"]
     uow: UnitOfWork = manager.middleware_data["uow"]
-    user_model = manager.middleware_data["user_model"]
+    user_model = await load_user_model(manager.middleware_data)
 
     user_model.language_code = item_id
-    locale_data = ctx.i18n.locales_data.get(item_id)
-    manager.middleware_data["localizer"] = Localizer(
-        jinja_env=ctx.i18n.jinja_env,
-        locale_data=locale_data,
-    )
+    manager.middleware_data["localizer"] = ctx.i18n.localizer(item_id)
 
     await uow.session.flush()
+    refresh_profile(manager.middleware_data, user_model)
     await manager.start(states.MainMenu.MAIN)
 
 
@@ -86,12 +83,13 @@ async def toggle_alerts(
     manager: DialogManager,
 ) -> None:
     uow: UnitOfWork = manager.middleware_data["uow"]
-    user_model: UserModel = manager.middleware_data["user_model"]
+    user_model = await load_user_model(manager.middleware_data)
 
     enabled = user_model.alert_settings.enabled
     user_model.alert_settings.enabled = not enabled
 
     await uow.session.flush()
+    refresh_profile(manager.middleware_data, user_model)
     await manager.show()
 
 
@@ -100,8 +98,8 @@ async def toggle_alert_type(
     button: Button,
     manager: DialogManager,
 ) -> None:
-    user_model: UserModel = manager.middleware_data["user_model"]
     uow: UnitOfWork = manager.middleware_data["uow"]
+    user_model = await load_user_model(manager.middleware_data)
 
     widget_id, all_types = button.widget_id, {e.value for e in AlertTypes}
     current_types = set(user_model.alert_settings.types or [])
@@ -119,6 +117,7 @@ async def toggle_alert_type(
         user_model.alert_settings.types = list(current_types)
 
     await uow.session.flush()
+    refresh_profile(manager.middleware_data, user_model)
     await manager.show()
 
 
@@ -143,7 +142,7 @@ async def open_threshold_editor(
     button: Button,
     manager: DialogManager,
 ) -> None:
-    user_model: UserModel = manager.middleware_data["user_model"]
+    user_model: UserProfile = manager.middleware_data["user_model"]
     key = button.widget_id.removeprefix("threshold_")
     threshold_data = user_model.alert_settings.thresholds_data or THRESHOLDS
     current = threshold_data.get(key)
@@ -159,7 +158,7 @@ async def open_threshold_editor(
 
 async def adjust_threshold(_, button, manager):
     uow: UnitOfWork = manager.middleware_data["uow"]
-    user: UserModel = manager.middleware_data["user_model"]
+    user = await load_user_model(manager.middleware_data)
 
     key = manager.dialog_data.get("edit_threshold_key")
     value = int(manager.dialog_data.get("edit_threshold_value", 0))
@@ -176,6 +175,7 @@ async def adjust_threshold(_, button, manager):
     user.alert_settings.thresholds_data = data
 
     await uow.session.flush()
+    refresh_profile(manager.middleware_data, user)
     await manager.show()
 
 
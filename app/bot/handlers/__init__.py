@@ -37,8 +37,8 @@ def register(dp: Dispatcher) -> None:
     )
     dp.inline_query.register(
         providers_inline,
-        F.query.endswith("providers"),
         F.chat_type == ChatType.SENDER,
+        flags={"throttling_key": "inline"},
     )
 
     dp.my_chat_member.register(my_chat_memeber)
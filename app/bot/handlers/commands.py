@@ -20,4 +20,6 @@ def register_command(
         )
         await delete_message(message)
 
+    # Names the handler in logs and metrics; every command shares this closure.
+    handler.__name__ = handler.__qualname__ = f"{command}_command"
     dp.message.register(handler, Command(command))
@@ -1,3 +1,6 @@
+import re
+import typing as t
+
 from aiogram import F
 from aiogram.types import (
     InlineQuery,
@@ -6,65 +9,90 @@ from aiogram.types import (
     CallbackQuery,
     ChatMemberUpdated,
 )
+from cachetools import LRUCache
 
 from ..utils import delete_message
 from ..utils.i18n import Localizer
-from ...database.models import ProviderModel, UserModel
+from ..utils.profiles import UserProfile
+from ..utils.snapshots import ProviderView
+from ...context import Context
 from ...database.unitofwork import UnitOfWork
 
 
 async def my_chat_memeber(
     update: ChatMemberUpdated,
     uow: UnitOfWork,
-    user_model: UserModel,
+    user_model: UserProfile,
 ) -> None:
-    user_model.state = update.new_chat_member.status
-    await uow.user.upsert(user_model)
+    user = await uow.user.get(user_id=user_model.user_id)
+    if user is not None and user.state != update.new_chat_member.status:
+        user.state = update.new_chat_member.status
+
+
+INLINE_PAGE_SIZE = 20
+
+# "[my|list] [providers] [search terms]": "my" limits the results to the
+# user's subscriptions; whatever follows the prefix is searched for.
+INLINE_QUERY_PATTERN = re.compile(r"^(?:(my|list)\b\s*)?(?:providers\b\s*)?(.*)$", re.S)
+
+# Rendered (title, description, thumbnail_url) per locale version and view.
+_inline_render_cache: LRUCache = LRUCache(maxsize=4096)
+
+
+async def _render_inline(
+    localizer: Localizer,
+    list_type: str,
+    provider: ProviderView,
+) -> t.Tuple[str, str, str]:
+    key = (localizer.locale, localizer.bundle.version, list_type, provider)
+    rendered = _inline_render_cache.get(key)
+    if rendered is None:
+        rendered = (
+            await localizer(f"inlines.{list_type}.title", provider=provider),
+            await localizer(f"inlines.{list_type}.description", provider=provider),
+            await localizer(f"inlines.{list_type}.thumbnail_url", provider=provider),
+        )
+        _inline_render_cache[key] = rendered
+    return rendered
 
 
 async def providers_inline(
     query: InlineQuery,
-    uow: UnitOfWork,
+    ctx: Context,
+    user_model: UserProfile,
     localizer: Localizer,
 ) -> None:
-    offset, limit = int(query.offset or 0), 20
-    query_type = (query.query or "").strip().lower()
+    offset, limit = int(query.offset or 0), INLINE_PAGE_SIZE
+    text = (query.query or "").strip().lower()
 
-    user_id, filters = query.from_user.id, {}
-    list_type = "my_providers" if query_type.startswith("my") else "list_providers"
+    scope, term = INLINE_QUERY_PATTERN.match(text).groups()
 
+    list_type = "my_providers" if scope == "my" else "list_providers"
+    pubkeys = None
     if list_type == "my_providers":
-        user = await uow.user.get(user_id=user_id)
-        subscriptions = user.subscriptions if user and user.subscriptions else None
-        filters["pubkey"] = [s.provider_pubkey for s in subscriptions]
-
-    total = await uow.provider.count(**filters)
-    providers = await uow.provider.list(
-        offset=offset,
-        limit=limit,
-        order_by=[ProviderModel.rating.desc()],
-        **filters,
-    )
-
-    results = [
-        InlineQueryResultArticle(
-            id=provider.pubkey,
-            title=await localizer(
-                f"inlines.{list_type}.title",
-                provider=provider,
-            ),
-            description=await localizer(
-                f"inlines.{list_type}.description",
-                provider=provider,
-            ),
-            thumbnail_url=await localizer(
-                f"inlines.{list_type}.thumbnail_url",
-                provider=provider,
-            ),
-            input_message_content=InputTextMessageContent(message_text=provider.pubkey),
+        pubkeys = [s.provider_pubkey for s in user_model.subscriptions or []]
+
+    if term:
+        total, providers = ctx.providers_index.search(term, offset, limit, pubkeys)
+    else:
+        total, providers = ctx.providers_index.page(offset, limit, pubkeys)
+
+    results = []
+    for provider in providers:
+        title, description, thumbnail_url = await _render_inline(
+            localizer, list_type, provider
+        )
+        results.append(
+            InlineQueryResultArticle(
+                id=provider.pubkey,
+                title=title,
+                description=description,
+                thumbnail_url=thumbnail_url,
+                input_message_content=InputTextMessageContent(
+                    message_text=provider.pubkey
+                ),
+            )
         )
-        for provider in providers
-    ]
 
     next_offset = str(offset + limit) if offset + limit < total else ""
     await query.answer(results, cache_time=5, is_personal=True, next_offset=next_offset)
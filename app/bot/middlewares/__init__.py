@@ -5,21 +5,34 @@ from sulguk import AiogramSulgukMiddleware
 
 from .db import DbSessionMiddleware
 from .i18n import I18nMiddleware
+from .metrics import HandlerMetricsMiddleware
+from .profiler import SqlProfileLabelMiddleware, SqlProfilerMiddleware
 from .throttling import ThrottlingMiddleware
+from ...cache import ThrottlingModes, ThrottlingRule
+from ...monitoring import SqlProfiler
 
 logger = logging.getLogger(__name__)
 
+# Update types the bot handles; observer middlewares are registered on each.
+EVENT_TYPES = ("message", "callback_query", "inline_query", "my_chat_member")
+
 
 def register(dp: Dispatcher, bot: Bot) -> None:
     bot.session.middleware(AiogramSulgukMiddleware())
 
-    throttling_middleware = ThrottlingMiddleware()
+    # On the event observers, so handlers' throttling_key flags pick the budget.
+    throttling_middleware = ThrottlingMiddleware(
+        inline=ThrottlingRule(10, limit=20, mode=ThrottlingModes.SLIDING),
+    )
     db_middleware = DbSessionMiddleware()
     i18n_middleware = I18nMiddleware()
 
     dp.update.middleware(db_middleware)
     dp.update.middleware(i18n_middleware)
-    dp.update.middleware(throttling_middleware)
+
+    for event_type in EVENT_TYPES:
+        dp.observers[event_type].middleware(throttling_middleware)
+        dp.observers[event_type].middleware(HandlerMetricsMiddleware(event_type))
 
     dp.error.middleware(db_middleware)
     dp.error.middleware(i18n_middleware)
@@ -28,4 +41,18 @@ def register(dp: Dispatcher, bot: Bot) -> None:
     logger.info("Middlewares registered")
 
 
-__all__ = ["register"]
+def register_sql_profiler(dp: Dispatcher, profiler: SqlProfiler) -> None:
+    """Profile SQL per update; call after ``setup_dialogs()``.
+
+    The profiler is an outer update middleware, so it runs before the
+    session middleware. Labels are added last, inside aiogram-dialog's
+    middlewares, where the dialog context is still loaded.
+    """
+    dp.update.outer_middleware(SqlProfilerMiddleware(profiler))
+    for event_type in EVENT_TYPES:
+        dp.observers[event_type].middleware(SqlProfileLabelMiddleware())
+
+    logger.info("SQL profiler registered")
+
+
+__all__ = ["register", "register_sql_profiler"]
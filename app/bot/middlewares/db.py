@@ -4,6 +4,7 @@ from datetime import datetime
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject, User
 
+from ..utils.profiles import UserProfile
 from ...alert.types import AlertTypes
 from ...config import TIMEZONE, SUPPORTED_LOCALES, DEFAULT_LOCALE
 from ...context import Context
@@ -12,6 +13,15 @@ from ...database.unitofwork import UnitOfWork
 
 
 class DbSessionMiddleware(BaseMiddleware):
+    """Provide the user profile and lazily opened units of work.
+
+    The profile comes from the per-process cache when its Telegram-side
+    fields still match the update, so updates whose handlers never touch
+    ``uow`` do not open a session at all. The user row is only written
+    when it is new or those fields changed; any write made while handling
+    the update drops the cached profile. ``read_uow`` reads through the
+    read-only engine and is what getters use; writes go through ``uow``.
+    """
 
     async def __call__(
         self,
@@ -21,51 +31,76 @@ class DbSessionMiddleware(BaseMiddleware):
     ) -> t.Optional[t.Any]:
         user: t.Optional[User] = data.get("event_from_user")
         ctx: t.Optional[Context] = data.get("ctx")
-        uow = UnitOfWork(ctx.db.session_factory)
+        uow = UnitOfWork(ctx.db.session_factory, lazy=True)
+        read_uow = UnitOfWork(ctx.db.read_session_factory, lazy=True)
+
+        try:
+            async with uow, read_uow:
+                user_model: t.Optional[UserProfile] = None
+                has_subscriptions = False
+
+                if user and not user.is_bot:
+                    user_model = ctx.user_profiles.get(user.id)
+                    if user_model is None or not self._is_current(user_model, user):
+                        user_model = await self._sync_user(uow, user)
+                        ctx.user_profiles.put(user_model)
+                    has_subscriptions = len(user_model.subscriptions) > 0
 
-        async with uow:
-            user_model: t.Optional[UserModel] = None
-            has_subscriptions = False
+                data["user_model"] = user_model
+                data["has_subscriptions"] = has_subscriptions
+                data["uow"] = uow
+                data["read_uow"] = read_uow
 
-            if user and not user.is_bot:
-                existing = await uow.user.get(user_id=user.id)
+                return await handler(event, data)
+        finally:
+            if uow.written and user and not user.is_bot:
+                ctx.user_profiles.invalidate(user.id)
 
-                if existing is None:
-                    user_language_code = (
-                        user.language_code
-                        if user.language_code in SUPPORTED_LOCALES
-                        else DEFAULT_LOCALE
-                    )
-                    user_model = UserModel(
-                        user_id=user.id,
-                        language_code=user_language_code,
-                        full_name=user.full_name,
-                        username=user.username,
-                        created_at=datetime.now(TIMEZONE),
-                        alert_settings=UserAlertSettingModel(
-                            user_id=user.id,
-                            enabled=False,
-                            types=[alert for alert in AlertTypes],
-                        ),
-                    )
-                    user_model = await uow.user.create(user_model)
-                else:
-                    existing_language_code = (
-                        existing.language_code
-                        if existing.language_code in SUPPORTED_LOCALES
-                        else DEFAULT_LOCALE
-                    )
-                    existing.full_name = user.full_name
-                    existing.username = user.username
-                    existing.language_code = existing_language_code
-                    user_model = existing
-                    await uow.session.flush()
+    @staticmethod
+    def _is_current(profile: UserProfile, user: User) -> bool:
+        return (
+            profile.full_name == user.full_name
+            and profile.username == user.username
+            and profile.language_code in SUPPORTED_LOCALES
+        )
 
-                await uow.session.refresh(user_model)
-                has_subscriptions = len(user_model.subscriptions) > 0  # type: ignore
+    @staticmethod
+    async def _sync_user(uow: UnitOfWork, user: User) -> UserProfile:
+        existing = await uow.user.get(user_id=user.id)
 
-            data["user_model"] = user_model
-            data["has_subscriptions"] = has_subscriptions
-            data["uow"] = uow
+        if existing is None:
+            user_language_code = (
+                user.language_code
+                if user.language_code in SUPPORTED_LOCALES
+                else DEFAULT_LOCALE
+            )
+            user_model = UserModel(
+                user_id=user.id,
+                language_code=user_language_code,
+                full_name=user.full_name,
+                username=user.username,
+                created_at=datetime.now(TIMEZONE),
+                alert_settings=UserAlertSettingModel(
+                    user_id=user.id,
+                    enabled=False,
+                    types=[alert for alert in AlertTypes],
+                ),
+                subscriptions=[],
+            )
+            user_model = await uow.user.create(user_model)
+            return UserProfile.from_model(user_model)
 
-            return await handler(event, data)
+        existing_language_code = (
+            existing.language_code
+            if existing.language_code in SUPPORTED_LOCALES
+            else DEFAULT_LOCALE
+        )
+        changes = {
+            "full_name": user.full_name,
+            "username": user.username,
+            "language_code": existing_language_code,
+        }
+        for field, value in changes.items():
+            if getattr(existing, field) != value:
+                setattr(existing, field, value)
+        return UserProfile.from_model(existing)
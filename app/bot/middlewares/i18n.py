@@ -6,7 +6,6 @@ from collections.abc import Awaitable, Callable
 from aiogram.dispatcher.middlewares.base import BaseMiddleware
 from aiogram.types import TelegramObject, User
 
-from ..utils.i18n import Localizer
 from ...config import DEFAULT_LOCALE, SUPPORTED_LOCALES
 from ...context import Context
 
@@ -34,16 +33,11 @@ class I18nMiddleware(BaseMiddleware):
                 language_code = user.language_code
             else:
                 language_code = DEFAULT_LOCALE
-            locale_data = ctx.i18n.locales_data.get(language_code)
-
-            if locale_data is None:
+            if language_code not in ctx.i18n.bundles:
                 raise ValueError(
-                    f"Localization for language '{language_code}' not found in locales_data."
+                    f"Localization for language '{language_code}' not found in bundles."
                 )
 
-            data["localizer"] = Localizer(
-                jinja_env=ctx.i18n.jinja_env,
-                locale_data=locale_data,
-            )
+            data["localizer"] = ctx.i18n.localizer(language_code)
 
         return await handler(event, data)
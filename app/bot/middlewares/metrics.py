@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import time
+import typing as t
+from collections.abc import Awaitable, Callable
+
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.dispatcher.middlewares.base import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from ...monitoring.metrics import HANDLER_DURATION, HANDLER_ERRORS
+
+
+def handler_name(handler: HandlerObject) -> str:
+    """Qualified name of the handler; dialogs also name their states group."""
+    callback = handler.callback
+    name = getattr(callback, "__qualname__", None) or type(callback).__name__
+    owner = getattr(callback, "__self__", None)
+    states_group_name = getattr(owner, "states_group_name", None)
+    if callable(states_group_name):
+        name = f"{name}[{states_group_name()}]"
+    return name
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Record how long each handler takes, as an inner middleware."""
+
+    def __init__(self, event_type: str) -> None:
+        self.event_type = event_type
+        self._names: t.Dict[t.Any, str] = {}
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, t.Dict[str, t.Any]], Awaitable[t.Any]],
+        event: TelegramObject,
+        data: t.Dict[str, t.Any],
+    ) -> t.Any:
+        handler_object: t.Optional[HandlerObject] = data.get("handler")
+        if handler_object is None:
+            return await handler(event, data)
+
+        name = self._names.get(handler_object.callback)
+        if name is None:
+            name = self._names[handler_object.callback] = handler_name(handler_object)
+
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            HANDLER_ERRORS.labels(self.event_type, name).inc()
+            raise
+        finally:
+            HANDLER_DURATION.labels(self.event_type, name).observe(
+                time.perf_counter() - started
+            )
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import typing as t
+from collections.abc import Awaitable, Callable
+
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.dispatcher.middlewares.base import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+from aiogram_dialog import DialogManager
+
+from .metrics import handler_name
+from ...monitoring import SqlProfiler, current_profile
+
+
+class SqlProfilerMiddleware(BaseMiddleware):
+    """Profile the SQL of each update, including the user lookup.
+
+    Updates no handler labels are summarized by their event type.
+    """
+
+    def __init__(self, profiler: SqlProfiler) -> None:
+        self.profiler = profiler
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, t.Dict[str, t.Any]], Awaitable[t.Any]],
+        event: Update,
+        data: t.Dict[str, t.Any],
+    ) -> t.Any:
+        handle = self.profiler.begin(event.update_id)
+        try:
+            return await handler(event, data)
+        finally:
+            self.profiler.finish(handle, event.event_type)
+
+
+class SqlProfileLabelMiddleware(BaseMiddleware):
+    """Label the active profile with the dialog state the update ended in.
+
+    Updates outside dialogs are labelled with the handler name.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, t.Dict[str, t.Any]], Awaitable[t.Any]],
+        event: TelegramObject,
+        data: t.Dict[str, t.Any],
+    ) -> t.Any:
+        try:
+            return await handler(event, data)
+        finally:
+            profile = current_profile()
+            if profile is not None:
+                profile.label = self._label(data)
+
+    @staticmethod
+    def _label(data: t.Dict[str, t.Any]) -> t.Optional[str]:
+        manager: t.Optional[DialogManager] = data.get("dialog_manager")
+        if manager is not None and manager.has_context():
+            return manager.current_context().state.state
+        handler_object: t.Optional[HandlerObject] = data.get("handler")
+        return handler_name(handler_object) if handler_object is not None else None
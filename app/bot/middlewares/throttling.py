@@ -1,31 +1,55 @@
+import logging
+import time
 import typing as t
 
 from aiogram import BaseMiddleware
 from aiogram.dispatcher.flags import get_flag
 from aiogram.types import TelegramObject, User
 from cachetools import TTLCache
+from redis.exceptions import RedisError
+
+from ...cache import RateLimiter, ThrottlingRule
+from ...context import Context
 
 THROTTLING_DEFAULT_KEY: str = "default"
 THROTTLING_DEFAULT_TTL: float = 0.5
+THROTTLING_BLOCKED_MAXSIZE: int = 100_000
+
+logger = logging.getLogger(__name__)
 
 
 class ThrottlingMiddleware(BaseMiddleware):
+    """Drop updates from users over their budget.
+
+    Budgets live in Redis, so they survive restarts and are shared by every
+    bot process. The handler's ``throttling_key`` flag picks the budget,
+    which is why the middleware is registered on the event observers:
+    flags are not visible at the update level. Once
+    Redis reports a user blocked, further updates are dropped locally until
+    the reported wait is over, without another round-trip. If Redis is
+    unreachable, updates pass unthrottled.
+    """
 
     def __init__(
         self,
         *,
         default_key: t.Optional[str] = THROTTLING_DEFAULT_KEY,
         default_ttl: float = THROTTLING_DEFAULT_TTL,
-        **ttl_map: float,
+        **rules: t.Union[float, ThrottlingRule],
     ) -> None:
         if default_key:
-            ttl_map[default_key] = default_ttl
+            rules[default_key] = default_ttl
 
         self.default_key = default_key
-        self.caches: t.Dict[str, t.MutableMapping[int, None]] = {}
-
-        for name, ttl in ttl_map.items():
-            self.caches[name] = TTLCache(maxsize=10_000, ttl=ttl)
+        self.rules: t.Dict[str, ThrottlingRule] = {
+            name: rule if isinstance(rule, ThrottlingRule) else ThrottlingRule(rule)
+            for name, rule in rules.items()
+        }
+        self._blocked: t.MutableMapping[t.Tuple[str, int], float] = TTLCache(
+            maxsize=THROTTLING_BLOCKED_MAXSIZE,
+            ttl=max((rule.period for rule in self.rules.values()), default=1.0),
+        )
+        self._limiter: t.Optional[RateLimiter] = None
 
     async def __call__(
         self,
@@ -37,8 +61,35 @@ class ThrottlingMiddleware(BaseMiddleware):
 
         if user is not None:
             throttling_key = get_flag(data, "throttling_key", default=self.default_key)
-            if throttling_key and user.id in self.caches[throttling_key]:
+            rule = self.rules.get(throttling_key) if throttling_key else None
+            if rule is not None and await self._is_blocked(data, throttling_key, rule, user.id):
                 return None
-            self.caches[throttling_key][user.id] = None
 
         return await handler(event, data)
+
+    async def _is_blocked(
+        self,
+        data: t.Dict[str, t.Any],
+        key: str,
+        rule: ThrottlingRule,
+        user_id: int,
+    ) -> bool:
+        now = time.monotonic()
+        until = self._blocked.get((key, user_id))
+        if until is not None and until > now:
+            return True
+
+        if self._limiter is None:
+            ctx: Context = data["ctx"]
+            self._limiter = RateLimiter(ctx.redis)
+
+        try:
+            wait_ms = await self._limiter.hit(key, user_id, rule)
+        except RedisError as e:
+            logger.warning("Throttling skipped, Redis unavailable: %s", e)
+            return False
+
+        if wait_ms > 0:
+            self._blocked[(key, user_id)] = now + wait_ms / 1000
+            return True
+        return False
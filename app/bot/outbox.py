@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import typing as t
+
+from aiogram.types import BufferedInputFile, InlineKeyboardMarkup
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+
+from .broadcaster import Broadcaster
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_STREAM = "outbox"
+OUTBOX_GROUP = "bot"
+OUTBOX_MAXLEN = 100_000
+OUTBOX_BATCH = 50
+OUTBOX_BLOCK_MS = 5_000
+OUTBOX_CLAIM_IDLE_MS = 60_000
+OUTBOX_RETRY_DELAY = 5.0
+
+
+class Outbox:
+    """Broadcaster stand-in for processes without a bot.
+
+    Appends each message to a Redis stream instead of sending it; a bot
+    process delivers it through OutboxConsumer. Returns True once the
+    message is queued, since delivery happens elsewhere.
+    """
+
+    def __init__(self, redis: Redis, stream: str = OUTBOX_STREAM) -> None:
+        self.redis = redis
+        self.stream = stream
+
+    async def _add(self, fields: t.Dict[str, t.Union[str, bytes, int]]) -> bool:
+        try:
+            await self.redis.xadd(
+                self.stream,
+                fields,
+                maxlen=OUTBOX_MAXLEN,
+                approximate=True,
+            )
+        except RedisError:
+            logger.exception("Failed to queue outbound %s", fields.get("kind"))
+            return False
+        return True
+
+    async def send_message(
+        self,
+        user_id: int,
+        text: str,
+        reply_markup: t.Optional[InlineKeyboardMarkup] = None,
+        max_retries: int = 10,
+    ) -> bool:
+        fields: t.Dict[str, t.Union[str, bytes, int]] = {
+            "kind": "message",
+            "chat_id": user_id,
+            "text": text,
+            "max_retries": max_retries,
+        }
+        if reply_markup is not None:
+            fields["reply_markup"] = reply_markup.model_dump_json(exclude_none=True)
+        return await self._add(fields)
+
+    async def send_document(
+        self,
+        user_id: int,
+        document: BufferedInputFile,
+        caption: t.Optional[str] = None,
+        max_retries: int = 10,
+    ) -> bool:
+        fields: t.Dict[str, t.Union[str, bytes, int]] = {
+            "kind": "document",
+            "chat_id": user_id,
+            "document": document.data,
+            "filename": document.filename or "document",
+            "max_retries": max_retries,
+        }
+        if caption is not None:
+            fields["caption"] = caption
+        return await self._add(fields)
+
+
+class OutboxConsumer:
+    """Deliver queued outbound messages through the bot's Broadcaster.
+
+    Bot processes share one consumer group, so each message is delivered
+    by one of them. Entries are acknowledged after the send attempt, and
+    entries left pending by a process that died are claimed by another
+    after OUTBOX_CLAIM_IDLE_MS.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        broadcaster: Broadcaster,
+        stream: str = OUTBOX_STREAM,
+        group: str = OUTBOX_GROUP,
+    ) -> None:
+        self.redis = redis
+        self.broadcaster = broadcaster
+        self.stream = stream
+        self.group = group
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self._task: t.Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="outbox-consumer")
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _ensure_group(self) -> None:
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._ensure_group()
+                # Own entries left unacknowledged by a previous run first.
+                while await self._consume("0"):
+                    pass
+                while True:
+                    await self._claim_stale()
+                    await self._consume(">")
+            except asyncio.CancelledError:
+                raise
+            except (Exception,):
+                logger.exception("Outbox consumer failed, retrying")
+                await asyncio.sleep(OUTBOX_RETRY_DELAY)
+
+    async def _claim_stale(self) -> None:
+        _, entries, *_ = await self.redis.xautoclaim(
+            self.stream,
+            self.group,
+            self.consumer,
+            min_idle_time=OUTBOX_CLAIM_IDLE_MS,
+            count=OUTBOX_BATCH,
+        )
+        await self._deliver_all(entries)
+
+    async def _consume(self, last_id: str) -> int:
+        response = await self.redis.xreadgroup(
+            self.group,
+            self.consumer,
+            {self.stream: last_id},
+            count=OUTBOX_BATCH,
+            block=OUTBOX_BLOCK_MS if last_id == ">" else None,
+        )
+        delivered = 0
+        for _, entries in response or []:
+            await self._deliver_all(entries)
+            delivered += len(entries)
+        return delivered
+
+    async def _deliver_all(
+        self,
+        entries: t.List[t.Tuple[bytes, t.Dict[bytes, bytes]]],
+    ) -> None:
+        for entry_id, fields in entries:
+            if fields:
+                try:
+                    await self._deliver(fields)
+                except (Exception,):
+                    logger.exception("Dropping malformed outbox entry %s", entry_id)
+            await self.redis.xack(self.stream, self.group, entry_id)
+            await self.redis.xdel(self.stream, entry_id)
+
+    async def _deliver(self, fields: t.Dict[bytes, bytes]) -> None:
+        kind = fields[b"kind"].decode()
+        chat_id = int(fields[b"chat_id"])
+        max_retries = int(fields.get(b"max_retries", b"10"))
+
+        if kind == "message":
+            markup = fields.get(b"reply_markup")
+            await self.broadcaster.send_message(
+                chat_id,
+                fields[b"text"].decode(),
+                reply_markup=(
+                    InlineKeyboardMarkup.model_validate_json(markup) if markup else None
+                ),
+                max_retries=max_retries,
+            )
+        elif kind == "document":
+            caption = fields.get(b"caption")
+            await self.broadcaster.send_document(
+                chat_id,
+                BufferedInputFile(fields[b"document"], filename=fields[b"filename"].decode()),
+                caption=caption.decode() if caption is not None else None,
+                max_retries=max_retries,
+            )
+        else:
+            raise ValueError(f"Unknown outbox entry kind: {kind}")
@@ -1,7 +1,9 @@
+from .bundle import LocaleBundle
 from .i18n import I18N
 from .localizer import Localizer
 
 __all__ = [
     "I18N",
+    "LocaleBundle",
     "Localizer",
 ]
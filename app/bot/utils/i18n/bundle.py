@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import typing as t
+from datetime import datetime, timedelta
+from types import MappingProxyType
+
+from jinja2 import Environment, StrictUndefined, Template, TemplateError
+
+
+class LocaleBundle:
+    """Jinja environment, data and compiled templates of one locale.
+
+    Built once by I18N and never mutated afterwards, so any number of
+    Localizer handles can render from it concurrently. Filters are bound
+    to the bundle, which makes them locale-aware without shared state.
+    ``strings`` and ``templates`` are flat, read-only maps keyed by the
+    dotted key, so a lookup is a single dict hit.
+    """
+
+    def __init__(
+        self,
+        locale: str,
+        data: t.Dict[str, t.Any],
+        version: int = 0,
+    ) -> None:
+        self.locale = locale
+        self.data = data
+        self.version = version
+        self.env = Environment(
+            autoescape=True,
+            lstrip_blocks=True,
+            trim_blocks=True,
+            enable_async=True,
+            undefined=StrictUndefined,
+        )
+        self.env.filters.update(
+            ago=self._ago_filter,
+            toamount=self._toamount_filter,
+            sizeformat=self._sizeformat_filter,
+            datetimeformat=self._datetimeformat_filter,
+            durationformat=self._durationformat_filter,
+        )
+        self._units: t.Dict[str, str] = {
+            key: str(value) for key, value in data.get("duration_short", {}).items()
+        }
+        self.errors: t.List[str] = []
+        flat = flatten(data)
+        self.strings: t.Mapping[str, str] = MappingProxyType(
+            {key: value for key, value in flat.items() if isinstance(value, str)}
+        )
+        self.templates: t.Mapping[str, Template] = MappingProxyType(self._compile(flat))
+
+    def _compile(self, flat: t.Dict[str, t.Any]) -> t.Dict[str, Template]:
+        compiled: t.Dict[str, Template] = {}
+        for key, value in flat.items():
+            if not isinstance(value, str):
+                self.errors.append(f"{self.locale}:{key}: expected a string")
+                continue
+            try:
+                compiled[key] = self.env.from_string(value)
+            except TemplateError as e:
+                self.errors.append(f"{self.locale}:{key}: {e}")
+        return compiled
+
+    def _unit(self, key: str) -> str:
+        return self._units.get(key, key)
+
+    @staticmethod
+    async def _toamount_filter(value: t.Optional[int]) -> str:
+        if value is None:
+            return "0"
+        return f"{value / 1e9:.4f}".rstrip("0").rstrip(".")
+
+    @staticmethod
+    async def _datetimeformat_filter(
+        ts: t.Optional[t.Union[int, datetime]],
+        fmt: str = "%Y-%m-%d %H:%M",
+    ) -> str:
+        if ts is None:
+            return "N/A"
+        if isinstance(ts, int):
+            ts = datetime.fromtimestamp(ts)
+        return ts.strftime(fmt)
+
+    async def _durationformat_filter(self, seconds: t.Optional[int]) -> str:
+        if seconds is None:
+            return "N/A"
+        delta = timedelta(seconds=seconds)
+        days = delta.days
+        hours = delta.seconds // 3600
+        l = self._unit
+
+        if days > 365:
+            years = days // 365
+            rem_days = days % 365
+            return f"{years}{l('year')} {rem_days}{l('day')}"
+        elif days > 0:
+            return f"{days}{l('day')} {hours}{l('hour')}"
+        return f"{hours}{l('hour')}"
+
+    async def _ago_filter(self, ts: t.Optional[t.Union[int, datetime]]) -> str:
+        if ts is None:
+            return "N/A"
+
+        try:
+            ts_int = int(ts.timestamp()) if isinstance(ts, datetime) else int(ts)
+            now = int(datetime.now().timestamp())
+            total = now - ts_int
+            if total < 0:
+                return "N/A"
+        except (TypeError, ValueError, OverflowError):
+            return "N/A"
+
+        l = self._unit
+
+        if total < 60:
+            return f"{total}{l('second')} {l('ago')}"
+
+        minutes = total // 60
+        if minutes < 60:
+            return f"{minutes}{l('minute')} {l('ago')}"
+
+        hours, rem_min = divmod(minutes, 60)
+        if hours < 24:
+            if rem_min:
+                return f"{hours}{l('hour')} {rem_min}{l('minute')} {l('ago')}"
+            return f"{hours}{l('hour')} {l('ago')}"
+
+        days = hours // 24
+        if days < 30:
+            return f"{days}{l('day')} {l('ago')}"
+
+        months = days // 30
+        if months < 12:
+            return f"{months}{l('month')} {l('ago')}"
+
+        years = months // 12
+        return f"{years}{l('year')} {l('ago')}"
+
+    @staticmethod
+    async def _sizeformat_filter(value: t.Optional[t.Union[int, float]]) -> str:
+        if value is None:
+            return "0MB"
+
+        try:
+            b = float(value)
+        except (Exception,):
+            return "0MB"
+
+        sign = "-" if b < 0 else ""
+        b = abs(b)
+
+        units = [
+            ("MB", 1e6),
+            ("GB", 1e9),
+            ("TB", 1e12),
+            ("PB", 1e15),
+            ("EB", 1e18),
+            ("ZB", 1e21),
+            ("YB", 1e24),
+        ]
+
+        for name, factor in reversed(units):
+            if b >= factor:
+                num = b / factor
+                break
+        else:
+            name, factor = units[0]
+            num = b / factor
+
+        s = f"{num:.2f}".rstrip("0").rstrip(".")
+        return f"{sign}{s}{name}"
+
+
+def flatten(data: t.Dict[str, t.Any], prefix: str = "") -> t.Dict[str, t.Any]:
+    """Map nested locale data to dotted keys."""
+    result: t.Dict[str, t.Any] = {}
+    for key, value in data.items():
+        dotted = f"{prefix}{key}"
+        if isinstance(value, dict):
+            result.update(flatten(value, f"{dotted}."))
+        else:
+            result[dotted] = value
+    return result
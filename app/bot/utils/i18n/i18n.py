@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import typing as t
 from pathlib import Path
 
 import yaml
-from jinja2 import Environment, StrictUndefined
 
-from ....config import LOCALES_DIR, SUPPORTED_LOCALES
+from .bundle import LocaleBundle
+from .localizer import Localizer
+from ....config import DEFAULT_LOCALE, LOCALES_DIR, SUPPORTED_LOCALES
 
 logger = logging.getLogger(__name__)
 
@@ -16,35 +18,108 @@ class I18N:
 
     def __init__(self) -> None:
         logger.info("Initializing i18n")
-        self.jinja_env = Environment(
-            autoescape=True,
-            lstrip_blocks=True,
-            trim_blocks=True,
-            enable_async=True,
-            undefined=StrictUndefined,
-        )
-        self.locales_data: t.Dict[str, t.Dict[str, t.Any]] = self._load_all_locales()
+        self.version = 0
+        self._mtimes = self._scan_mtimes()
+        self.bundles: t.Dict[str, LocaleBundle] = self._load_all_locales()
+        self._watcher: t.Optional[asyncio.Task] = None
+
+    def localizer(self, locale: str) -> Localizer:
+        """Return a lightweight handle rendering in ``locale``."""
+        return Localizer(self.bundles[locale])
+
+    def start_watching(self, interval: float) -> None:
+        """Poll locale files every ``interval`` seconds and reload on change."""
+        if self._watcher is None:
+            self._watcher = asyncio.create_task(self._watch(interval))
+            logger.info(f"Watching locales for changes: 'interval={interval}s'")
+
+    async def shutdown(self) -> None:
+        if self._watcher is not None:
+            self._watcher.cancel()
+            await asyncio.gather(self._watcher, return_exceptions=True)
+            self._watcher = None
+
+    async def _watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            mtimes = self._scan_mtimes()
+            if mtimes != self._mtimes:
+                # Remember the state even if loading fails; a broken file is
+                # retried once it is saved again.
+                self._mtimes = mtimes
+                await self.reload()
+
+    async def reload(self) -> bool:
+        """Load and compile all locales, then swap them in as a whole.
+
+        On any error the current bundles stay in place. Localizers created
+        before the swap keep rendering from the bundles they were given.
+        """
+        try:
+            bundles = await asyncio.to_thread(self._load_all_locales, self.version + 1)
+        except Exception as e:
+            logger.error(
+                f"Locales reload failed, keeping 'version={self.version}': {e}"
+            )
+            return False
 
-    def _load_all_locales(self) -> t.Dict[str, t.Dict[str, t.Any]]:
+        self.bundles = bundles
+        self.version += 1
+        logger.info(f"Locales reloaded: 'version={self.version}'")
+        return True
+
+    def _scan_mtimes(self) -> t.Dict[str, t.Optional[int]]:
+        mtimes: t.Dict[str, t.Optional[int]] = {}
+        for locale in SUPPORTED_LOCALES:
+            for ext in ("yaml", "yml"):
+                path = LOCALES_DIR / f"{locale}.{ext}"
+                try:
+                    mtimes[str(path)] = path.stat().st_mtime_ns
+                except OSError:
+                    mtimes[str(path)] = None
+        return mtimes
+
+    def _load_all_locales(self, version: int = 0) -> t.Dict[str, LocaleBundle]:
         if not LOCALES_DIR.is_dir():
             logger.error(f"Locales directory is missing: {str(LOCALES_DIR)}")
             raise FileNotFoundError(
                 f"Locales directory '{LOCALES_DIR}' does not exist or is not a directory."
             )
 
-        locales_data: t.Dict[str, t.Dict[str, t.Any]] = {}
+        bundles: t.Dict[str, LocaleBundle] = {}
         for locale in SUPPORTED_LOCALES:
             try:
                 file_path = self._resolve_locale_file(locale)
                 raw_data = self._load_yaml_file(file_path)
                 expanded = self._expand_dotted_keys(raw_data)
-                locales_data[locale] = expanded
+                bundles[locale] = LocaleBundle(locale, expanded, version)
                 logger.info(f"Locale loaded: '{locale}'")
             except Exception:
                 logger.error(f"Failed to load locale: '{locale}'")
                 raise
 
-        return locales_data
+        self._validate(bundles)
+        return bundles
+
+    @staticmethod
+    def _validate(bundles: t.Dict[str, LocaleBundle]) -> None:
+        """Fail on templates that do not compile; report missing keys."""
+        errors = [error for bundle in bundles.values() for error in bundle.errors]
+        for error in errors:
+            logger.error(f"Invalid localization template: '{error}'")
+        if errors:
+            raise ValueError(f"{len(errors)} localization template(s) failed to compile")
+
+        reference = bundles.get(DEFAULT_LOCALE)
+        if reference is None:
+            return
+        for locale, bundle in bundles.items():
+            missing = reference.strings.keys() - bundle.strings.keys()
+            if missing:
+                logger.warning(
+                    f"Locale '{locale}' is missing {len(missing)} key(s) "
+                    f"present in '{DEFAULT_LOCALE}': {', '.join(sorted(missing))}"
+                )
 
     @staticmethod
     def _resolve_locale_file(locale: str) -> Path:
@@ -2,171 +2,36 @@ from __future__ import annotations
 
 import logging
 import typing as t
-from datetime import datetime, timedelta
 
-from jinja2 import Environment
+from jinja2 import Template
 from sulguk import RenderResult
 
+from .bundle import LocaleBundle
+
 logger = logging.getLogger(__name__)
 
 
 class Localizer:
+    """Per-request handle onto an immutable LocaleBundle."""
 
-    def __init__(
-        self,
-        jinja_env: Environment,
-        locale_data: t.Dict[str, t.Any],
-    ) -> None:
-        self.jinja_env = jinja_env
-        self.locale_data = locale_data
-
-        self.jinja_env.filters["ago"] = self._ago_filter
-        self.jinja_env.filters["toamount"] = self._toamount_filter
-        self.jinja_env.filters["sizeformat"] = self._sizeformat_filter
-        self.jinja_env.filters["datetimeformat"] = self._datetimeformat_filter
-        self.jinja_env.filters["durationformat"] = self._durationformat_filter
-
-    @staticmethod
-    async def _toamount_filter(value: t.Optional[int]) -> str:
-        if value is None:
-            return "0"
-        return f"{value / 1e9:.4f}".rstrip("0").rstrip(".")
-
-    @staticmethod
-    async def _datetimeformat_filter(
-        ts: t.Optional[t.Union[int, datetime]],
-        fmt: str = "%Y-%m-%d %H:%M",
-    ) -> str:
-        if ts is None:
-            return "N/A"
-        if isinstance(ts, int):
-            ts = datetime.fromtimestamp(ts)
-        return ts.strftime(fmt)
-
-    async def _durationformat_filter(self, seconds: t.Optional[int]) -> str:
-        if seconds is None:
-            return "N/A"
-        delta = timedelta(seconds=seconds)
-        days = delta.days
-        hours = delta.seconds // 3600
-
-        async def l(key: str) -> str:
-            return await self(f"duration_short.{key}")
-
-        if days > 365:
-            years = days // 365
-            rem_days = days % 365
-            return f"{years}{await l('year')} {rem_days}{await l('day')}"
-        elif days > 0:
-            return f"{days}{await l('day')} {hours}{await l('hour')}"
-        return f"{hours}{await l('hour')}"
-
-    async def _ago_filter(self, ts: t.Optional[t.Union[int, datetime]]) -> str:
-        if ts is None:
-            return "N/A"
-
-        try:
-            ts_int = int(ts.timestamp()) if isinstance(ts, datetime) else int(ts)
-            now = int(datetime.now().timestamp())
-            total = now - ts_int
-            if total < 0:
-                return "N/A"
-        except (TypeError, ValueError, OverflowError):
-            return "N/A"
-
-        async def l(key: str) -> str:
-            return await self(f"duration_short.{key}")
-
-        if total < 60:
-            return f"{total}{await l('second')} {await l('ago')}"
-
-        minutes = total // 60
-        if minutes < 60:
-            return f"{minutes}{await l('minute')} {await l('ago')}"
-
-        hours, rem_min = divmod(minutes, 60)
-        if hours < 24:
-            if rem_min:
-                return f"{hours}{await l('hour')} {rem_min}{await l('minute')} {await l('ago')}"
-            return f"{hours}{await l('hour')} {await l('ago')}"
-
-        days = hours // 24
-        if days < 30:
-            return f"{days}{await l('day')} {await l('ago')}"
-
-        months = days // 30
-        if months < 12:
-            return f"{months}{await l('month')} {await l('ago')}"
-
-        years = months // 12
-        return f"{years}{await l('year')} {await l('ago')}"
-
-    @staticmethod
-    async def _sizeformat_filter(value: t.Optional[t.Union[int, float]]) -> str:
-        if value is None:
-            return "0MB"
-
-        try:
-            b = float(value)
-        except (Exception,):
-            return "0MB"
-
-        sign = "-" if b < 0 else ""
-        b = abs(b)
-
-        units = [
-            ("MB", 1e6),
-            ("GB", 1e9),
-            ("TB", 1e12),
-            ("PB", 1e15),
-            ("EB", 1e18),
-            ("ZB", 1e21),
-            ("YB", 1e24),
-        ]
-
-        for name, factor in reversed(units):
-            if b >= factor:
-                num = b / factor
-                break
-        else:
-            name, factor = units[0]
-            num = b / factor
-
-        s = f"{num:.2f}".rstrip("0").rstrip(".")
-        return f"{sign}{s}{name}"
-
-    @classmethod
-    def _get_nested(
-        cls,
-        data: t.Dict[str, t.Any],
-        dotted_key: str,
-        default: t.Optional[t.Any] = None,
-    ) -> t.Any:
-        keys = dotted_key.split(".")
-        current = data
-
-        for key in keys:
-            if isinstance(current, dict) and key in current:
-                current = current[key]
-            else:
-                return default
-        return current
+    __slots__ = ("bundle", "locale", "locale_data", "templates")
 
-    def _get_locale(self, key: str, default: t.Optional[str] = None) -> t.Optional[str]:
-        if key in self.locale_data:
-            return self.locale_data[key]
+    def __init__(self, bundle: LocaleBundle) -> None:
+        self.bundle = bundle
+        self.locale = bundle.locale
+        self.locale_data = bundle.data
+        self.templates = bundle.templates
 
-        result = self._get_nested(self.locale_data, key, default)
-        if result is default:
-            logger.info(f"Localization key not found: 'key={key}'")
+    def _get_locale(self, key: str) -> t.Optional[str]:
+        return self.bundle.strings.get(key)
 
-        return result
+    def _get_template(self, key: str) -> t.Optional[Template]:
+        return self.templates.get(key)
 
     def render_sync(self, key: str, **kwargs) -> str:
-        template_str = self._get_locale(key)
-        if template_str is None:
+        template = self._get_template(key)
+        if template is None:
             return key
-        template = self.jinja_env.from_string(template_str)
         return template.render(**kwargs)
 
     async def __call__(
@@ -177,20 +42,21 @@ class Localizer:
         **kwargs: t.Any,
     ) -> t.Union[str, RenderResult]:
         if key is not None:
-            template_str = self._get_locale(key)
-            if template_str is None:
+            template = self._get_template(key)
+            if template is None:
                 logger.warning(f"Missing localization key: 'key={key}'")
                 raise KeyError(f"Localization key '{key}' not found in locale data.")
         elif default is not None:
-            template_str = default
+            template = None
         else:
             raise ValueError("Either 'key' or 'default' must be provided to Localizer.")
 
         try:
-            template = self.jinja_env.from_string(template_str)
+            if template is None:
+                template = self.bundle.env.from_string(default)
             text = await template.render_async(**kwargs)
         except (Exception,):
             logger.warning(f"Template rendering failed: 'key={key}'")
-            return template_str
+            return self._get_locale(key) if key is not None else default
 
         return text
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import typing as t
+from dataclasses import dataclass
+
+from cachetools import TTLCache
+
+from ...database.models import UserModel
+
+PROFILES_MAXSIZE = 50_000
+
+
+@dataclass(frozen=True)
+class AlertSettingsProfile:
+    enabled: bool
+    types: t.Tuple[str, ...]
+    thresholds_data: t.Optional[t.Dict[str, float]]
+
+
+@dataclass(frozen=True)
+class SubscriptionProfile:
+    provider_pubkey: str
+    telemetry_pass: t.Optional[str]
+
+
+@dataclass(frozen=True)
+class UserProfile:
+    """Read-only snapshot of a user row and its alert settings/subscriptions.
+
+    Shaped like UserModel for the attributes handlers and keyboards read,
+    so it can stand in for the model on read-only paths. Writers load the
+    model itself through the unit of work.
+    """
+
+    id: int
+    user_id: int
+    full_name: t.Optional[str]
+    username: t.Optional[str]
+    language_code: str
+    state: t.Optional[str]
+    alert_settings: AlertSettingsProfile
+    subscriptions: t.Tuple[SubscriptionProfile, ...]
+
+    @classmethod
+    def from_model(cls, user: UserModel) -> UserProfile:
+        settings = user.alert_settings
+        return cls(
+            id=user.id,
+            user_id=user.user_id,
+            full_name=user.full_name,
+            username=user.username,
+            language_code=user.language_code,
+            state=user.state,
+            alert_settings=AlertSettingsProfile(
+                enabled=settings.enabled,
+                types=tuple(settings.types or ()),
+                thresholds_data=(
+                    dict(settings.thresholds_data)
+                    if settings.thresholds_data is not None
+                    else None
+                ),
+            ),
+            subscriptions=tuple(
+                SubscriptionProfile(s.provider_pubkey, s.telemetry_pass)
+                for s in user.subscriptions
+            ),
+        )
+
+
+async def load_user_model(data: t.Dict[str, t.Any]) -> UserModel:
+    """Load the current user's row through the update's unit of work."""
+    profile: UserProfile = data["user_model"]
+    user = await data["uow"].user.get(user_id=profile.user_id)
+    if user is None:
+        raise LookupError(f"User {profile.user_id} not found")
+    return user
+
+
+def refresh_profile(data: t.Dict[str, t.Any], user: UserModel) -> None:
+    """Show a written user to the rest of this update's handlers and getters."""
+    data["user_model"] = UserProfile.from_model(user)
+
+
+class UserProfiles:
+    """Per-process TTL cache of user profiles, keyed by Telegram user id."""
+
+    def __init__(self, ttl: float, maxsize: int = PROFILES_MAXSIZE) -> None:
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, user_id: int) -> t.Optional[UserProfile]:
+        return self._cache.get(user_id)
+
+    def put(self, profile: UserProfile) -> None:
+        self._cache[profile.user_id] = profile
+
+    def invalidate(self, user_id: int) -> None:
+        self._cache.pop(user_id, None)
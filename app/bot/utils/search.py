@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import re
+import typing as t
+from collections import defaultdict
+
+NGRAM = 3
+
+_TOKEN_SPLIT = re.compile(r"[\s,.:;/\\|()\-_]+")
+
+# Field weights, by position in a search document.
+FIELD_WEIGHTS: t.Tuple[int, ...] = (
+    8,  # pubkey
+    6,  # short pubkey
+    8,  # address
+    4,  # country
+    4,  # city
+    3,  # isp
+)
+
+
+def normalize(value: t.Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+
+def _grams(text: str) -> t.Set[str]:
+    return {text[i : i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+def _prefixes(text: str) -> t.Set[str]:
+    """Short token prefixes; covers queries shorter than an n-gram."""
+    return {
+        token[:size]
+        for token in _TOKEN_SPLIT.split(text)
+        for size in range(1, NGRAM)
+        if len(token) >= size
+    }
+
+
+class ProviderSearchIndex:
+    """Trigram index over provider search documents.
+
+    A document is a tuple of normalized field values (see FIELD_WEIGHTS).
+    Candidates are the intersection of posting sets for every trigram of
+    the query, or of the token-prefix set for one- and two-character
+    queries; they are then verified and scored against the fields.
+    """
+
+    def __init__(self) -> None:
+        self._docs: t.Dict[str, t.Tuple[str, ...]] = {}
+        self._postings: t.Dict[str, t.Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _keys(self, doc: t.Tuple[str, ...]) -> t.Set[str]:
+        keys: t.Set[str] = set()
+        for field in doc:
+            keys |= _grams(field)
+            keys |= _prefixes(field)
+        return keys
+
+    def _add(self, key: str, doc: t.Tuple[str, ...]) -> None:
+        self._docs[key] = doc
+        for gram in self._keys(doc):
+            self._postings[gram].add(key)
+
+    def _remove(self, key: str) -> None:
+        doc = self._docs.pop(key)
+        for gram in self._keys(doc):
+            posting = self._postings[gram]
+            posting.discard(key)
+            if not posting:
+                del self._postings[gram]
+
+    def update(self, docs: t.Mapping[str, t.Tuple[str, ...]]) -> int:
+        """Bring the index in line with ``docs``; returns how many changed."""
+        changed = 0
+        for key in self._docs.keys() - docs.keys():
+            self._remove(key)
+            changed += 1
+        for key, doc in docs.items():
+            current = self._docs.get(key)
+            if current == doc:
+                continue
+            if current is not None:
+                self._remove(key)
+            self._add(key, doc)
+            changed += 1
+        return changed
+
+    def _score(self, query: str, doc: t.Tuple[str, ...]) -> int:
+        score = 0
+        for weight, field in zip(FIELD_WEIGHTS, doc):
+            if not field or query not in field:
+                continue
+            if field == query:
+                score = max(score, weight * 4)
+            elif field.startswith(query) or any(
+                token.startswith(query) for token in _TOKEN_SPLIT.split(field)
+            ):
+                score = max(score, weight * 2)
+            else:
+                score = max(score, weight)
+        return score
+
+    def search(self, query: str) -> t.Dict[str, int]:
+        """Return matching keys with their scores."""
+        query = normalize(query)
+        if not query:
+            return {}
+
+        if len(query) < NGRAM:
+            candidates = self._postings.get(query, set())
+        else:
+            postings = [self._postings.get(gram) for gram in _grams(query)]
+            if not all(postings):
+                return {}
+            postings.sort(key=len)
+            candidates = set.intersection(*postings)
+
+        scores = {}
+        for key in candidates:
+            score = self._score(query, self._docs[key])
+            if score:
+                scores[key] = score
+        return scores
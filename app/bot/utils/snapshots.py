@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import typing as t
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from .search import ProviderSearchIndex, normalize
+from .ui import ProviderUI
+from ...api.mytonprovider import TelemetryInfo
+from ...cache import CacheNamespaces, MetricsCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ProviderView:
+    """Immutable, session-independent copy of a provider row for rendering.
+
+    Telemetry is parsed and every ``ui`` string formatted once, when the
+    view is built; templates then only read attributes. Views compare
+    equal when their columns and display strings do, so they can key
+    render caches across rebuilds.
+    """
+
+    pubkey: str
+    address: str
+    status: t.Optional[int]
+    status_ratio: t.Optional[float]
+    uptime: float
+    working_time: int
+    rating: float
+    price: int
+    max_bag_size_bytes: int
+    max_span: int
+    min_span: int
+    reg_time: int
+    last_online_check_time: t.Optional[int]
+    ui: ProviderUI
+    location: t.Mapping[str, str] = field(compare=False)
+    telemetry: TelemetryInfo = field(compare=False)
+
+    @classmethod
+    def from_row(cls, row: t.Any) -> ProviderView:
+        """Build from a ProviderModel or a row with the same column names."""
+        telemetry = TelemetryInfo(**(row.telemetry or {}))
+        return cls(
+            **{name: getattr(row, name) for name in _COLUMN_FIELDS},
+            ui=ProviderUI.from_provider(row, telemetry),
+            location=MappingProxyType(dict(row.location or {})),
+            telemetry=telemetry,
+        )
+
+    @property
+    def country(self) -> t.Optional[str]:
+        return self.location.get("country") or self.telemetry.country
+
+    @property
+    def city(self) -> t.Optional[str]:
+        return self.location.get("city")
+
+    @property
+    def isp(self) -> t.Optional[str]:
+        return self.telemetry.isp
+
+    @property
+    def search_document(self) -> t.Tuple[str, ...]:
+        return tuple(
+            normalize(value)
+            for value in (
+                self.pubkey,
+                self.ui.short_pubkey,
+                self.address,
+                self.country,
+                self.city,
+                self.isp,
+            )
+        )
+
+
+_COLUMN_FIELDS: t.Tuple[str, ...] = (
+    "pubkey",
+    "address",
+    "status",
+    "status_ratio",
+    "uptime",
+    "working_time",
+    "rating",
+    "price",
+    "max_bag_size_bytes",
+    "max_span",
+    "min_span",
+    "reg_time",
+    "last_online_check_time",
+)
+
+
+class ProvidersIndex:
+    """Rating-sorted in-memory copy of the providers table.
+
+    Rebuilt after every provider sync; readers always see a complete
+    snapshot because the sorted tuple and its position map are swapped in
+    a single assignment. A process that does not run the sync itself
+    follows the providers version stamp the sync bumps instead.
+    """
+
+    def __init__(self) -> None:
+        self._state: t.Tuple[
+            t.Tuple[ProviderView, ...],
+            t.Dict[str, int],
+        ] = ((), {})
+        self.search_index = ProviderSearchIndex()
+        self._follow_task: t.Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._state[0])
+
+    async def rebuild(self, session_factory: async_sessionmaker) -> None:
+        from ...database.models import ProviderModel
+
+        columns = [getattr(ProviderModel, name) for name in _COLUMN_FIELDS]
+        async with session_factory() as session:
+            rows = (
+                await session.execute(
+                    select(*columns, ProviderModel.location, ProviderModel.telemetry)
+                    .order_by(ProviderModel.rating.desc(), ProviderModel.pubkey)
+                )
+            ).all()
+
+        items = tuple(ProviderView.from_row(row) for row in rows)
+        changed = self.search_index.update({s.pubkey: s.search_document for s in items})
+        self._state = items, {s.pubkey: i for i, s in enumerate(items)}
+        logger.debug(
+            "Providers index rebuilt: %d providers, %d search updates",
+            len(items),
+            changed,
+        )
+
+    def start_following(
+        self,
+        session_factory: async_sessionmaker,
+        metrics_cache: MetricsCache,
+        interval: float,
+    ) -> None:
+        if self._follow_task is None:
+            self._follow_task = asyncio.create_task(
+                self._follow(session_factory, metrics_cache, interval),
+                name="providers-index-follow",
+            )
+
+    async def shutdown(self) -> None:
+        if self._follow_task is not None:
+            self._follow_task.cancel()
+            await asyncio.gather(self._follow_task, return_exceptions=True)
+            self._follow_task = None
+
+    async def _follow(
+        self,
+        session_factory: async_sessionmaker,
+        metrics_cache: MetricsCache,
+        interval: float,
+    ) -> None:
+        seen: t.Optional[int] = None
+        while True:
+            try:
+                version = await metrics_cache.version(CacheNamespaces.PROVIDERS)
+                if seen is not None and version != seen:
+                    await self.rebuild(session_factory)
+                seen = version
+            except RedisError as e:
+                logger.warning("Providers version unavailable: %s", e)
+            except (Exception,):
+                logger.exception("Providers index rebuild failed")
+            await asyncio.sleep(interval)
+
+    def get(self, pubkey: str) -> t.Optional[ProviderView]:
+        items, positions = self._state
+        position = positions.get(pubkey)
+        return items[position] if position is not None else None
+
+    def page(
+        self,
+        offset: int,
+        limit: int,
+        pubkeys: t.Optional[t.Iterable[str]] = None,
+    ) -> t.Tuple[int, t.List[ProviderView]]:
+        """Return the total count and one page, optionally limited to pubkeys."""
+        items, positions = self._state
+        if pubkeys is None:
+            return len(items), list(items[offset : offset + limit])
+
+        selected = sorted(positions[p] for p in set(pubkeys) if p in positions)
+        return len(selected), [items[i] for i in selected[offset : offset + limit]]
+
+    def search(
+        self,
+        query: str,
+        offset: int,
+        limit: int,
+        pubkeys: t.Optional[t.Iterable[str]] = None,
+    ) -> t.Tuple[int, t.List[ProviderView]]:
+        """Like `page`, but only matches, best score first, then by rating."""
+        items, positions = self._state
+        scores = self.search_index.search(query)
+        if pubkeys is not None:
+            allowed = set(pubkeys)
+            scores = {k: v for k, v in scores.items() if k in allowed}
+
+        ranked = [
+            (-score, positions[key])
+            for key, score in scores.items()
+            if key in positions
+        ]
+        top = heapq.nsmallest(offset + limit, ranked)
+        return len(ranked), [items[i] for _, i in top[offset:]]
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+import time
+import typing as t
+from collections import deque
+from secrets import compare_digest
+
+from aiogram.types import Update
+from aiogram.types.update import UpdateTypeLookupError
+from aiohttp import web
+from pydantic import ValidationError
+
+from ..config import (
+    WEBHOOK_DRAIN_TIMEOUT,
+    WEBHOOK_HOST,
+    WEBHOOK_PATH,
+    WEBHOOK_PORT,
+    WEBHOOK_QUEUE_SIZE,
+    WEBHOOK_SECRET,
+    WEBHOOK_URL,
+    WEBHOOK_WORKERS,
+)
+
+if t.TYPE_CHECKING:
+    from ..context import Context
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+def update_key(update: Update) -> t.Hashable:
+    """Updates with the same key are handled one at a time, in order.
+
+    Keyed by the sender, so a user's dialog stack and FSM state are never
+    touched by two of their updates at once. Updates without a sender get
+    a key of their own and run freely, as do updates of a type aiogram
+    does not know.
+    """
+    try:
+        event = update.event
+    except UpdateTypeLookupError:
+        return object()
+    user = getattr(event, "from_user", None)
+    if user is not None:
+        return "user", user.id
+    chat = getattr(event, "chat", None)
+    if chat is not None:
+        return "chat", chat.id
+    return object()
+
+
+class UpdateWorkerPool:
+    """Bounded queue of updates drained by a fixed number of workers.
+
+    Only keys are queued: a key is ready while it has pending updates and
+    no worker holds it, and a worker puts it back after handling one of
+    its updates. That serialises each key without parking workers on
+    locks, and rotates between busy keys instead of draining one first.
+    """
+
+    def __init__(
+        self,
+        handle: t.Callable[[Update], t.Awaitable[t.Any]],
+        workers: int,
+        maxsize: int,
+    ) -> None:
+        self._handle = handle
+        self.workers = workers
+        self.maxsize = maxsize
+        self._ready: asyncio.Queue[t.Hashable] = asyncio.Queue()
+        self._pending: t.Dict[t.Hashable, t.Deque[t.Tuple[Update, float]]] = {}
+        self._tasks: t.List[asyncio.Task] = []
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._closing = False
+
+        self.queued = 0
+        self.busy = 0
+        self.peak_queued = 0
+        self.received = 0
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"webhook-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    def submit(self, update: Update) -> bool:
+        """Queue an update; False when full or closing, so the caller can refuse it."""
+        if self._closing or self.queued >= self.maxsize:
+            self.rejected += 1
+            return False
+
+        self.received += 1
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        self._idle.clear()
+
+        key = update_key(update)
+        entry = (update, time.monotonic())
+        chain = self._pending.get(key)
+        if chain is not None:
+            chain.append(entry)
+        else:
+            self._pending[key] = deque([entry])
+            self._ready.put_nowait(key)
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            key = await self._ready.get()
+            chain = self._pending[key]
+            update, enqueued_at = chain.popleft()
+            self.queued -= 1
+            self.busy += 1
+
+            wait = time.monotonic() - enqueued_at
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            try:
+                await self._handle(update)
+            except Exception:
+                self.failed += 1
+                logger.exception("Update id=%s failed", update.update_id)
+            finally:
+                self.busy -= 1
+                self.processed += 1
+                if chain:
+                    self._ready.put_nowait(key)
+                else:
+                    del self._pending[key]
+                if not self.queued and not self.busy:
+                    self._idle.set()
+
+    async def close(self, timeout: float) -> None:
+        """Refuse new updates, wait up to ``timeout`` for queued ones, stop workers."""
+        self._closing = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Webhook drain timed out: %d queued, %d in progress dropped",
+                self.queued,
+                self.busy,
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> t.Dict[str, t.Any]:
+        handled = self.processed or 1
+        return {
+            "workers": self.workers,
+            "busy": self.busy,
+            "queued": self.queued,
+            "queue_limit": self.maxsize,
+            "peak_queued": self.peak_queued,
+            "keys_waiting": len(self._pending),
+            "received": self.received,
+            "processed": self.processed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "wait_avg_ms": round(self.wait_total / handled * 1000, 3),
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+def build_app(ctx: Context, pool: UpdateWorkerPool) -> web.Application:
+    def authorized(request: web.Request) -> bool:
+        return not WEBHOOK_SECRET or compare_digest(
+            request.headers.get(SECRET_HEADER, ""), WEBHOOK_SECRET
+        )
+
+    async def receive(request: web.Request) -> web.Response:
+        if not authorized(request):
+            return web.Response(status=401)
+
+        try:
+            update = Update.model_validate(await request.json(), context={"bot": ctx.bot})
+        except (ValueError, ValidationError):
+            return web.Response(status=400)
+        if not pool.submit(update):
+            # Telegram redelivers refused updates later.
+            return web.Response(status=503, headers={"Retry-After": "1"})
+        return web.Response()
+
+    async def stats(request: web.Request) -> web.Response:
+        if not authorized(request):
+            return web.Response(status=401)
+        return web.json_response({**pool.stats(), "loop": ctx.loop_lag.stats()})
+
+    app = web.Application()
+    app.router.add_post(WEBHOOK_PATH, receive)
+    app.router.add_get(f"{WEBHOOK_PATH}/stats", stats)
+    return app
+
+
+async def run_webhook(ctx: Context, allowed_updates: t.List[str]) -> None:
+    """Serve updates over a webhook until SIGINT/SIGTERM, then drain and stop."""
+    dp, bot = ctx.dp, ctx.bot
+    pool = UpdateWorkerPool(
+        lambda update: dp.feed_update(bot, update),
+        workers=WEBHOOK_WORKERS,
+        maxsize=WEBHOOK_QUEUE_SIZE,
+    )
+    runner = web.AppRunner(build_app(ctx, pool))
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await dp.emit_startup(bot=bot, **dp.workflow_data)
+    try:
+        pool.start()
+        await runner.setup()
+        await web.TCPSite(runner, WEBHOOK_HOST, WEBHOOK_PORT).start()
+        await bot.set_webhook(
+            url=f"{WEBHOOK_URL.rstrip('/')}{WEBHOOK_PATH}",
+            secret_token=WEBHOOK_SECRET or None,
+            allowed_updates=allowed_updates,
+        )
+        logger.info(
+            "Webhook listening on %s:%s%s with %d workers",
+            WEBHOOK_HOST,
+            WEBHOOK_PORT,
+            WEBHOOK_PATH,
+            WEBHOOK_WORKERS,
+        )
+        await stop.wait()
+    finally:
+        logger.info("Webhook stopping, draining %d queued updates", pool.queued)
+        await pool.close(WEBHOOK_DRAIN_TIMEOUT)
+        await runner.cleanup()
+        await dp.emit_shutdown(bot=bot, **dp.workflow_data)
@@ -0,0 +1,11 @@
+from .limiter import RateLimiter, ThrottlingRule
+from .metrics import MetricsCache
+from .types import CacheNamespaces, ThrottlingModes
+
+__all__ = [
+    "CacheNamespaces",
+    "MetricsCache",
+    "RateLimiter",
+    "ThrottlingModes",
+    "ThrottlingRule",
+]
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import typing as t
+import uuid
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+
+from .types import ThrottlingModes
+
+THROTTLING_PREFIX = "throttling"
+
+# Returns 0 when the hit is allowed, otherwise milliseconds until it would be.
+_COOLDOWN_SCRIPT = """
+if redis.call('SET', KEYS[1], '1', 'NX', 'PX', ARGV[1]) then
+    return 0
+end
+return math.max(redis.call('PTTL', KEYS[1]), 1)
+"""
+
+_SLIDING_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return 0
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return math.max(tonumber(oldest[2]) + window - now, 1)
+"""
+
+
+@dataclass(frozen=True)
+class ThrottlingRule:
+    """Allow ``limit`` hits per ``period`` seconds.
+
+    COOLDOWN blocks for ``period`` after an allowed hit (``limit`` is 1);
+    SLIDING counts hits over the trailing ``period``.
+    """
+
+    period: float
+    limit: int = 1
+    mode: ThrottlingModes = ThrottlingModes.COOLDOWN
+
+    @property
+    def period_ms(self) -> int:
+        return max(int(self.period * 1000), 1)
+
+
+class RateLimiter:
+    """Atomic per-key rate limiting shared by every process using the Redis."""
+
+    def __init__(self, redis: Redis, prefix: str = THROTTLING_PREFIX) -> None:
+        self.redis = redis
+        self.prefix = prefix
+        self._cooldown = redis.register_script(_COOLDOWN_SCRIPT)
+        self._sliding = redis.register_script(_SLIDING_SCRIPT)
+
+    async def hit(self, name: str, subject: t.Union[int, str], rule: ThrottlingRule) -> int:
+        """Record a hit; return 0 if allowed, else milliseconds to wait."""
+        key = f"{self.prefix}:{name}:{subject}"
+        if rule.mode == ThrottlingModes.SLIDING:
+            args = [rule.period_ms, rule.limit, uuid.uuid4().hex]
+            return int(await self._sliding(keys=[key], args=args))
+        return int(await self._cooldown(keys=[key], args=[rule.period_ms]))
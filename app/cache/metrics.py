@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import typing as t
+import uuid
+from datetime import datetime
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from .types import CacheNamespaces
+
+logger = logging.getLogger(__name__)
+
+METRICS_CACHE_PREFIX = "metrics"
+METRICS_CACHE_TTL = 10 * 60
+METRICS_LOCK_TTL_MS = 5_000
+METRICS_LOCK_POLL = 0.05
+
+_DATETIME_TAG = "__dt__"
+
+# Deletes the build lock only if it still holds this builder's token, so a
+# build that outlived the lock can't release a lock another process took.
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _default(value: t.Any) -> t.Any:
+    if isinstance(value, datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _object_hook(value: t.Dict[str, t.Any]) -> t.Any:
+    if len(value) == 1 and _DATETIME_TAG in value:
+        return datetime.fromisoformat(value[_DATETIME_TAG])
+    return value
+
+
+def dumps(value: t.Any) -> str:
+    return json.dumps(value, default=_default, separators=(",", ":"))
+
+
+def loads(raw: t.Union[str, bytes]) -> t.Any:
+    return json.loads(raw, object_hook=_object_hook)
+
+
+class MetricsCache:
+    """Read-through Redis cache for metric dicts.
+
+    Keys embed the current version stamp of every namespace they depend
+    on, so bumping a namespace makes all dependent entries unreachable at
+    once; stale keys simply expire. Concurrent misses for the same key are
+    collapsed in-process, and across processes through a short Redis lock.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        prefix: str = METRICS_CACHE_PREFIX,
+        ttl: int = METRICS_CACHE_TTL,
+        lock_ttl_ms: int = METRICS_LOCK_TTL_MS,
+    ) -> None:
+        self.redis = redis
+        self.prefix = prefix
+        self.ttl = ttl
+        self.lock_ttl_ms = lock_ttl_ms
+        self._inflight: t.Dict[str, asyncio.Future] = {}
+        self._release = redis.register_script(_RELEASE_SCRIPT)
+
+    def _version_key(self, namespace: CacheNamespaces) -> str:
+        return f"{self.prefix}:version:{namespace.value}"
+
+    async def bump(self, *namespaces: CacheNamespaces) -> None:
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for namespace in namespaces:
+                    pipe.incr(self._version_key(namespace))
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Failed to bump metrics cache versions: %s", namespaces)
+
+    async def version(self, namespace: CacheNamespaces) -> int:
+        """Current version stamp of a namespace; 0 until it is first bumped."""
+        raw = await self.redis.get(self._version_key(namespace))
+        return int(raw) if raw else 0
+
+    async def _key(
+        self,
+        name: str,
+        scope: str,
+        namespaces: t.Sequence[CacheNamespaces],
+    ) -> str:
+        versions = await self.redis.mget([self._version_key(ns) for ns in namespaces])
+        stamp = ".".join((v.decode() if v else "0") for v in versions)
+        return f"{self.prefix}:{name}:{scope}:{stamp}"
+
+    async def get_or_build(
+        self,
+        name: str,
+        scope: str,
+        namespaces: t.Sequence[CacheNamespaces],
+        builder: t.Callable[[], t.Awaitable[t.Any]],
+    ) -> t.Any:
+        """Return the cached value, building and storing it on a miss.
+
+        Falls back to calling ``builder`` directly when Redis is unavailable.
+        """
+        try:
+            key = await self._key(name, scope, namespaces)
+            raw = await self.redis.get(key)
+        except RedisError:
+            logger.warning("Metrics cache unavailable, building %s directly", name)
+            return await builder()
+
+        if raw is not None:
+            return loads(raw)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._build(key, builder)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so waiter-less failures are not logged as unhandled.
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _build(
+        self,
+        key: str,
+        builder: t.Callable[[], t.Awaitable[t.Any]],
+    ) -> t.Any:
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis.set(lock_key, token, nx=True, px=self.lock_ttl_ms)
+        except RedisError:
+            return await builder()
+
+        if not acquired:
+            value = await self._wait_for(key)
+            if value is not None:
+                return value
+
+        try:
+            value = await builder()
+            try:
+                raw = dumps(value)
+            except (TypeError, ValueError):
+                logger.exception("Failed to serialize %s for metrics cache", key)
+                return value
+            try:
+                await self.redis.set(key, raw, ex=self.ttl)
+            except RedisError:
+                logger.warning("Failed to store %s in metrics cache", key)
+            return value
+        finally:
+            if acquired:
+                try:
+                    await self._release(keys=[lock_key], args=[token])
+                except RedisError:
+                    pass
+
+    async def _wait_for(self, key: str) -> t.Any:
+        """Poll for a value another process is building, until its lock expires."""
+        deadline = time.monotonic() + self.lock_ttl_ms / 1000
+        while time.monotonic() < deadline:
+            await asyncio.sleep(METRICS_LOCK_POLL)
+            try:
+                raw = await self.redis.get(key)
+            except RedisError:
+                return None
+            if raw is not None:
+                return loads(raw)
+        return None
@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class CacheNamespaces(str, Enum):
+    PROVIDERS = "providers"
+    WALLETS = "wallets"
+    BAGS = "bags"
+
+
+class ThrottlingModes(str, Enum):
+    COOLDOWN = "cooldown"
+    SLIDING = "sliding"
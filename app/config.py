@@ -13,17 +13,48 @@ TIMEZONE = ZoneInfo(ENV.str("TIMEZONE", "UTC"))
 LOCALES_DIR: Path = BASE_DIR.parent / "locales"
 DEFAULT_LOCALE: str = ENV.str("DEFAULT_LOCALE", "en")
 SUPPORTED_LOCALES: t.List[str] = ENV.list("SUPPORTED_LOCALES", default=[DEFAULT_LOCALE])
+LOCALES_RELOAD_INTERVAL: float = ENV.float("LOCALES_RELOAD_INTERVAL", 0)
+USER_PROFILE_TTL: int = ENV.int("USER_PROFILE_TTL", 60)
+PROVIDERS_INDEX_POLL_INTERVAL: float = ENV.float("PROVIDERS_INDEX_POLL_INTERVAL", 5)
+CPU_WORKERS: int = ENV.int("CPU_WORKERS", 2)
+LOOP_LAG_INTERVAL: float = ENV.float("LOOP_LAG_INTERVAL", 0.5)
+LOOP_LAG_WARN: float = ENV.float("LOOP_LAG_WARN", 0.1)
+METRICS_HOST: str = ENV.str("METRICS_HOST", "127.0.0.1")
+METRICS_PORT: int = ENV.int("METRICS_PORT", 0)
+SQL_PROFILER: bool = ENV.bool("SQL_PROFILER", False)
+SQL_PROFILER_SLOW_MS: int = ENV.int("SQL_PROFILER_SLOW_MS", 200)
 
 DEV_ID: int = ENV.int("DEV_ID")
 ADMIN_IDS: list = ENV.list("ADMIN_IDS", subcast=int, default=[])
 
 DB_URL = ENV.str("DB_URL")
+DB_POOL_SIZE: int = ENV.int("DB_POOL_SIZE", 3)
+DB_MAX_OVERFLOW: int = ENV.int("DB_MAX_OVERFLOW", 4)
+DB_POOL_TIMEOUT: float = ENV.float("DB_POOL_TIMEOUT", 30)
+DB_READ_POOL_SIZE: int = ENV.int("DB_READ_POOL_SIZE", 4)
+DB_READ_MAX_OVERFLOW: int = ENV.int("DB_READ_MAX_OVERFLOW", 4)
+HISTORY_RETENTION_DAYS: int = ENV.int("HISTORY_RETENTION_DAYS", 0)
 REDIS_URL = ENV.str("REDIS_URL")
 SCHEDULER_URL = ENV.str("SCHEDULER_URL")
 
 BOT_TOKEN: str = ENV.str("BOT_TOKEN")
+TELEGRAM_API_URL: str = ENV.str("TELEGRAM_API_URL", "")
+
+WEBHOOK_URL: str = ENV.str("WEBHOOK_URL", "")
+WEBHOOK_PATH: str = ENV.str("WEBHOOK_PATH", "/webhook")
+WEBHOOK_SECRET: str = ENV.str("WEBHOOK_SECRET", "")
+WEBHOOK_HOST: str = ENV.str("WEBHOOK_HOST", "0.0.0.0")
+WEBHOOK_PORT: int = ENV.int("WEBHOOK_PORT", 8080)
+WEBHOOK_WORKERS: int = ENV.int("WEBHOOK_WORKERS", 16)
+WEBHOOK_QUEUE_SIZE: int = ENV.int("WEBHOOK_QUEUE_SIZE", 1000)
+WEBHOOK_DRAIN_TIMEOUT: float = ENV.float("WEBHOOK_DRAIN_TIMEOUT", 30)
 
 TONCENTER_API_KEY = ENV.str("TONCENTER_API_KEY")
 MYTONPROVIDER_API_KEY = ENV.str("MYTONPROVIDER_API_KEY")
+TELEMETRY_STREAM: bool = ENV.bool("TELEMETRY_STREAM", False)
+TELEMETRY_STREAM_BATCH: int = ENV.int("TELEMETRY_STREAM_BATCH", 200)
+TELEMETRY_HISTORY_PACKED: bool = ENV.bool("TELEMETRY_HISTORY_PACKED", False)
+SERIES_DIR: str = ENV.str("SERIES_DIR", "")
+SERIES_VERIFY: bool = ENV.bool("SERIES_VERIFY", False)
 TELEMETRY_URL_SALT = "https://mytonprovider.org/api/v1/providers"
 ADMIN_PASSWORD = ENV.str("ADMIN_PASSWORD")
@@ -10,8 +10,17 @@ if t.TYPE_CHECKING:
     from .api.toncenter import ToncenterClient
     from .api.mytonprovider import MytonproviderClient
     from .bot.broadcaster import Broadcaster
+    from .bot.outbox import Outbox, OutboxConsumer
+    from .bot.utils.snapshots import ProvidersIndex
     from .bot.utils.i18n import I18N
+    from .bot.utils.profiles import UserProfiles
+    from .cache import MetricsCache
     from .database.database import Database
+    from .database.series import SeriesStore
+    from .events import EventBus
+    from .monitoring import MetricsServer, SqlProfiler
+    from .roles import Roles
+    from .runtime import CpuPool, LoopLagMonitor
     from .scheduler.scheduler import Scheduler
 
 _CTX: t.Optional[Context] = None
@@ -20,14 +29,25 @@ _STORAGE_KEY: str = "__context_storage__"
 
 class Context:
     bot: Bot
-    broadcaster: Broadcaster
+    broadcaster: t.Union[Broadcaster, Outbox]
+    cpu: CpuPool
     db: Database
     dp: Dispatcher
+    events: EventBus
     i18n: I18N
+    loop_lag: LoopLagMonitor
+    metrics_cache: MetricsCache
+    metrics_server: t.Optional[MetricsServer]
     mytonprovider: MytonproviderClient
+    outbox_consumer: OutboxConsumer
+    providers_index: ProvidersIndex
     toncenter: ToncenterClient
     redis: Redis
+    role: Roles
     scheduler: Scheduler
+    series: t.Optional[SeriesStore]
+    sql_profiler: t.Optional[SqlProfiler]
+    user_profiles: UserProfiles
 
     @classmethod
     def _storage(cls) -> dict[str, t.Any]:
@@ -0,0 +1,384 @@
+"""What differs between the database engines ``DB_URL`` can point at.
+
+``Database`` picks a backend from the URL's dialect, and everything that
+depends on the engine goes through it: connection setup, schema creation,
+upserts, downsampling and retention. Switching to PostgreSQL only takes a
+different ``DB_URL``.
+"""
+
+from __future__ import annotations
+
+import inspect
+import logging
+import os
+import re
+import typing as t
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import MetaData, PrimaryKeyConstraint, Table, delete, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import URL, Connection, Dialect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.dml import Insert
+from sqlalchemy.util import await_only
+
+from .models import (
+    BaseModel,
+    ProviderHistoryModel,
+    TelemetryHistoryModel,
+    WalletHistoryModel,
+)
+from ..config import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_READ_MAX_OVERFLOW,
+    DB_READ_POOL_SIZE,
+    TIMEZONE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Append-only tables keyed by ``archived_at``.
+HISTORY_TABLES: t.Tuple[Table, ...] = (
+    ProviderHistoryModel.__table__,
+    TelemetryHistoryModel.__table__,
+    WalletHistoryModel.__table__,
+)
+
+
+def dialect_insert(table: Table, dialect: Dialect) -> Insert:
+    """An INSERT that supports ``on_conflict_do_update`` on ``dialect``."""
+    if dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+def _month_start(dt: datetime) -> datetime:
+    return dt.astimezone(TIMEZONE).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(dt: datetime) -> datetime:
+    return (dt + timedelta(days=32)).replace(day=1)
+
+
+@dataclass(frozen=True)
+class StorageStats:
+    database_bytes: int
+    wal_bytes: int
+    pages: int
+    free_pages: int
+
+    @property
+    def free_ratio(self) -> float:
+        return self.free_pages / self.pages if self.pages else 0.0
+
+
+class Backend:
+    name: str = ""
+
+    def engine_options(self) -> t.Dict[str, t.Any]:
+        return {
+            "pool_pre_ping": True,
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "connect_args": {"timeout": 30},
+        }
+
+    def on_connect(self, dbapi_connection: t.Any, _: t.Any) -> None:
+        pass
+
+    def read_url(self, url: URL) -> t.Optional[URL]:
+        """URL of a separate read-only engine, or None to read through the writer."""
+        return None
+
+    def read_engine_options(self) -> t.Dict[str, t.Any]:
+        return {
+            **self.engine_options(),
+            "pool_size": DB_READ_POOL_SIZE,
+            "max_overflow": DB_READ_MAX_OVERFLOW,
+        }
+
+    def on_read_connect(self, dbapi_connection: t.Any, _: t.Any) -> None:
+        pass
+
+    def create_schema(self, connection: Connection) -> None:
+        BaseModel.metadata.create_all(connection)
+
+    async def downsample_hour(
+        self,
+        session: AsyncSession,
+        table: Table,
+        key: str,
+        start: datetime,
+        end: datetime,
+    ) -> None:
+        """Keep only the latest row per ``key`` archived in [start, end)."""
+        raise NotImplementedError
+
+    def prune_history(self, connection: Connection, cutoff: datetime) -> None:
+        """Drop history rows archived before ``cutoff``."""
+        for table in HISTORY_TABLES:
+            connection.execute(delete(table).where(table.c.archived_at < cutoff))
+
+    def maintain_history(self, connection: Connection, now: datetime) -> None:
+        """Prepare the history tables for upcoming writes."""
+
+    def maintain_storage(self, connection: Connection) -> None:
+        """Reclaim free space and refresh planner statistics, in autocommit mode."""
+
+    def storage_stats(self, connection: Connection) -> t.Optional[StorageStats]:
+        """Size and fragmentation of the database, if the backend reports them."""
+        return None
+
+
+class SqliteBackend(Backend):
+    name = "sqlite"
+    # Free pages handed back to the filesystem per maintenance run.
+    VACUUM_PAGES = 25_000
+
+    def on_connect(self, dbapi_connection: t.Any, _: t.Any) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA busy_timeout = 30000;")
+        # Only applies to a new database; existing ones are converted by a migration.
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+        cursor.execute("PRAGMA journal_mode = WAL;")
+        cursor.execute("PRAGMA synchronous = NORMAL;")
+        cursor.execute("PRAGMA cache_size = -20000;")  # ~20 MB
+        cursor.execute("PRAGMA mmap_size = 268435456;")  # 256 MB
+        cursor.execute("PRAGMA wal_autocheckpoint = 1000;")
+        cursor.execute("PRAGMA foreign_keys = ON;")
+        cursor.execute("PRAGMA temp_store = MEMORY;")
+        cursor.close()
+
+    def read_url(self, url: URL) -> t.Optional[URL]:
+        # Readers see the writer's commits through the WAL, so a second
+        # pool keeps history scans from waiting behind the jobs' writes.
+        database = url.database
+        if not database or database == ":memory:" or database.startswith("file:"):
+            return None
+        return url.set(
+            database=f"file:{database}",
+            query={**url.query, "mode": "ro", "uri": "true"},
+        )
+
+    def on_read_connect(self, dbapi_connection: t.Any, _: t.Any) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA busy_timeout = 30000;")
+        cursor.execute("PRAGMA query_only = ON;")
+        cursor.execute("PRAGMA cache_size = -65536;")  # ~64 MB
+        cursor.execute("PRAGMA mmap_size = 1073741824;")  # 1 GB
+        cursor.execute("PRAGMA temp_store = MEMORY;")
+        cursor.close()
+
+    def maintain_storage(self, connection: Connection) -> None:
+        # The downsample jobs free pages every hour; without this they stay
+        # in the file, and autocheckpoints never shrink the WAL file.
+        # A plain execute frees a single page per call; executescript runs
+        # incremental_vacuum to completion.
+        script = connection.connection.driver_connection.executescript(
+            f"PRAGMA incremental_vacuum({self.VACUUM_PAGES});"
+        )
+        if inspect.isawaitable(script):  # aiosqlite
+            await_only(script)
+        connection.exec_driver_sql("PRAGMA analysis_limit = 1000")
+        connection.exec_driver_sql("PRAGMA optimize").all()
+        busy, _, _ = connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").one()
+        if busy:
+            logger.info("WAL checkpoint did not finish: a reader or writer was active")
+
+    def storage_stats(self, connection: Connection) -> t.Optional[StorageStats]:
+        def pragma(name: str) -> int:
+            return connection.exec_driver_sql(f"PRAGMA {name}").scalar_one()
+
+        page_size = pragma("page_size")
+        pages = pragma("page_count")
+        path = next(
+            row.file for row in connection.exec_driver_sql("PRAGMA database_list")
+            if row.name == "main"
+        )
+        wal_path = f"{path}-wal"
+        return StorageStats(
+            database_bytes=pages * page_size,
+            wal_bytes=os.path.getsize(wal_path) if path and os.path.exists(wal_path) else 0,
+            pages=pages,
+            free_pages=pragma("freelist_count"),
+        )
+
+    async def downsample_hour(
+        self,
+        session: AsyncSession,
+        table: Table,
+        key: str,
+        start: datetime,
+        end: datetime,
+    ) -> None:
+        sql = text(
+            f"""
+            WITH ranked AS (
+              SELECT
+                rowid,
+                ROW_NUMBER() OVER (
+                  PARTITION BY {key}
+                  ORDER BY archived_at DESC
+                ) AS rn
+              FROM {table.name}
+              WHERE archived_at >= :start_prev_hour
+                AND archived_at <  :end_prev_hour
+            )
+            DELETE FROM {table.name}
+            WHERE rowid IN (SELECT rowid FROM ranked WHERE rn > 1);
+            """
+        )
+        # Stored timestamps are text; compare them as text.
+        await session.execute(
+            sql,
+            {
+                "start_prev_hour": start.strftime("%Y-%m-%d %H:00:00"),
+                "end_prev_hour": end.strftime("%Y-%m-%d %H:00:00"),
+            },
+        )
+
+
+class PostgresBackend(Backend):
+    """History tables are range-partitioned by month on ``archived_at``.
+
+    Partitions are created ahead of time, with a default partition for
+    anything outside them (such as older rows copied in), so retention
+    drops whole months instead of deleting rows one by one.
+    """
+
+    name = "postgresql"
+    # Months after the current one that get their partition in advance.
+    PARTITIONS_AHEAD = 2
+
+    @staticmethod
+    def partitioned_table(table: Table) -> Table:
+        """``table`` as a partitioned table; its primary key must include ``archived_at``."""
+        copy = table.to_metadata(MetaData())
+        copy.c.archived_at.primary_key = True
+        copy.append_constraint(PrimaryKeyConstraint(copy.c.id, copy.c.archived_at))
+        copy.dialect_options["postgresql"]["partition_by"] = "RANGE (archived_at)"
+        return copy
+
+    @staticmethod
+    def partition_name(table: Table, month: datetime) -> str:
+        return f"{table.name}_p{month:%Y%m}"
+
+    def create_schema(self, connection: Connection) -> None:
+        BaseModel.metadata.create_all(
+            connection,
+            tables=[
+                table
+                for table in BaseModel.metadata.sorted_tables
+                if table not in HISTORY_TABLES
+            ],
+        )
+        for table in HISTORY_TABLES:
+            self.partitioned_table(table).create(connection, checkfirst=True)
+            connection.execute(
+                text(f"CREATE TABLE IF NOT EXISTS {table.name}_default PARTITION OF {table.name} DEFAULT")
+            )
+        self.maintain_history(connection, datetime.now(TIMEZONE))
+
+    def maintain_history(self, connection: Connection, now: datetime) -> None:
+        month = _month_start(now)
+        for _ in range(self.PARTITIONS_AHEAD + 1):
+            end = _next_month(month)
+            for table in HISTORY_TABLES:
+                connection.execute(
+                    text(
+                        f"CREATE TABLE IF NOT EXISTS {self.partition_name(table, month)} "
+                        f"PARTITION OF {table.name} "
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+                    )
+                )
+            month = end
+
+    def _partitions(self, connection: Connection, table: Table) -> t.List[t.Tuple[str, datetime]]:
+        """Monthly partitions of ``table`` with the start of their month."""
+        result = connection.execute(
+            text(
+                """
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = :table
+                """
+            ),
+            {"table": table.name},
+        )
+        pattern = re.compile(rf"^{re.escape(table.name)}_p(\d{{4}})(\d{{2}})$")
+        partitions = []
+        for (name,) in result:
+            match = pattern.match(name)
+            if match:
+                month = datetime(int(match[1]), int(match[2]), 1, tzinfo=TIMEZONE)
+                partitions.append((name, month))
+        return partitions
+
+    def prune_history(self, connection: Connection, cutoff: datetime) -> None:
+        for table in HISTORY_TABLES:
+            for name, month in self._partitions(connection, table):
+                if _next_month(month) <= cutoff:
+                    connection.execute(text(f"DROP TABLE {name}"))
+                    logger.info("Dropped history partition %s", name)
+        # The month the cutoff falls in, and the default partition.
+        super().prune_history(connection, cutoff)
+
+    async def downsample_hour(
+        self,
+        session: AsyncSession,
+        table: Table,
+        key: str,
+        start: datetime,
+        end: datetime,
+    ) -> None:
+        # The repeated range on the outer table lets the planner prune
+        # partitions for the DELETE as well.
+        sql = text(
+            f"""
+            WITH ranked AS (
+              SELECT
+                id,
+                archived_at,
+                ROW_NUMBER() OVER (
+                  PARTITION BY {key}
+                  ORDER BY archived_at DESC
+                ) AS rn
+              FROM {table.name}
+              WHERE archived_at >= :start_prev_hour
+                AND archived_at <  :end_prev_hour
+            )
+            DELETE FROM {table.name} AS history
+            USING ranked
+            WHERE history.archived_at >= :start_prev_hour
+              AND history.archived_at <  :end_prev_hour
+              AND history.id = ranked.id
+              AND history.archived_at = ranked.archived_at
+              AND ranked.rn > 1
+            """
+        )
+        await session.execute(
+            sql,
+            {
+                "start_prev_hour": start.replace(minute=0, second=0, microsecond=0),
+                "end_prev_hour": end.replace(minute=0, second=0, microsecond=0),
+            },
+        )
+
+
+_BACKENDS: t.Dict[str, t.Type[Backend]] = {
+    SqliteBackend.name: SqliteBackend,
+    PostgresBackend.name: PostgresBackend,
+}
+
+
+def get_backend(dialect_name: str) -> Backend:
+    try:
+        return _BACKENDS[dialect_name]()
+    except KeyError:
+        raise ValueError(f"Unsupported database backend: {dialect_name}") from None
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
 
 from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -11,8 +11,9 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
-from .models import BaseModel
+from .backends import Backend, get_backend
 from ..config import DB_URL
+from ..monitoring import instrument_engine
 
 logger = logging.getLogger(__name__)
 
@@ -20,46 +21,52 @@ logger = logging.getLogger(__name__)
 class Database:
 
     def __init__(self) -> None:
+        self.backend: Backend = get_backend(make_url(DB_URL).get_backend_name())
         self.engine: AsyncEngine = create_async_engine(
             url=DB_URL,
-            connect_args={"timeout": 30},
-            pool_pre_ping=True,
-            pool_size=3,
-            max_overflow=4,
+            **self.backend.engine_options(),
         )
 
-        event.listen(self.engine.sync_engine, "connect", self._set_sqlite_pragmas)
+        event.listen(self.engine.sync_engine, "connect", self.backend.on_connect)
+        instrument_engine(self.engine)
+
+        # Bot reads (getters, metrics, the providers index) get their own
+        # read-only engine where the backend supports one.
+        read_url = self.backend.read_url(self.engine.url)
+        if read_url is None:
+            self.read_engine: AsyncEngine = self.engine
+        else:
+            self.read_engine = create_async_engine(
+                url=read_url,
+                **self.backend.read_engine_options(),
+            )
+            event.listen(self.read_engine.sync_engine, "connect", self.backend.on_read_connect)
+            instrument_engine(self.read_engine)
 
         self.session_factory: async_sessionmaker = async_sessionmaker(
             bind=self.engine,
             class_=AsyncSession,
             expire_on_commit=False,
         )
-
-    @staticmethod
-    def _set_sqlite_pragmas(dbapi_connection: Any, _: Any) -> None:
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA busy_timeout = 30000;")
-        cursor.execute("PRAGMA journal_mode = WAL;")
-        cursor.execute("PRAGMA synchronous = NORMAL;")
-        cursor.execute("PRAGMA cache_size = -20000;")  # ~20 MB
-        cursor.execute("PRAGMA mmap_size = 268435456;")  # 256 MB
-        cursor.execute("PRAGMA wal_autocheckpoint = 1000;")
-        cursor.execute("PRAGMA foreign_keys = ON;")
-        cursor.execute("PRAGMA temp_store = MEMORY;")
-        cursor.close()
+        self.read_session_factory: async_sessionmaker = async_sessionmaker(
+            bind=self.read_engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
 
     async def start(self) -> None:
         try:
             async with self.engine.begin() as conn:
-                await conn.run_sync(BaseModel.metadata.create_all)
-            logger.info("Database schema initialized")
+                await conn.run_sync(self.backend.create_schema)
+            logger.info("Database schema initialized (%s)", self.backend.name)
         except Exception:
             logger.error("Failed to initialize database")
             raise
 
     async def shutdown(self) -> None:
         try:
+            if self.read_engine is not self.engine:
+                await self.read_engine.dispose()
             await self.engine.dispose()
             logger.info("Database shutdown complete")
         except Exception:
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import typing as t
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .backends import dialect_insert
+from .models import TelemetryModel, TelemetryHistoryModel
+from ..api.mytonprovider import Telemetry, TelemetryResponse
+
+TELEMETRY_FIELDS: t.Tuple[str, ...] = tuple(Telemetry.model_fields)
+
+_telemetry_table = TelemetryModel.__table__
+_telemetry_history_table = TelemetryHistoryModel.__table__
+
+
+def telemetry_params(telemetry: Telemetry) -> t.Dict[str, t.Any]:
+    """Convert a parsed telemetry item into Core insert parameters.
+
+    The same mapping is shared by the history insert and the current-row
+    upsert; the per-table timestamp is bound once per statement instead.
+    """
+    params = telemetry.model_dump()
+    params["provider_pubkey"] = telemetry.storage.provider.pubkey.lower()
+    return params
+
+
+def parse_telemetry(raw: bytes) -> t.List[t.Dict[str, t.Any]]:
+    """Validate a raw telemetry response into insert parameters.
+
+    Runs in the CPU pool: it takes and returns plain data, and the
+    validation of the whole response is the expensive part.
+    """
+    response = TelemetryResponse.model_validate_json(raw)
+    return [telemetry_params(telemetry) for telemetry in response.providers]
+
+
+async def fetch_telemetry_timestamps(session: AsyncSession) -> t.Dict[str, int]:
+    result = await session.execute(
+        select(TelemetryModel.provider_pubkey, TelemetryModel.timestamp)
+    )
+    return {pubkey: timestamp for pubkey, timestamp in result}
+
+
+async def write_telemetry(
+    session: AsyncSession,
+    params: t.List[t.Dict[str, t.Any]],
+    now: datetime,
+) -> None:
+    """Append history rows and upsert current rows with two executemany calls."""
+    if not params:
+        return
+
+    await session.execute(
+        insert(_telemetry_history_table).values(archived_at=now),
+        params,
+    )
+
+    stmt = dialect_insert(_telemetry_table, session.get_bind().dialect)
+    stmt = stmt.values(updated_at=now)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[_telemetry_table.c.provider_pubkey],
+        set_={
+            name: stmt.excluded[name]
+            for name in (*TELEMETRY_FIELDS, "updated_at")
+        },
+    )
+    await session.execute(stmt, params)
+
+
+async def delete_stale_telemetry(
+    session: AsyncSession,
+    current_pubkeys: t.Iterable[str],
+) -> None:
+    current_pubkeys = tuple(set(current_pubkeys))
+    if not current_pubkeys:
+        return
+
+    await session.execute(
+        delete(_telemetry_table).where(
+            ~_telemetry_table.c.provider_pubkey.in_(current_pubkeys)
+        )
+    )
@@ -1,8 +1,10 @@
+import logging
+import math
 import typing as t
 from datetime import datetime, timedelta
 
 from aiogram.enums import ChatMemberStatus
-from sqlalchemy import String, Float, select, func, and_, desc, cast
+from sqlalchemy import BigInteger, String, select, func, and_, desc, cast
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from .models import (
@@ -13,7 +15,15 @@ from .models import (
     UserModel,
     WalletModel,
 )
-from ..config import TIMEZONE
+from .series import SeriesStats, SeriesStore
+from ..config import SERIES_VERIFY, TIMEZONE
+
+logger = logging.getLogger(__name__)
+
+
+def _sum(column: t.Any) -> t.Any:
+    # PostgreSQL sums BIGINT as NUMERIC; keep the result an int.
+    return cast(func.sum(column), BigInteger)
 
 
 def _dt_range_for(
@@ -58,55 +68,105 @@ async def _count_git_hashes(session: AsyncSession, key: str) -> dict[str, int]:
     return {h: c for h, c in rows if h is not None}
 
 
-async def build_provider_wallet_metrics(session: AsyncSession, pubkey: str) -> dict:
-    now = datetime.now(TIMEZONE)
+def _series_mismatch(expected: t.Any, actual: t.Any) -> bool:
+    if isinstance(expected, float) or isinstance(actual, float):
+        return not math.isclose(expected, actual, rel_tol=1e-9, abs_tol=1e-9)
+    return expected != actual
 
-    last_row_stmt = (
-        select(WalletHistoryModel.balance, WalletHistoryModel.archived_at)
-        .where(WalletHistoryModel.provider_pubkey == pubkey)
-        .order_by(desc(WalletHistoryModel.archived_at))
-        .limit(1)
-    )
-    last_row = (await session.execute(last_row_stmt)).first()
-    balance = last_row[0] if last_row else 0
 
-    async def _sum_earned(start: datetime | None, end: datetime) -> int:
-        stmt = select(func.coalesce(func.sum(WalletHistoryModel.earned), 0)).where(
-            WalletHistoryModel.provider_pubkey == pubkey
-        )
-        if start is not None:
-            stmt = stmt.where(WalletHistoryModel.archived_at >= start)
-        stmt = stmt.where(WalletHistoryModel.archived_at < end)
-        return (await session.execute(stmt)).scalar_one()
+async def _resolve(
+    name: str,
+    pubkey: str,
+    from_sql: t.Callable[[], t.Awaitable[t.Dict[str, t.Any]]],
+    from_series: t.Callable[[], t.Dict[str, t.Any]],
+    series: t.Optional[SeriesStore],
+) -> t.Dict[str, t.Any]:
+    """Read from the series store when given, otherwise from SQL.
+
+    With SERIES_VERIFY both paths run, mismatches are logged and the SQL
+    result is returned.
+    """
+    if series is None:
+        return await from_sql()
+
+    result = from_series()
+    if not SERIES_VERIFY:
+        return result
+
+    expected = await from_sql()
+    diff = {
+        key: (expected[key], result.get(key))
+        for key in expected
+        if _series_mismatch(expected[key], result.get(key))
+    }
+    if diff:
+        logger.warning("Series mismatch in %s for %s: %s", name, pubkey, diff)
+    return expected
 
-    start_today, end_today = _dt_range_for("today", now)
-    start_week, _ = _dt_range_for("week", now)
-    start_month, _ = _dt_range_for("month", now)
 
-    earned_today = await _sum_earned(start_today, now)
-    earned_week = await _sum_earned(start_week, now)
-    earned_month = await _sum_earned(start_month, now)
-    earned_total = await _sum_earned(None, now)
+async def _updated_at(
+    session: AsyncSession,
+    model: t.Any,
+    pubkey: str,
+) -> t.Optional[datetime]:
+    stmt = select(model.updated_at).where(model.provider_pubkey == pubkey)
+    return (await session.execute(stmt)).scalar_one_or_none()
 
-    stmt_updated = select(WalletModel.updated_at).where(
-        WalletModel.provider_pubkey == pubkey
-    )
-    updated_at = (await session.execute(stmt_updated)).scalar_one_or_none()
 
-    return {
-        "balance": balance,
-        "earned_today": earned_today,
-        "earned_week": earned_week,
-        "earned_month": earned_month,
-        "earned_total": earned_total,
-        "updated_at": updated_at,
+async def build_provider_wallet_metrics(
+    session: AsyncSession,
+    pubkey: str,
+    series: t.Optional[SeriesStore] = None,
+) -> dict:
+    now = datetime.now(TIMEZONE)
+    ranges = {
+        "earned_today": _dt_range_for("today", now)[0],
+        "earned_week": _dt_range_for("week", now)[0],
+        "earned_month": _dt_range_for("month", now)[0],
+        "earned_total": None,
     }
 
+    async def from_sql() -> t.Dict[str, t.Any]:
+        last_row_stmt = (
+            select(WalletHistoryModel.balance, WalletHistoryModel.archived_at)
+            .where(WalletHistoryModel.provider_pubkey == pubkey)
+            .order_by(desc(WalletHistoryModel.archived_at))
+            .limit(1)
+        )
+        last_row = (await session.execute(last_row_stmt)).first()
+        result = {"balance": last_row[0] if last_row else 0}
+
+        for key, start in ranges.items():
+            stmt = select(func.coalesce(_sum(WalletHistoryModel.earned), 0)).where(
+                WalletHistoryModel.provider_pubkey == pubkey
+            )
+            if start is not None:
+                stmt = stmt.where(WalletHistoryModel.archived_at >= start)
+            stmt = stmt.where(WalletHistoryModel.archived_at < now)
+            result[key] = (await session.execute(stmt)).scalar_one()
+        return result
+
+    def from_series() -> t.Dict[str, t.Any]:
+        balance = series.stats("balance", pubkey).last
+        result = {"balance": balance if balance is not None else 0}
+        for key, start in ranges.items():
+            result[key] = series.stats("earned", pubkey, start, now).sum
+        return result
 
-async def build_provider_traffic_metrics(session: AsyncSession, pubkey: str) -> dict:
+    result = await _resolve("wallet", pubkey, from_sql, from_series, series)
+    result["updated_at"] = await _updated_at(session, WalletModel, pubkey)
+    return result
+
+
+async def build_provider_traffic_metrics(
+    session: AsyncSession,
+    pubkey: str,
+    series: t.Optional[SeriesStore] = None,
+) -> dict:
     now = datetime.now(TIMEZONE)
+    periods = ("today", "week", "month", "total")
 
-    async def _delta_for(period: str) -> tuple[int, int, datetime | None]:
+    async def _delta_for(period: str) -> tuple[int, int]:
         start, end = _dt_range_for(period, now)
         base = TelemetryHistoryModel
         conds = [base.provider_pubkey == pubkey]
@@ -119,48 +179,57 @@ async def build_provider_traffic_metrics(session: AsyncSession, pubkey: str) ->
             func.coalesce(func.min(base.bytes_recv), 0).label("min_in"),
             func.coalesce(func.max(base.bytes_sent), 0).label("max_out"),
             func.coalesce(func.min(base.bytes_sent), 0).label("min_out"),
-            func.max(base.archived_at).label("last_ts"),
         ).where(and_(*conds))
 
         row = (await session.execute(stmt)).mappings().one()
         delta_in = int(row["max_in"] - row["min_in"])
         delta_out = int(row["max_out"] - row["min_out"])
-        return max(delta_in, 0), max(delta_out, 0), row["last_ts"]
+        return max(delta_in, 0), max(delta_out, 0)
 
-    ti, to, _ = await _delta_for("today")
-    wi, wo, _ = await _delta_for("week")
-    mi, mo, _ = await _delta_for("month")
-    ai, ao, _ = await _delta_for("total")
+    def _series_delta_for(period: str) -> tuple[int, int]:
+        start, end = _dt_range_for(period, now)
+        recv = series.stats("bytes_recv", pubkey, start, end)
+        sent = series.stats("bytes_sent", pubkey, start, end)
+        return _series_delta(recv), _series_delta(sent)
+
+    def _traffic(deltas: t.Dict[str, tuple[int, int]]) -> t.Dict[str, t.Any]:
+        result = {}
+        for period, (delta_in, delta_out) in deltas.items():
+            prefix = f"traffic_{period}"
+            result[f"{prefix}_in"] = delta_in
+            result[f"{prefix}_out"] = delta_out
+            result[prefix if period == "total" else f"{prefix}_total"] = (
+                delta_in + delta_out
+            )
+        return result
 
-    stmt_updated = select(TelemetryModel.updated_at).where(
-        TelemetryModel.provider_pubkey == pubkey
-    )
-    updated_at = (await session.execute(stmt_updated)).scalar_one_or_none()
+    async def from_sql() -> t.Dict[str, t.Any]:
+        return _traffic({period: await _delta_for(period) for period in periods})
+
+    def from_series() -> t.Dict[str, t.Any]:
+        return _traffic({period: _series_delta_for(period) for period in periods})
+
+    result = await _resolve("traffic", pubkey, from_sql, from_series, series)
+    result["updated_at"] = await _updated_at(session, TelemetryModel, pubkey)
+    return result
 
-    return {
-        "traffic_today_in": ti,
-        "traffic_today_out": to,
-        "traffic_today_total": ti + to,
-        "traffic_week_in": wi,
-        "traffic_week_out": wo,
-        "traffic_week_total": wi + wo,
-        "traffic_month_in": mi,
-        "traffic_month_out": mo,
-        "traffic_month_total": mi + mo,
-        "traffic_total_in": ai,
-        "traffic_total_out": ao,
-        "traffic_total": ai + ao,
-        "updated_at": updated_at,
-    }
 
+def _series_delta(stats: SeriesStats) -> t.Any:
+    """Same as ``coalesce(max, 0) - coalesce(min, 0)`` clamped at zero."""
+    return max((stats.max or 0) - (stats.min or 0), 0)
 
-async def build_provider_storage_metrics(session: AsyncSession, pubkey: str) -> dict:
+
+async def build_provider_storage_metrics(
+    session: AsyncSession,
+    pubkey: str,
+    series: t.Optional[SeriesStore] = None,
+) -> dict:
     now = datetime.now(TIMEZONE)
     th_model = TelemetryHistoryModel
+    periods = ("today", "week", "month", "total")
 
-    provider_obj = th_model.storage.op("->")("provider")
-    used_expr = cast(provider_obj.op("->>")("used_provider_space"), Float)
-    total_expr = cast(provider_obj.op("->>")("total_provider_space"), Float)
+    used_expr = th_model.storage[("provider", "used_provider_space")].as_float()
+    total_expr = th_model.storage[("provider", "total_provider_space")].as_float()
 
     async def _delta_used(period: str) -> float:
         start, end = _dt_range_for(period, now)
@@ -178,30 +247,36 @@ async def build_provider_storage_metrics(session: AsyncSession, pubkey: str) ->
 
         return float((await session.execute(stmt)).scalar_one())
 
-    last_stmt = (
-        select(used_expr.label("used"), total_expr.label("total"), th_model.archived_at)
-        .where(th_model.provider_pubkey == pubkey)
-        .order_by(desc(th_model.archived_at))
-        .limit(1)
-    )
-    last = (await session.execute(last_stmt)).mappings().first()
-    used_eom = float(last["used"]) if last and last["used"] is not None else 0.0
-    total_eom = float(last["total"]) if last and last["total"] is not None else 0.0
-
-    stmt_updated = select(TelemetryModel.updated_at).where(
-        TelemetryModel.provider_pubkey == pubkey
-    )
-    updated_at = (await session.execute(stmt_updated)).scalar_one_or_none()
-
-    return {
-        "used_today": await _delta_used("today"),
-        "used_week": await _delta_used("week"),
-        "used_month": await _delta_used("month"),
-        "used_total": await _delta_used("total"),
-        "used_provider_space": used_eom,
-        "total_provider_space": total_eom,
-        "updated_at": updated_at,
-    }
+    async def from_sql() -> t.Dict[str, t.Any]:
+        last_stmt = (
+            select(used_expr.label("used"), total_expr.label("total"), th_model.archived_at)
+            .where(th_model.provider_pubkey == pubkey)
+            .order_by(desc(th_model.archived_at))
+            .limit(1)
+        )
+        last = (await session.execute(last_stmt)).mappings().first()
+        used_eom = float(last["used"]) if last and last["used"] is not None else 0.0
+        total_eom = float(last["total"]) if last and last["total"] is not None else 0.0
+
+        result = {f"used_{period}": await _delta_used(period) for period in periods}
+        result["used_provider_space"] = used_eom
+        result["total_provider_space"] = total_eom
+        return result
+
+    def from_series() -> t.Dict[str, t.Any]:
+        result = {}
+        for period in periods:
+            stats = series.stats("used_provider_space", pubkey, *_dt_range_for(period, now))
+            result[f"used_{period}"] = float((stats.max or 0.0) - (stats.min or 0.0))
+        used = series.stats("used_provider_space", pubkey).last
+        total = series.stats("total_provider_space", pubkey).last
+        result["used_provider_space"] = float(used) if used is not None else 0.0
+        result["total_provider_space"] = float(total) if total is not None else 0.0
+        return result
+
+    result = await _resolve("storage", pubkey, from_sql, from_series, series)
+    result["updated_at"] = await _updated_at(session, TelemetryModel, pubkey)
+    return result
 
 
 async def build_stats_summary(session: AsyncSession) -> t.Dict[str, t.Any]:
@@ -244,54 +319,69 @@ async def build_stats_summary(session: AsyncSession) -> t.Dict[str, t.Any]:
 async def build_monthly_report(
     session: AsyncSession,
     pubkey: str,
+    series: t.Optional[SeriesStore] = None,
 ) -> t.Dict[str, t.Any]:
     start_dt, end_dt, start_disp, end_disp = _month_bounds_now()
     th, wh = TelemetryHistoryModel, WalletHistoryModel
 
-    earned = await session.scalar(
-        select(func.coalesce(func.sum(wh.earned), 0))
-        .where(wh.provider_pubkey == pubkey)
-        .where(wh.archived_at >= start_dt, wh.archived_at < end_dt)
-    )
+    async def from_sql() -> t.Dict[str, t.Any]:
+        earned = await session.scalar(
+            select(func.coalesce(_sum(wh.earned), 0))
+            .where(wh.provider_pubkey == pubkey)
+            .where(wh.archived_at >= start_dt, wh.archived_at < end_dt)
+        )
 
-    traffic_row = (
-        (
-            await session.execute(
-                select(
-                    func.coalesce(func.max(th.bytes_recv), 0).label("max_in"),
-                    func.coalesce(func.min(th.bytes_recv), 0).label("min_in"),
-                    func.coalesce(func.max(th.bytes_sent), 0).label("max_out"),
-                    func.coalesce(func.min(th.bytes_sent), 0).label("min_out"),
+        traffic_row = (
+            (
+                await session.execute(
+                    select(
+                        func.coalesce(func.max(th.bytes_recv), 0).label("max_in"),
+                        func.coalesce(func.min(th.bytes_recv), 0).label("min_in"),
+                        func.coalesce(func.max(th.bytes_sent), 0).label("max_out"),
+                        func.coalesce(func.min(th.bytes_sent), 0).label("min_out"),
+                    )
+                    .where(th.provider_pubkey == pubkey)
+                    .where(th.archived_at >= start_dt, th.archived_at < end_dt)
                 )
-                .where(th.provider_pubkey == pubkey)
-                .where(th.archived_at >= start_dt, th.archived_at < end_dt)
             )
+            .mappings()
+            .one()
         )
-        .mappings()
-        .one()
-    )
-    traffic_in_bytes = max(int(traffic_row["max_in"] - traffic_row["min_in"]), 0)
-    traffic_out_bytes = max(int(traffic_row["max_out"] - traffic_row["min_out"]), 0)
+        traffic_in_bytes = max(int(traffic_row["max_in"] - traffic_row["min_in"]), 0)
+        traffic_out_bytes = max(int(traffic_row["max_out"] - traffic_row["min_out"]), 0)
 
-    provider_obj = th.storage.op("->")("provider")
-    used_expr = cast(provider_obj.op("->>")("used_provider_space"), Float)
-    used_delta_gb = await session.scalar(
-        select(
-            (
-                func.coalesce(func.max(used_expr), 0.0)
-                - func.coalesce(func.min(used_expr), 0.0)
-            ).label("delta")
+        used_expr = th.storage[("provider", "used_provider_space")].as_float()
+        used_delta_gb = await session.scalar(
+            select(
+                (
+                    func.coalesce(func.max(used_expr), 0.0)
+                    - func.coalesce(func.min(used_expr), 0.0)
+                ).label("delta")
+            )
+            .where(th.provider_pubkey == pubkey)
+            .where(th.archived_at >= start_dt, th.archived_at < end_dt)
         )
-        .where(th.provider_pubkey == pubkey)
-        .where(th.archived_at >= start_dt, th.archived_at < end_dt)
-    )
-    used_space_bytes = int(max(used_delta_gb, 0.0) * 1_000_000_000)
-
-    return {
-        "start_date": start_disp,
-        "end_date": end_disp,
-        "earned_nanoton": int(earned),
-        "used_space_bytes": used_space_bytes,
-        "traffic_in_bytes": traffic_in_bytes,
-        "traffic_out_bytes": traffic_out_bytes,
-    }
+        used_space_bytes = int(max(used_delta_gb, 0.0) * 1_000_000_000)
+
+        return {
+            "earned_nanoton": int(earned),
+            "used_space_bytes": used_space_bytes,
+            "traffic_in_bytes": traffic_in_bytes,
+            "traffic_out_bytes": traffic_out_bytes,
+        }
+
+    def from_series() -> t.Dict[str, t.Any]:
+        used = series.stats("used_provider_space", pubkey, start_dt, end_dt)
+        return {
+            "earned_nanoton": int(series.stats("earned", pubkey, start_dt, end_dt).sum),
+            "used_space_bytes": int(_series_delta(used) * 1_000_000_000),
+            "traffic_in_bytes": int(
+                _series_delta(series.stats("bytes_recv", pubkey, start_dt, end_dt))
+            ),
+            "traffic_out_bytes": int(
+                _series_delta(series.stats("bytes_sent", pubkey, start_dt, end_dt))
+            ),
+        }
+
+    result = await _resolve("monthly_report", pubkey, from_sql, from_series, series)
+    return {"start_date": start_disp, "end_date": end_disp, **result}
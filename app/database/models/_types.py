@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+import math
+import typing as t
+
+import msgpack
+from sqlalchemy import JSON
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator
+
+from ...config import TELEMETRY_HISTORY_PACKED
+
+# Leading byte of a packed value; bumped if the layout ever changes.
+PACKED_VERSION = b"\x01"
+
+# msgpack extension codes.
+_EXT_SCALED = 1  # list of floats stored as ints scaled by 10**d
+_EXT_MATRIX = 2  # dict of equal-length float lists: names once + one scaled block
+
+_MAX_DECIMALS = 4
+_MAX_SAFE_INT = 2**53
+
+
+def _scale(values: t.Sequence[t.Any]) -> t.Optional[t.Tuple[int, t.List[t.Any]]]:
+    """Find the smallest 10**d that turns every float into an exact int.
+
+    None entries are kept as None. Returns None when the values are not all
+    floats or cannot be scaled without losing precision.
+    """
+    nums = [v for v in values if v is not None]
+    if not nums or not all(type(v) is float and math.isfinite(v) for v in nums):
+        return None
+
+    for decimals in range(_MAX_DECIMALS + 1):
+        factor = 10**decimals
+        scaled = [None if v is None else round(v * factor) for v in values]
+        if all(
+            s is None or (abs(s) < _MAX_SAFE_INT and s / factor == v)
+            for s, v in zip(scaled, values)
+        ):
+            return decimals, scaled
+    return None
+
+
+def _encode(value: t.Any) -> t.Any:
+    if isinstance(value, list):
+        scaled = _scale(value)
+        if scaled is not None:
+            return msgpack.ExtType(_EXT_SCALED, msgpack.packb(scaled))
+        return [_encode(v) for v in value]
+
+    if isinstance(value, dict):
+        rows = list(value.values())
+        if rows and all(isinstance(r, list) for r in rows):
+            width = len(rows[0])
+            if all(len(r) == width for r in rows):
+                scaled = _scale([v for r in rows for v in r])
+                if scaled is not None:
+                    decimals, flat = scaled
+                    payload = [list(value), width, decimals, flat]
+                    return msgpack.ExtType(_EXT_MATRIX, msgpack.packb(payload))
+        return {k: _encode(v) for k, v in value.items()}
+
+    return value
+
+
+def _unscale(decimals: int, values: t.List[t.Any]) -> t.List[t.Optional[float]]:
+    factor = 10**decimals
+    return [None if v is None else v / factor for v in values]
+
+
+def _ext_hook(code: int, data: bytes) -> t.Any:
+    if code == _EXT_SCALED:
+        decimals, values = msgpack.unpackb(data)
+        return _unscale(decimals, values)
+    if code == _EXT_MATRIX:
+        names, width, decimals, flat = msgpack.unpackb(data)
+        values = _unscale(decimals, flat)
+        return {
+            name: values[i * width : (i + 1) * width] for i, name in enumerate(names)
+        }
+    return msgpack.ExtType(code, data)
+
+
+def pack_json(value: t.Any) -> t.Optional[bytes]:
+    if value is None:
+        return None
+    return PACKED_VERSION + msgpack.packb(_encode(value))
+
+
+def unpack_json(value: t.Union[bytes, str, None]) -> t.Any:
+    """Decode a stored value written either as JSON text or packed bytes."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return json.loads(value)
+    if value[:1] != PACKED_VERSION:
+        raise ValueError(f"Unknown packed JSON version: {value[:1]!r}")
+    return msgpack.unpackb(value[1:], ext_hook=_ext_hook)
+
+
+class PackedJSON(TypeDecorator):
+    """JSON column that can store values as compact msgpack blobs on SQLite.
+
+    Reads accept both formats, so rows written before packing was enabled
+    keep working. Packed values are opaque to SQL JSON functions; use it
+    only for columns that are never queried with JSON paths. Other dialects
+    always store plain JSON.
+    """
+
+    impl = JSON
+    cache_ok = True
+
+    def __init__(self, packed: t.Optional[bool] = None) -> None:
+        super().__init__()
+        self.packed = TELEMETRY_HISTORY_PACKED if packed is None else packed
+
+    def bind_processor(self, dialect: Dialect) -> t.Optional[t.Callable]:
+        if dialect.name == "sqlite" and self.packed:
+            return pack_json
+        return super().bind_processor(dialect)
+
+    def result_processor(self, dialect: Dialect, coltype: t.Any) -> t.Optional[t.Callable]:
+        if dialect.name != "sqlite":
+            return super().result_processor(dialect, coltype)
+        return unpack_json
@@ -38,7 +38,7 @@ class BaseProviderModel(BaseModel):
 
     @property
     def ui(self) -> ProviderUI:
-        return ProviderUI(self)
+        return ProviderUI.from_provider(self)
 
 
 class ProviderModel(BaseProviderModel):
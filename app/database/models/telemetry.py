@@ -8,6 +8,7 @@ from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql.schema import Index
 
 from ._base import BaseModel
+from ._types import PackedJSON
 from ..helpers import now, now_rounded_min
 
 
@@ -64,6 +65,23 @@ class TelemetryHistoryModel(BaseTelemetryModel):
         nullable=False,
     )
 
+    # Per-sample metrics that are only ever read back in Python; `storage`
+    # and `git_hashes` stay plain JSON because SQL reads them with JSON paths.
+    cpu_info: Mapped[t.Optional[dict]] = mapped_column(PackedJSON)
+    disks_load: Mapped[t.Optional[dict[str, list[float]]]] = mapped_column(PackedJSON)
+    disks_load_percent: Mapped[t.Optional[dict[str, list[float]]]] = mapped_column(
+        PackedJSON
+    )
+    iops: Mapped[t.Optional[dict[str, list[float]]]] = mapped_column(PackedJSON)
+    net_load: Mapped[t.Optional[list[float]]] = mapped_column(PackedJSON)
+    net_recv: Mapped[t.Optional[list[float]]] = mapped_column(PackedJSON)
+    net_sent: Mapped[t.Optional[list[float]]] = mapped_column(PackedJSON)
+    pings: Mapped[t.Optional[dict[str, float]]] = mapped_column(PackedJSON)
+    pps: Mapped[t.Optional[list[float]]] = mapped_column(PackedJSON)
+    ram: Mapped[t.Optional[dict]] = mapped_column(PackedJSON)
+    swap: Mapped[t.Optional[dict]] = mapped_column(PackedJSON)
+    uname: Mapped[t.Optional[dict]] = mapped_column(PackedJSON)
+
     archived_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
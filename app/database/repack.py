@@ -0,0 +1,99 @@
+"""Rewrite telemetry_history rows between JSON text and packed storage.
+
+Usage: python -m app.database.repack [--unpack] [--batch-size 1000] [--vacuum]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import typing as t
+
+from sqlalchemy import LargeBinary, String, bindparam, select, text, update
+
+from .database import Database
+from .models import TelemetryHistoryModel
+from .models._types import PackedJSON, pack_json
+
+logger = logging.getLogger(__name__)
+
+_table = TelemetryHistoryModel.__table__
+PACKED_COLUMNS: t.Tuple[str, ...] = tuple(
+    column.name for column in _table.columns if isinstance(column.type, PackedJSON)
+)
+
+
+def _dump_json(value: t.Any) -> t.Optional[str]:
+    return None if value is None else json.dumps(value)
+
+
+async def repack(db: Database, *, packed: bool = True, batch_size: int = 1000) -> int:
+    """Re-encode every history row in id order, one transaction per batch."""
+    if db.backend.name != "sqlite":
+        # PackedJSON always stores plain JSON on other dialects.
+        logger.warning("Repacking only applies to SQLite, not %s; nothing to do", db.backend.name)
+        return 0
+
+    encode, coltype = (pack_json, LargeBinary) if packed else (_dump_json, String)
+    select_cols = [_table.c.id, *(_table.c[name] for name in PACKED_COLUMNS)]
+    stmt = (
+        update(_table)
+        .where(_table.c.id == bindparam("_id"))
+        .values({name: bindparam(name, type_=coltype) for name in PACKED_COLUMNS})
+    )
+
+    last_id, total = 0, 0
+    while True:
+        async with db.session_factory() as session:
+            async with session.begin():
+                rows = (
+                    await session.execute(
+                        select(*select_cols)
+                        .where(_table.c.id > last_id)
+                        .order_by(_table.c.id)
+                        .limit(batch_size)
+                    )
+                ).all()
+                if not rows:
+                    return total
+
+                params = [
+                    {
+                        "_id": row.id,
+                        **{name: encode(getattr(row, name)) for name in PACKED_COLUMNS},
+                    }
+                    for row in rows
+                ]
+                await session.execute(stmt, params)
+
+        last_id = rows[-1].id
+        total += len(rows)
+        logger.info("Repacked %s telemetry_history rows", total)
+
+
+async def main(packed: bool, batch_size: int, vacuum: bool) -> None:
+    db = Database()
+    try:
+        total = await repack(db, packed=packed, batch_size=batch_size)
+        logger.info("Repack complete: %s rows", total)
+        if vacuum:
+            async with db.engine.connect() as conn:
+                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                await conn.execute(text("VACUUM"))
+            logger.info("Database vacuumed")
+    finally:
+        await db.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--unpack", action="store_true", help="write JSON text back")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--vacuum", action="store_true", help="reclaim freed pages")
+    args = parser.parse_args()
+
+    asyncio.run(main(not args.unpack, args.batch_size, args.vacuum))
@@ -4,6 +4,7 @@ from typing import TypeVar
 from sqlalchemy import delete, exists, func, select, Delete, Select, Update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .backends import dialect_insert
 from .models import BaseModel
 
 _TModel = TypeVar("_TModel", bound=BaseModel)
@@ -38,6 +39,23 @@ class BaseRepository(t.Generic[_TModel]):
             merged = [await self.session.merge(m) for m in models]
         return merged
 
+    async def upsert_rows(self, rows: t.List[t.Dict[str, t.Any]]) -> None:
+        """Insert or update plain rows by primary key in one executemany.
+
+        Unlike ``bulk_upsert`` nothing is loaded first; every row must carry
+        the same columns, including any ``onupdate`` ones.
+        """
+        if not rows:
+            return
+        table = self.model.__table__
+        keys = [column.name for column in table.primary_key]
+        stmt = dialect_insert(table, self.session.get_bind().dialect)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={name: stmt.excluded[name] for name in rows[0] if name not in keys},
+        )
+        await self.session.execute(stmt, rows)
+
     async def create(self, model: _TModel) -> _TModel:
         self.session.add(model)
         await self.session.flush()
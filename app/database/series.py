@@ -0,0 +1,314 @@
+"""Append-only columnar store for the numeric history series.
+
+Each (metric, provider) pair is one file of fixed-size (timestamp, value)
+records sorted by timestamp, so range reads are a memory map plus two
+binary searches. SQLite stays the source of truth; the store mirrors
+what the sync and downsample jobs write there and can be rebuilt from it
+with ``python -m app.database.series rebuild``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import typing as t
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from ..config import TIMEZONE
+
+logger = logging.getLogger(__name__)
+
+# Integer series keep exact values; NULL is stored as the int64 minimum.
+INT_NULL = np.iinfo(np.int64).min
+
+METRIC_DTYPES: t.Dict[str, np.dtype] = {
+    "bytes_recv": np.dtype("<i8"),
+    "bytes_sent": np.dtype("<i8"),
+    "used_provider_space": np.dtype("<f8"),
+    "total_provider_space": np.dtype("<f8"),
+    "earned": np.dtype("<i8"),
+    "balance": np.dtype("<i8"),
+}
+
+TELEMETRY_METRICS: t.Tuple[str, ...] = (
+    "bytes_recv",
+    "bytes_sent",
+    "used_provider_space",
+    "total_provider_space",
+)
+WALLET_METRICS: t.Tuple[str, ...] = ("earned", "balance")
+
+
+class SeriesPoint(t.NamedTuple):
+    metric: str
+    pubkey: str
+    ts: int
+    value: t.Optional[float]
+
+
+@dataclass(frozen=True)
+class SeriesStats:
+    count: int
+    min: t.Optional[float]
+    max: t.Optional[float]
+    sum: float
+    last_ts: t.Optional[int]
+    last: t.Optional[float]
+
+
+def to_ts(dt: datetime) -> int:
+    """Epoch seconds; naive values read back from SQLite are local time."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=TIMEZONE)
+    return int(dt.timestamp())
+
+
+def _record_dtype(metric: str) -> np.dtype:
+    return np.dtype([("ts", "<i8"), ("value", METRIC_DTYPES[metric])])
+
+
+def _null(metric: str) -> t.Any:
+    return INT_NULL if METRIC_DTYPES[metric].kind == "i" else np.nan
+
+
+def _valid(metric: str, values: np.ndarray) -> np.ndarray:
+    if METRIC_DTYPES[metric].kind == "i":
+        return values[values != INT_NULL]
+    return values[~np.isnan(values)]
+
+
+class SeriesStore:
+
+    def __init__(self, root: t.Union[str, Path]) -> None:
+        self.root = Path(root)
+        # Jobs write from worker threads; compact and prune rewrite whole
+        # files, so an append racing a rewrite would be lost.
+        self._lock = threading.Lock()
+
+    def path(self, metric: str, pubkey: str) -> Path:
+        return self.root / metric / f"{pubkey}.bin"
+
+    def read(self, metric: str, pubkey: str) -> np.ndarray:
+        path = self.path(metric, pubkey)
+        dtype = _record_dtype(metric)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return np.empty(0, dtype=dtype)
+        count = size // dtype.itemsize
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+    def stats(
+        self,
+        metric: str,
+        pubkey: str,
+        start: t.Optional[datetime] = None,
+        end: t.Optional[datetime] = None,
+    ) -> SeriesStats:
+        """Aggregate records with ``start <= ts < end``; NULL values are skipped."""
+        records = self.read(metric, pubkey)
+        ts = records["ts"]
+        lo = 0 if start is None else int(np.searchsorted(ts, to_ts(start), "left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, to_ts(end), "left"))
+
+        window = records[lo:hi]
+        values = _valid(metric, window["value"])
+        if len(values) == 0:
+            return SeriesStats(len(window), None, None, 0, None, None)
+
+        last = window["value"][-1]
+        is_null = last == INT_NULL if METRIC_DTYPES[metric].kind == "i" else np.isnan(last)
+        return SeriesStats(
+            count=len(window),
+            min=values.min().item(),
+            max=values.max().item(),
+            sum=values.sum().item(),
+            last_ts=int(window["ts"][-1]),
+            last=None if is_null else last.item(),
+        )
+
+    def append(self, points: t.Iterable[SeriesPoint]) -> None:
+        """Write points; a point with an existing timestamp replaces its value."""
+        grouped: t.Dict[t.Tuple[str, str], t.Dict[int, t.Any]] = defaultdict(dict)
+        for point in points:
+            value = _null(point.metric) if point.value is None else point.value
+            grouped[(point.metric, point.pubkey)][point.ts] = value
+
+        with self._lock:
+            for (metric, pubkey), values in grouped.items():
+                self._append_one(metric, pubkey, values)
+
+    def _append_one(self, metric: str, pubkey: str, values: t.Dict[int, t.Any]) -> None:
+        dtype = _record_dtype(metric)
+        new = np.array(sorted(values.items()), dtype=dtype)
+        path = self.path(metric, pubkey)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        existing = self.read(metric, pubkey)
+        if len(existing) == 0 or new["ts"][0] > existing["ts"][-1]:
+            with path.open("ab") as f:
+                f.write(new.tobytes())
+            return
+
+        if new["ts"][0] == existing["ts"][-1]:
+            with path.open("r+b") as f:
+                f.seek((len(existing) - 1) * dtype.itemsize)
+                f.write(new.tobytes())
+            return
+
+        # Out-of-order write: merge and rewrite the whole file.
+        merged = dict(zip(existing["ts"].tolist(), existing["value"].tolist()))
+        merged.update(values)
+        self._rewrite(path, np.array(sorted(merged.items()), dtype=dtype))
+
+    @staticmethod
+    def _rewrite(path: Path, records: np.ndarray) -> None:
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as f:
+            f.write(records.tobytes())
+        os.replace(f.name, path)
+
+    def compact(
+        self,
+        metrics: t.Iterable[str],
+        start: datetime,
+        end: datetime,
+    ) -> None:
+        """Keep only the last record in ``[start, end)`` of every series.
+
+        Mirrors the hourly downsampling of the history tables.
+        """
+        lo_ts, hi_ts = to_ts(start), to_ts(end)
+        with self._lock:
+            for metric in metrics:
+                directory = self.root / metric
+                if not directory.is_dir():
+                    continue
+                for path in directory.glob("*.bin"):
+                    records = np.array(self.read(metric, path.stem))
+                    ts = records["ts"]
+                    lo = int(np.searchsorted(ts, lo_ts, "left"))
+                    hi = int(np.searchsorted(ts, hi_ts, "left"))
+                    if hi - lo > 1:
+                        self._rewrite(path, np.concatenate([records[:lo], records[hi - 1 :]]))
+
+    def prune(self, cutoff: datetime) -> None:
+        """Drop records older than ``cutoff``.
+
+        Mirrors the retention of the history tables.
+        """
+        cutoff_ts = to_ts(cutoff)
+        with self._lock:
+            for metric in METRIC_DTYPES:
+                directory = self.root / metric
+                if not directory.is_dir():
+                    continue
+                for path in directory.glob("*.bin"):
+                    records = np.array(self.read(metric, path.stem))
+                    lo = int(np.searchsorted(records["ts"], cutoff_ts, "left"))
+                    if lo > 0:
+                        self._rewrite(path, records[lo:])
+
+    def clear(self) -> None:
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+    async def write(self, points: t.Iterable[SeriesPoint]) -> None:
+        await asyncio.to_thread(self.append, list(points))
+
+
+def telemetry_points(
+    params: t.Iterable[t.Dict[str, t.Any]],
+    archived_at: datetime,
+) -> t.Iterator[SeriesPoint]:
+    ts = to_ts(archived_at)
+    for p in params:
+        pubkey = p["provider_pubkey"]
+        provider = (p.get("storage") or {}).get("provider") or {}
+        yield SeriesPoint("bytes_recv", pubkey, ts, p.get("bytes_recv"))
+        yield SeriesPoint("bytes_sent", pubkey, ts, p.get("bytes_sent"))
+        for metric in ("used_provider_space", "total_provider_space"):
+            yield SeriesPoint(metric, pubkey, ts, provider.get(metric))
+
+
+def wallet_points(
+    pubkey: str,
+    archived_at: datetime,
+    earned: int,
+    balance: int,
+) -> t.Iterator[SeriesPoint]:
+    ts = to_ts(archived_at)
+    yield SeriesPoint("earned", pubkey, ts, earned)
+    yield SeriesPoint("balance", pubkey, ts, balance)
+
+
+async def rebuild(store: SeriesStore, session_factory: t.Any, batch_size: int = 5000) -> int:
+    """Replace the store contents with the current history tables."""
+    from sqlalchemy import select
+
+    from .models import TelemetryHistoryModel as TH, WalletHistoryModel as WH
+
+    used = TH.storage[("provider", "used_provider_space")].as_float()
+    total = TH.storage[("provider", "total_provider_space")].as_float()
+    queries = (
+        (
+            select(TH.provider_pubkey, TH.archived_at, TH.bytes_recv, TH.bytes_sent, used, total)
+            .order_by(TH.provider_pubkey, TH.archived_at, TH.id),
+            TELEMETRY_METRICS,
+        ),
+        (
+            select(WH.provider_pubkey, WH.archived_at, WH.earned, WH.balance)
+            .order_by(WH.provider_pubkey, WH.archived_at),
+            WALLET_METRICS,
+        ),
+    )
+
+    store.clear()
+    total_rows = 0
+    async with session_factory() as session:
+        for stmt, metrics in queries:
+            result = await session.stream(stmt.execution_options(yield_per=batch_size))
+            async for rows in result.partitions():
+                points = [
+                    SeriesPoint(metric, pubkey, to_ts(archived_at), value)
+                    for pubkey, archived_at, *values in rows
+                    for metric, value in zip(metrics, values)
+                ]
+                await store.write(points)
+                total_rows += len(rows)
+    return total_rows
+
+
+async def _main(command: str) -> None:
+    from ..config import SERIES_DIR
+    from .database import Database
+
+    if not SERIES_DIR:
+        raise SystemExit("SERIES_DIR is not configured")
+
+    db = Database()
+    try:
+        if command == "rebuild":
+            rows = await rebuild(SeriesStore(SERIES_DIR), db.session_factory)
+            logger.info("Series store rebuilt from %s history rows", rows)
+    finally:
+        await db.shutdown()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    parser = argparse.ArgumentParser(description="Maintain the series store.")
+    parser.add_argument("command", choices=["rebuild"])
+    asyncio.run(_main(parser.parse_args().command))
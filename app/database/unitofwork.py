@@ -3,9 +3,12 @@ from __future__ import annotations
 import logging
 import typing as t
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import ORMExecuteState, Session
 
 from .models import (
+    BaseModel,
     ContractModel,
     ProviderModel,
     ProviderHistoryModel,
@@ -19,11 +22,36 @@ from .models import (
     WalletHistoryModel,
 )
 from .repository import BaseRepository as BRepo
+from ..monitoring import SqlStats
 
 logger = logging.getLogger(__name__)
 
 
+_REPOSITORIES: t.Dict[str, t.Type[BaseModel]] = {
+    "contract": ContractModel,
+    "provider": ProviderModel,
+    "provider_history": ProviderHistoryModel,
+    "telemetry": TelemetryModel,
+    "telemetry_history": TelemetryHistoryModel,
+    "user": UserModel,
+    "user_alert_setting": UserAlertSettingModel,
+    "user_subscription": UserSubscriptionModel,
+    "user_triggered_alert": UserTriggeredAlertModel,
+    "wallet": WalletModel,
+    "wallet_history": WalletHistoryModel,
+}
+
+
 class UnitOfWork:
+    """Session plus repositories, committed on a clean exit.
+
+    With ``lazy=True`` no session is opened until ``session`` or a
+    repository is first accessed, so a unit of work that is never touched
+    costs nothing. ``written`` tells whether anything was flushed or any
+    DML statement executed; ``sql`` counts the statements run inside the
+    block and the time they took.
+    """
+
     session: AsyncSession
 
     contract: BRepo[ContractModel]
@@ -38,23 +66,49 @@ class UnitOfWork:
     wallet: BRepo[WalletModel]
     wallet_history: BRepo[WalletHistoryModel]
 
-    def __init__(self, session_factory: async_sessionmaker) -> None:
+    def __init__(self, session_factory: async_sessionmaker, lazy: bool = False) -> None:
         self.session_factory = session_factory
+        self.lazy = lazy
+        self.written = False
+        self.sql = SqlStats()
 
-    async def __aenter__(self) -> UnitOfWork:
+    def __getattr__(self, name: str) -> t.Any:
+        # Only reached while the session and repositories are not set yet.
+        if self.__dict__.get("lazy") and (name == "session" or name in _REPOSITORIES):
+            self._open()
+            return getattr(self, name)
+        raise AttributeError(f"{type(self).__name__!r} has no attribute {name!r}")
+
+    @property
+    def is_open(self) -> bool:
+        return "session" in self.__dict__
+
+    def _open(self) -> None:
         self.session = self.session_factory()
+        sync_session = self.session.sync_session
+        event.listen(sync_session, "after_flush", self._on_flush)
+        event.listen(sync_session, "do_orm_execute", self._on_execute)
+
+        for name, model in _REPOSITORIES.items():
+            setattr(self, name, BRepo(model, self.session))
+
+    def _on_flush(self, session: Session, _: t.Any) -> None:
+        # Attribute sets mark objects dirty even without a net change.
+        if (
+            session.new
+            or session.deleted
+            or any(session.is_modified(obj) for obj in session.dirty)
+        ):
+            self.written = True
 
-        self.contract = BRepo(ContractModel, self.session)
-        self.provider = BRepo(ProviderModel, self.session)
-        self.provider_history = BRepo(ProviderHistoryModel, self.session)
-        self.telemetry = BRepo(TelemetryModel, self.session)
-        self.telemetry_history = BRepo(TelemetryHistoryModel, self.session)
-        self.user = BRepo(UserModel, self.session)
-        self.user_alert_setting = BRepo(UserAlertSettingModel, self.session)
-        self.user_subscription = BRepo(UserSubscriptionModel, self.session)
-        self.user_triggered_alert = BRepo(UserTriggeredAlertModel, self.session)
-        self.wallet = BRepo(WalletModel, self.session)
-        self.wallet_history = BRepo(WalletHistoryModel, self.session)
+    def _on_execute(self, state: ORMExecuteState) -> None:
+        if state.is_insert or state.is_update or state.is_delete:
+            self.written = True
+
+    async def __aenter__(self) -> UnitOfWork:
+        self.sql.activate()
+        if not self.lazy:
+            self._open()
         return self
 
     async def __aexit__(
@@ -63,11 +117,16 @@ class UnitOfWork:
         exc: t.Optional[BaseException],
         tb: t.Optional[t.Any],
     ) -> None:
-        if exc_type:
-            await self.rollback()
-        else:
-            await self.commit()
-        await self.session.close()
+        try:
+            if self.is_open:
+                if exc_type:
+                    await self.rollback()
+                else:
+                    await self.commit()
+                await self.session.close()
+        finally:
+            self.sql.deactivate()
+            self.sql.observe_unit_of_work()
 
         if exc:
             logger.error(f"Unit of work error: {exc}")
@@ -0,0 +1,7 @@
+from .bus import EventBus
+from .types import EventTypes
+
+__all__ = [
+    "EventBus",
+    "EventTypes",
+]
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import typing as t
+from collections import defaultdict
+
+from .types import EventTypes
+
+logger = logging.getLogger(__name__)
+
+EventHandler = t.Callable[[t.Any], t.Awaitable[None]]
+
+
+class EventBus:
+    """In-process publish/subscribe bus.
+
+    Handlers run as background tasks, so publishers never wait for
+    subscribers and a failing handler never breaks the publisher.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: t.Dict[EventTypes, t.List[EventHandler]] = defaultdict(list)
+        self._tasks: t.Set[asyncio.Task] = set()
+
+    def subscribe(self, event_type: EventTypes, handler: EventHandler) -> None:
+        self._handlers[event_type].append(handler)
+
+    def unsubscribe(self, event_type: EventTypes, handler: EventHandler) -> None:
+        handlers = self._handlers.get(event_type, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def publish(self, event_type: EventTypes, payload: t.Any = None) -> None:
+        for handler in self._handlers.get(event_type, []):
+            task = asyncio.create_task(self._run(event_type, handler, payload))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    async def _run(
+        event_type: EventTypes,
+        handler: EventHandler,
+        payload: t.Any,
+    ) -> None:
+        try:
+            await handler(payload)
+        except asyncio.CancelledError:
+            raise
+        except (Exception,):
+            logger.exception(f"Event handler failed: 'event={event_type.value}'")
+
+    async def shutdown(self) -> None:
+        self._handlers.clear()
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
@@ -0,0 +1,5 @@
+from enum import Enum
+
+
+class EventTypes(str, Enum):
+    PROVIDERS_CHANGED = "providers_changed"
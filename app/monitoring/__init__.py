@@ -0,0 +1,22 @@
+from . import metrics
+from .jobs import JobMetrics
+from .profiler import SqlProfiler, UpdateProfile, current_profile
+from .registry import REGISTRY, Counter, Gauge, Histogram, Registry
+from .server import MetricsServer
+from .sql import SqlStats, instrument_engine
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "JobMetrics",
+    "MetricsServer",
+    "REGISTRY",
+    "Registry",
+    "SqlProfiler",
+    "SqlStats",
+    "UpdateProfile",
+    "current_profile",
+    "instrument_engine",
+    "metrics",
+]
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import time
+import typing as t
+
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+    JobEvent,
+    JobExecutionEvent,
+)
+from apscheduler.schedulers.base import BaseScheduler
+
+from .metrics import JOB_DURATION, JOB_RUNS, JOB_SKIPPED
+
+
+class JobMetrics:
+    """Scheduler listener recording run time, results and skipped runs.
+
+    Jobs that hit their own ``wait_for`` timeout return normally, so they
+    count as successes here; they also bump JOB_TIMEOUTS themselves.
+    """
+
+    def __init__(self) -> None:
+        self._started: t.Dict[str, float] = {}
+
+    def register(self, scheduler: BaseScheduler) -> None:
+        scheduler.add_listener(
+            self,
+            mask=(
+                EVENT_JOB_SUBMITTED
+                | EVENT_JOB_EXECUTED
+                | EVENT_JOB_ERROR
+                | EVENT_JOB_MAX_INSTANCES
+                | EVENT_JOB_MISSED
+            ),
+        )
+
+    def __call__(self, event: JobEvent) -> None:
+        job = event.job_id
+        if event.code == EVENT_JOB_SUBMITTED:
+            self._started[job] = time.monotonic()
+        elif event.code == EVENT_JOB_MAX_INSTANCES:
+            JOB_SKIPPED.labels(job, "overlap").inc()
+        elif event.code == EVENT_JOB_MISSED:
+            JOB_SKIPPED.labels(job, "missed").inc()
+        elif isinstance(event, JobExecutionEvent):
+            started = self._started.pop(job, None)
+            if started is not None:
+                JOB_DURATION.labels(job).observe(time.monotonic() - started)
+            result = "error" if event.code == EVENT_JOB_ERROR else "success"
+            JOB_RUNS.labels(job, result).inc()
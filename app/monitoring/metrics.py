@@ -0,0 +1,109 @@
+"""Metric families exported by the app.
+
+Durations are in seconds. Every process exports its own values, so a
+bot and a worker running as separate roles are scraped separately.
+"""
+
+from .registry import Counter, Gauge, Histogram
+
+JOB_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+API_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 1000, 5000)
+
+JOB_DURATION = Histogram(
+    "scheduler_job_duration_seconds",
+    "Run time of scheduled jobs.",
+    ["job"],
+    buckets=JOB_BUCKETS,
+)
+JOB_RUNS = Counter(
+    "scheduler_job_runs",
+    "Finished job runs by result (success or error).",
+    ["job", "result"],
+)
+JOB_TIMEOUTS = Counter(
+    "scheduler_job_timeouts",
+    "Job runs cancelled by their own timeout.",
+    ["job"],
+)
+JOB_SKIPPED = Counter(
+    "scheduler_job_skipped",
+    "Job runs not started: overlap (previous run still going) or missed.",
+    ["job", "reason"],
+)
+
+API_REQUEST_DURATION = Histogram(
+    "api_request_duration_seconds",
+    "Latency of external API calls, including retries.",
+    ["client", "endpoint"],
+    buckets=API_BUCKETS,
+)
+API_REQUESTS = Counter(
+    "api_requests",
+    "External API calls by outcome (ok or error).",
+    ["client", "endpoint", "outcome"],
+)
+API_RETRIES = Counter(
+    "api_retries",
+    "External API attempts repeated after a 429 response.",
+    ["client", "endpoint"],
+)
+
+DB_STATEMENTS = Counter(
+    "db_statements",
+    "SQL statements executed.",
+)
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "Execution time of single SQL statements.",
+)
+UOW_STATEMENTS = Histogram(
+    "db_unit_of_work_statements",
+    "SQL statements executed per unit of work.",
+    buckets=STATEMENT_BUCKETS,
+)
+UOW_SQL_DURATION = Histogram(
+    "db_unit_of_work_sql_seconds",
+    "Time spent executing SQL per unit of work.",
+)
+
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop woke up from a fixed sleep.",
+    buckets=LAG_BUCKETS,
+)
+
+BROADCASTER_QUEUE = Gauge(
+    "broadcaster_queue_depth",
+    "Messages waiting for their turn to be sent.",
+)
+BROADCASTER_SENT = Counter(
+    "broadcaster_messages",
+    "Messages handed to Telegram by outcome (sent or failed).",
+    ["outcome"],
+)
+
+HANDLER_DURATION = Histogram(
+    "bot_handler_duration_seconds",
+    "Time spent handling updates, per handler.",
+    ["event", "handler"],
+)
+HANDLER_ERRORS = Counter(
+    "bot_handler_errors",
+    "Handler calls that raised.",
+    ["event", "handler"],
+)
+
+DB_SIZE = Gauge(
+    "db_size_bytes",
+    "Size of the database after the last maintenance run.",
+)
+DB_WAL_SIZE = Gauge(
+    "db_wal_size_bytes",
+    "Size the write-ahead log had grown to before the last checkpoint.",
+)
+DB_FREE_PAGE_RATIO = Gauge(
+    "db_free_page_ratio",
+    "Share of unused database pages before the last vacuum.",
+)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+import typing as t
+from collections import deque
+from contextvars import ContextVar, Token
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanded IN lists differ only in the number of placeholders.
+_PLACEHOLDERS = re.compile(r"\?(?:, \?)+")
+
+
+def normalize_statement(statement: str, limit: int = 160) -> str:
+    text = _PLACEHOLDERS.sub("?, ...", _WHITESPACE.sub(" ", statement).strip())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+class UpdateProfile:
+    """SQL executed while handling one update, grouped by statement text.
+
+    ``rows`` counts rows reported by the driver, which for SQLite means
+    rows written; SELECTs report no count.
+    """
+
+    __slots__ = ("update_id", "label", "statements", "rows", "seconds", "by_statement")
+
+    def __init__(self, update_id: int) -> None:
+        self.update_id = update_id
+        self.label: t.Optional[str] = None
+        self.statements = 0
+        self.rows = 0
+        self.seconds = 0.0
+        # statement -> [count, rows, seconds]
+        self.by_statement: t.Dict[str, t.List[t.Any]] = {}
+
+    def record(self, statement: str, rowcount: int, elapsed: float) -> None:
+        rows = max(rowcount, 0)
+        self.statements += 1
+        self.rows += rows
+        self.seconds += elapsed
+        entry = self.by_statement.get(statement)
+        if entry is None:
+            self.by_statement[statement] = [1, rows, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += rows
+            entry[2] += elapsed
+
+    def top(self, limit: int) -> t.List[t.Tuple[str, int, int, float]]:
+        """Statements taking the most time; repeated ones hint at N+1 queries."""
+        ranked = sorted(self.by_statement.items(), key=lambda item: item[1][2], reverse=True)
+        return [(text, *entry) for text, entry in ranked[:limit]]
+
+
+_active: ContextVar[t.Optional[UpdateProfile]] = ContextVar("sql_profile", default=None)
+
+
+def current_profile() -> t.Optional[UpdateProfile]:
+    return _active.get()
+
+
+def record_statement(statement: str, rowcount: int, elapsed: float) -> None:
+    profile = _active.get()
+    if profile is not None:
+        profile.record(statement, rowcount, elapsed)
+
+
+class SqlProfiler:
+    """Attribute SQL to updates and keep a rolling summary per label.
+
+    Every update handled between ``begin()`` and ``finish()`` collects the
+    statements executed in its task. Finished profiles are kept per label
+    (usually the dialog state) for the last ``window`` updates; updates
+    slower than ``slow_threshold`` are logged with their top statements.
+    """
+
+    def __init__(self, slow_threshold: float, window: int = 100, top: int = 5) -> None:
+        self.slow_threshold = slow_threshold
+        self.window = window
+        self.top = top
+        # label -> deque of (duration, statements, rows, sql seconds)
+        self._history: t.Dict[str, t.Deque[t.Tuple[float, int, int, float]]] = {}
+
+    def begin(self, update_id: int) -> t.Tuple[UpdateProfile, Token, float]:
+        profile = UpdateProfile(update_id)
+        return profile, _active.set(profile), time.perf_counter()
+
+    def finish(self, handle: t.Tuple[UpdateProfile, Token, float], fallback: str) -> None:
+        profile, token, started = handle
+        _active.reset(token)
+        duration = time.perf_counter() - started
+        label = profile.label or fallback
+
+        history = self._history.get(label)
+        if history is None:
+            history = self._history[label] = deque(maxlen=self.window)
+        history.append((duration, profile.statements, profile.rows, profile.seconds))
+
+        if duration >= self.slow_threshold:
+            self._log_slow(profile, label, duration)
+
+    def _log_slow(self, profile: UpdateProfile, label: str, duration: float) -> None:
+        lines = [
+            f"{count}x {seconds * 1000:.1f} ms rows={rows} {normalize_statement(text)}"
+            for text, count, rows, seconds in profile.top(self.top)
+        ]
+        logger.warning(
+            "Slow update %s [%s]: %.0f ms, %d statements, %.0f ms SQL%s",
+            profile.update_id,
+            label,
+            duration * 1000,
+            profile.statements,
+            profile.seconds * 1000,
+            "".join(f"\n  {line}" for line in lines),
+        )
+
+    def summary(self, limit: t.Optional[int] = None) -> t.List[t.Dict[str, t.Any]]:
+        """Per-label averages, labels with the most SQL time per update first."""
+        result = []
+        for label, history in self._history.items():
+            count = len(history)
+            result.append({
+                "label": label,
+                "updates": count,
+                "statements_avg": round(sum(h[1] for h in history) / count, 1),
+                "rows_avg": round(sum(h[2] for h in history) / count, 1),
+                "sql_ms_avg": round(sum(h[3] for h in history) / count * 1000, 1),
+                "sql_ms_max": round(max(h[3] for h in history) * 1000, 1),
+                "total_ms_avg": round(sum(h[0] for h in history) / count * 1000, 1),
+            })
+        result.sort(key=lambda item: item["sql_ms_avg"], reverse=True)
+        return result[:limit] if limit is not None else result
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import math
+import typing as t
+
+DEFAULT_BUCKETS: t.Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: t.Iterable[t.Tuple[str, str]]) -> str:
+    body = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return f"{{{body}}}" if body else ""
+
+
+class _Metric:
+    """A named metric family; ``labels()`` returns the series for a label set.
+
+    Metrics without labels are used directly: ``JOBS.inc()`` is the same
+    as ``JOBS.labels().inc()``.
+    """
+
+    type: str = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: t.Sequence[str] = (),
+        registry: t.Optional[Registry] = None,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series: t.Dict[t.Tuple[str, ...], t.Any] = {}
+        if not self.labelnames:
+            # Export unlabelled metrics from the start, not on first use.
+            self.labels()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _new_series(self) -> t.Any:
+        raise NotImplementedError
+
+    def labels(self, *values: t.Any, **kwargs: t.Any) -> t.Any:
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        key = tuple(str(value) for value in values)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = self._new_series()
+        return series
+
+    def _samples(self) -> t.Iterator[t.Tuple[str, t.List[t.Tuple[str, str]], float]]:
+        for key, series in sorted(self._series.items()):
+            yield from series.samples(self.name, list(zip(self.labelnames, key)))
+
+    def render(self) -> t.List[str]:
+        lines = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for name, labels, value in self._samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class _CounterSeries:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self.value += amount
+
+    def samples(self, name: str, labels: list) -> t.Iterator[tuple]:
+        yield f"{name}_total", labels, self.value
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def _new_series(self) -> _CounterSeries:
+        return _CounterSeries()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class _GaugeSeries:
+    __slots__ = ("value", "function")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.function: t.Optional[t.Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set_function(self, function: t.Callable[[], float]) -> None:
+        """Read the value from ``function`` at scrape time instead."""
+        self.function = function
+
+    def samples(self, name: str, labels: list) -> t.Iterator[tuple]:
+        yield name, labels, self.function() if self.function else self.value
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def _new_series(self) -> _GaugeSeries:
+        return _GaugeSeries()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set_function(self, function: t.Callable[[], float]) -> None:
+        self.labels().set_function(function)
+
+
+class _HistogramSeries:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: t.Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def samples(self, name: str, labels: list) -> t.Iterator[tuple]:
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f"{name}_bucket", [*labels, ("le", _format_value(bound))], cumulative
+        yield f"{name}_bucket", [*labels, ("le", "+Inf")], self.count
+        yield f"{name}_sum", labels, self.sum
+        yield f"{name}_count", labels, self.count
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: t.Sequence[str] = (),
+        buckets: t.Sequence[float] = DEFAULT_BUCKETS,
+        registry: t.Optional[Registry] = None,
+    ) -> None:
+        self.buckets = tuple(sorted(b for b in buckets if b != math.inf))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_series(self) -> _HistogramSeries:
+        return _HistogramSeries(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+
+class Registry:
+    """Metric families of this process, rendered in Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: t.Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines: t.List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import logging
+import typing as t
+
+from aiohttp import web
+
+from .registry import REGISTRY, Registry
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsServer:
+    """Serve ``GET /metrics`` in Prometheus text format."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        registry: Registry = REGISTRY,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self._runner: t.Optional[web.AppRunner] = None
+
+    async def _metrics(self, _: web.Request) -> web.Response:
+        return web.Response(
+            body=self.registry.render().encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+    async def start(self) -> None:
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self._metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info("Metrics served on http://%s:%s/metrics", self.host, self.port)
+
+    async def shutdown(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import time
+import typing as t
+from contextvars import ContextVar, Token
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .metrics import (
+    DB_STATEMENT_DURATION,
+    DB_STATEMENTS,
+    UOW_SQL_DURATION,
+    UOW_STATEMENTS,
+)
+from .profiler import record_statement
+
+
+class SqlStats:
+    """Statements and SQL time collected while a scope is active."""
+
+    __slots__ = ("statements", "seconds", "_token")
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.seconds = 0.0
+        self._token: t.Optional[Token] = None
+
+    def activate(self) -> None:
+        self._token = _current.set(self)
+
+    def deactivate(self) -> None:
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+
+    def observe_unit_of_work(self) -> None:
+        if self.statements:
+            UOW_STATEMENTS.observe(self.statements)
+            UOW_SQL_DURATION.observe(self.seconds)
+
+
+_current: ContextVar[t.Optional[SqlStats]] = ContextVar("sql_stats", default=None)
+
+
+def _before_cursor_execute(
+    conn: t.Any,
+    cursor: t.Any,
+    statement: str,
+    parameters: t.Any,
+    context: t.Any,
+    executemany: bool,
+) -> None:
+    context._started_at = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: t.Any,
+    cursor: t.Any,
+    statement: str,
+    parameters: t.Any,
+    context: t.Any,
+    executemany: bool,
+) -> None:
+    elapsed = time.perf_counter() - context._started_at
+    DB_STATEMENTS.inc()
+    DB_STATEMENT_DURATION.observe(elapsed)
+
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += elapsed
+    record_statement(statement, cursor.rowcount, elapsed)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Count and time every statement the engine sends to the database."""
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class Roles(str, Enum):
+    """What a process runs: Telegram updates, scheduled jobs, or both."""
+
+    BOT = "bot"
+    WORKER = "worker"
+    ALL = "all"
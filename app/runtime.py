@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import time
+import typing as t
+from concurrent.futures import ProcessPoolExecutor
+
+from .monitoring.metrics import LOOP_LAG
+
+logger = logging.getLogger(__name__)
+
+T = t.TypeVar("T")
+
+
+class CpuPool:
+    """Process pool for the CPU-bound phases of scheduled jobs.
+
+    Work submitted here must be a module-level function with picklable,
+    preferably compact, arguments and result. Workers are spawned rather
+    than forked, so they never inherit the loop's threads or open
+    connections. With ``workers=0`` functions run inline on the loop.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self._executor: t.Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        if self.workers > 0 and self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    async def run(self, fn: t.Callable[..., T], *args: t.Any, **kwargs: t.Any) -> T:
+        if self._executor is None:
+            return fn(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    async def shutdown(self) -> None:
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            # Waiting for running work blocks, so do it off the loop.
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up from a fixed sleep.
+
+    The lag is the time the loop was busy with something else, which is
+    what every pending update waits on. Lags over ``warn_threshold`` are
+    logged as they happen; ``stats()`` returns the totals.
+    """
+
+    def __init__(self, interval: float, warn_threshold: float) -> None:
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self._task: t.Optional[asyncio.Task] = None
+
+        self.samples = 0
+        self.lag_last = 0.0
+        self.lag_max = 0.0
+        self.lag_total = 0.0
+        self.slow = 0
+
+    def start(self) -> None:
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            logger.info("Event loop lag: %s", self.stats())
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - started - self.interval, 0.0)
+
+            self.samples += 1
+            self.lag_last = lag
+            self.lag_max = max(self.lag_max, lag)
+            self.lag_total += lag
+            LOOP_LAG.observe(lag)
+            if lag > self.warn_threshold:
+                self.slow += 1
+                logger.warning("Event loop blocked for %.0f ms", lag * 1000)
+
+    def stats(self) -> t.Dict[str, t.Any]:
+        samples = self.samples or 1
+        return {
+            "samples": self.samples,
+            "slow": self.slow,
+            "lag_last_ms": round(self.lag_last * 1000, 3),
+            "lag_avg_ms": round(self.lag_total / samples * 1000, 3),
+            "lag_max_ms": round(self.lag_max * 1000, 3),
+        }
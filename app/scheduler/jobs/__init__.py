@@ -1,8 +1,10 @@
-from .alerts_dispatch import alerts_dispatch_job
+from .alerts_dispatch import alerts_dispatch_job, on_providers_changed
 from .downsample_history import (
     downsample_telemetry_job,
     downsample_providers_job,
 )
+from .maintain_database import maintain_database_job
+from .maintain_history import maintain_history_job
 from .monthly_reports import monthly_report_job
 from .sync_bags import sync_bags_job
 from .sync_providers import sync_providers_job
@@ -10,10 +12,13 @@ from .update_wallets import update_wallets_job
 
 __all__ = [
     "alerts_dispatch_job",
+    "on_providers_changed",
     "monthly_report_job",
     "sync_bags_job",
     "sync_providers_job",
     "update_wallets_job",
     "downsample_telemetry_job",
     "downsample_providers_job",
+    "maintain_history_job",
+    "maintain_database_job",
 ]
@@ -1,21 +1,54 @@
 import asyncio
 import logging
+import typing as t
 
 from ...alert.manager import AlertManager
 from ...context import Context
+from ...monitoring import metrics
 
 logger = logging.getLogger(__name__)
 
 ALERTS_DISPATCH_TIMEOUT = 55
 
+# Serialises the periodic sweep and event-driven evaluations, so the same
+# alert state is never processed twice concurrently.
+_dispatch_lock = asyncio.Lock()
+_pending_pubkeys: t.Set[str] = set()
+
 
 async def alerts_dispatch_job(ctx: Context) -> None:
+    async with _dispatch_lock:
+        await _run_dispatch(ctx, None, time_based_only=True)
+
+
+async def on_providers_changed(ctx: Context, pubkeys: t.Set[str]) -> None:
+    """Evaluate alerts right away for providers with fresh data.
+
+    Pubkeys published while a dispatch is running are accumulated and
+    evaluated in one batch once the lock is released.
+    """
+    _pending_pubkeys.update(pubkeys)
+
+    async with _dispatch_lock:
+        if not _pending_pubkeys:
+            return
+        batch = set(_pending_pubkeys)
+        _pending_pubkeys.clear()
+        await _run_dispatch(ctx, batch)
+
+
+async def _run_dispatch(
+    ctx: Context,
+    pubkeys: t.Optional[t.Set[str]],
+    time_based_only: bool = False,
+) -> None:
     try:
         await asyncio.wait_for(
-            _alerts_dispatch_impl(ctx),
+            _alerts_dispatch_impl(ctx, pubkeys, time_based_only),
             timeout=ALERTS_DISPATCH_TIMEOUT,
         )
     except asyncio.TimeoutError:
+        metrics.JOB_TIMEOUTS.labels("alerts_dispatch_job").inc()
         logger.error(
             "alerts_dispatch_job timed out after %ss",
             ALERTS_DISPATCH_TIMEOUT,
@@ -25,6 +58,10 @@ async def alerts_dispatch_job(ctx: Context) -> None:
         raise
 
 
-async def _alerts_dispatch_impl(ctx: Context) -> None:
+async def _alerts_dispatch_impl(
+    ctx: Context,
+    pubkeys: t.Optional[t.Set[str]] = None,
+    time_based_only: bool = False,
+) -> None:
     alert_manager = AlertManager(ctx)
-    await alert_manager.dispatch()
+    await alert_manager.dispatch(pubkeys, time_based_only=time_based_only)
@@ -2,46 +2,25 @@ import asyncio
 import logging
 from datetime import timedelta
 
-from sqlalchemy.sql.expression import text
-
 from ....context import Context
+from ....database.database import Database
+from ....database.helpers import now
+from ....database.models import ProviderHistoryModel
 from ....database.unitofwork import UnitOfWork
+from ....monitoring import metrics
 
 logger = logging.getLogger(__name__)
 
 DOWNSAMPLE_TIMEOUT = 10 * 60
 
 
-async def downsample_history_hourly(uow: UnitOfWork) -> None:
-    from ....database.helpers import now
-
-    start_prev_hour = (now() - timedelta(hours=2)).strftime("%Y-%m-%d %H:00:00")
-    end_prev_hour = (now() - timedelta(hours=1)).strftime("%Y-%m-%d %H:00:00")
-
-    sql = text(
-        """
-        WITH ranked AS (
-          SELECT
-            rowid,
-            ROW_NUMBER() OVER (
-              PARTITION BY pubkey
-              ORDER BY archived_at DESC
-            ) AS rn
-          FROM providers_history
-          WHERE archived_at >= :start_prev_hour
-            AND archived_at <  :end_prev_hour
-        )
-        DELETE FROM providers_history
-        WHERE rowid IN (SELECT rowid FROM ranked WHERE rn > 1);
-        """
-    )
-
-    await uow.session.execute(
-        sql,
-        {
-            "start_prev_hour": start_prev_hour,
-            "end_prev_hour": end_prev_hour,
-        },
+async def downsample_history_hourly(db: Database, uow: UnitOfWork) -> None:
+    await db.backend.downsample_hour(
+        uow.session,
+        ProviderHistoryModel.__table__,
+        "pubkey",
+        now() - timedelta(hours=2),
+        now() - timedelta(hours=1),
     )
 
 
@@ -52,6 +31,7 @@ async def downsample_providers_job(ctx: Context) -> None:
             timeout=DOWNSAMPLE_TIMEOUT,
         )
     except asyncio.TimeoutError:
+        metrics.JOB_TIMEOUTS.labels("downsample_providers_job").inc()
         logger.error(
             "downsample_providers_job timed out after %ss",
             DOWNSAMPLE_TIMEOUT,
@@ -63,4 +43,4 @@ async def downsample_providers_job(ctx: Context) -> None:
 
 async def _downsample_providers_impl(ctx: Context) -> None:
     async with UnitOfWork(ctx.db.session_factory) as uow:
-        await downsample_history_hourly(uow)
+        await downsample_history_hourly(ctx.db, uow)
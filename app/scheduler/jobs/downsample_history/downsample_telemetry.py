@@ -2,46 +2,26 @@ import asyncio
 import logging
 from datetime import timedelta
 
-from sqlalchemy.sql.expression import text
-
 from ....context import Context
+from ....database.database import Database
+from ....database.helpers import now, round_to_hour
+from ....database.models import TelemetryHistoryModel
+from ....database.series import TELEMETRY_METRICS
 from ....database.unitofwork import UnitOfWork
+from ....monitoring import metrics
 
 logger = logging.getLogger(__name__)
 
 DOWNSAMPLE_TIMEOUT = 10 * 60
 
 
-async def downsample_history_hourly(uow: UnitOfWork) -> None:
-    from ....database.helpers import now
-
-    start_prev_hour = (now() - timedelta(hours=2)).strftime("%Y-%m-%d %H:00:00")
-    end_prev_hour = (now() - timedelta(hours=1)).strftime("%Y-%m-%d %H:00:00")
-
-    sql = text(
-        """
-        WITH ranked AS (
-          SELECT
-            rowid,
-            ROW_NUMBER() OVER (
-              PARTITION BY provider_pubkey
-              ORDER BY archived_at DESC
-            ) AS rn
-          FROM telemetry_history
-          WHERE archived_at >= :start_prev_hour
-            AND archived_at <  :end_prev_hour
-        )
-        DELETE FROM telemetry_history
-        WHERE rowid IN (SELECT rowid FROM ranked WHERE rn > 1);
-        """
-    )
-
-    await uow.session.execute(
-        sql,
-        {
-            "start_prev_hour": start_prev_hour,
-            "end_prev_hour": end_prev_hour,
-        },
+async def downsample_history_hourly(db: Database, uow: UnitOfWork) -> None:
+    await db.backend.downsample_hour(
+        uow.session,
+        TelemetryHistoryModel.__table__,
+        "provider_pubkey",
+        now() - timedelta(hours=2),
+        now() - timedelta(hours=1),
     )
 
 
@@ -52,6 +32,7 @@ async def downsample_telemetry_job(ctx: Context) -> None:
             timeout=DOWNSAMPLE_TIMEOUT,
         )
     except asyncio.TimeoutError:
+        metrics.JOB_TIMEOUTS.labels("downsample_telemetry_job").inc()
         logger.error(
             "downsample_telemetry_job timed out after %ss",
             DOWNSAMPLE_TIMEOUT,
@@ -63,4 +44,9 @@ async def downsample_telemetry_job(ctx: Context) -> None:
 
 async def _downsample_telemetry_impl(ctx: Context) -> None:
     async with UnitOfWork(ctx.db.session_factory) as uow:
-        await downsample_history_hourly(uow)
+        await downsample_history_hourly(ctx.db, uow)
+
+    if ctx.series is not None:
+        start = round_to_hour(now() - timedelta(hours=2))
+        end = round_to_hour(now() - timedelta(hours=1))
+        await asyncio.to_thread(ctx.series.compact, TELEMETRY_METRICS, start, end)
@@ -0,0 +1,35 @@
+import logging
+
+from ...context import Context
+from ...monitoring import metrics
+
+logger = logging.getLogger(__name__)
+
+
+async def maintain_database_job(ctx: Context) -> None:
+    """Reclaim free pages, refresh statistics, checkpoint the WAL and export the database size."""
+    backend = ctx.db.backend
+    try:
+        async with ctx.db.engine.connect() as conn:
+            # VACUUM and checkpoints can't run inside a transaction.
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            before = await conn.run_sync(backend.storage_stats)
+            await conn.run_sync(backend.maintain_storage)
+            after = await conn.run_sync(backend.storage_stats)
+    except Exception:
+        logger.exception("maintain_database_job failed")
+        raise
+
+    if before is None or after is None:
+        return
+    metrics.DB_SIZE.set(after.database_bytes)
+    metrics.DB_WAL_SIZE.set(before.wal_bytes)
+    metrics.DB_FREE_PAGE_RATIO.set(before.free_ratio)
+    logger.info(
+        "Database maintained: %.1f MB -> %.1f MB, WAL %.1f MB -> %.1f MB, %.1f%% pages were free",
+        before.database_bytes / 1024**2,
+        after.database_bytes / 1024**2,
+        before.wal_bytes / 1024**2,
+        after.wal_bytes / 1024**2,
+        before.free_ratio * 100,
+    )
@@ -0,0 +1,26 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from ...config import HISTORY_RETENTION_DAYS
+from ...context import Context
+from ...database.helpers import now
+
+logger = logging.getLogger(__name__)
+
+
+async def maintain_history_job(ctx: Context) -> None:
+    """Prepare upcoming history partitions and apply HISTORY_RETENTION_DAYS."""
+    backend = ctx.db.backend
+    cutoff = now() - timedelta(days=HISTORY_RETENTION_DAYS)
+    try:
+        async with ctx.db.engine.begin() as conn:
+            await conn.run_sync(backend.maintain_history, now())
+            if HISTORY_RETENTION_DAYS > 0:
+                await conn.run_sync(backend.prune_history, cutoff)
+        # The series store mirrors the history tables, so it ages out with them.
+        if HISTORY_RETENTION_DAYS > 0 and ctx.series is not None:
+            await asyncio.to_thread(ctx.series.prune, cutoff)
+    except Exception:
+        logger.exception("maintain_history_job failed")
+        raise
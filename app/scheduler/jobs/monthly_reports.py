@@ -20,7 +20,7 @@ async def monthly_report_job(ctx: Context) -> None:
         reports_by_provider = {}
         for provider in providers:
             reports_by_provider[provider.pubkey] = await build_monthly_report(
-                uow.session, provider.pubkey
+                uow.session, provider.pubkey, ctx.series
             )
             users_by_provider[provider.pubkey] = await repo.get_subscribed_users(
                 provider.pubkey
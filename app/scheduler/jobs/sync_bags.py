@@ -9,10 +9,12 @@ from ...alert.manager import AlertManager
 from ...alert.repository import AlertRepository
 from ...alert.types import AlertTypes, AlertStages
 from ...api.mytonprovider import ContractBagsRequest, ContractInfo
+from ...cache import CacheNamespaces
 from ...config import TIMEZONE
 from ...context import Context
 from ...database.models import ContractModel
 from ...database.unitofwork import UnitOfWork
+from ...monitoring import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +22,9 @@ SYNC_BAGS_TIMEOUT = 4 * 60
 MAX_DISPLAY_BAGS = 20
 MISSING_THRESHOLD = timedelta(days=7)
 REASON_THRESHOLD = timedelta(hours=24)
+# Pauses between contract pages and before retrying one, to spare the API.
+FETCH_PAGE_DELAY = 1
+FETCH_RETRY_DELAY = 2
 
 ContractKey = tuple[str, str]
 
@@ -40,25 +45,25 @@ class ContractDiff:
 
 
 def _compute_diff(
-    old_by_key: dict[ContractKey, ContractModel],
+    old_missing_since: dict[ContractKey, t.Optional[datetime]],
     new_keys: set[ContractKey],
     now: datetime,
 ) -> ContractDiff:
-    old_keys = set(old_by_key.keys())
+    old_keys = set(old_missing_since.keys())
     returned = {
-        k for k in (new_keys & old_keys) if old_by_key[k].missing_since is not None
+        k for k in (new_keys & old_keys) if old_missing_since[k] is not None
     }
     return ContractDiff(
         truly_new=new_keys - old_keys,
         returned=returned,
         newly_missing={
-            k for k in (old_keys - new_keys) if old_by_key[k].missing_since is None
+            k for k in (old_keys - new_keys) if old_missing_since[k] is None
         },
         confirmed_missing={
             k
             for k in (old_keys - new_keys)
-            if old_by_key[k].missing_since is not None
-            and (now - _ensure_aware(old_by_key[k].missing_since)) > MISSING_THRESHOLD
+            if old_missing_since[k] is not None
+            and (now - _ensure_aware(old_missing_since[k])) > MISSING_THRESHOLD
         },
         still_present=(new_keys & old_keys) - returned,
     )
@@ -66,20 +71,17 @@ def _compute_diff(
 
 def _build_notifications(
     diff: ContractDiff,
-    old_by_key: dict[ContractKey, ContractModel],
-    new_by_key: dict[ContractKey, ContractInfo],
+    old_bag_ids: dict[ContractKey, str],
+    new_bag_ids: dict[ContractKey, str],
 ) -> dict[str, dict[str, list[str]]]:
+    # The provider pubkey is the second half of the key.
     added_by_provider: dict[str, list[str]] = defaultdict(list)
     for key in diff.truly_new:
-        added_by_provider[new_by_key[key].provider_pubkey].append(
-            new_by_key[key].bag_id
-        )
+        added_by_provider[key[1]].append(new_bag_ids[key])
 
     removed_by_provider: dict[str, list[str]] = defaultdict(list)
     for key in diff.confirmed_missing:
-        removed_by_provider[old_by_key[key].provider_pubkey].append(
-            old_by_key[key].bag_id
-        )
+        removed_by_provider[key[1]].append(old_bag_ids[key])
 
     notifications: dict[str, dict[str, list[str]]] = {}
     all_pubkeys = set(added_by_provider.keys()) | set(removed_by_provider.keys())
@@ -97,6 +99,32 @@ def _build_notifications(
     return notifications
 
 
+def plan_sync(
+    old_contracts: list[tuple[str, str, str, t.Optional[datetime]]],
+    new_contracts: list[tuple[str, str, str]],
+    now: datetime,
+    notify: bool,
+) -> tuple[ContractDiff, dict[str, dict[str, list[str]]]]:
+    """Diff stored contracts against fetched ones; runs in the CPU pool.
+
+    Takes ``(address, provider_pubkey, bag_id[, missing_since])`` tuples
+    rather than models, so the inputs pickle cheaply.
+    """
+    old_missing_since = {(a, p): missing for a, p, _, missing in old_contracts}
+    new_bag_ids = {(a, p): bag_id for a, p, bag_id in new_contracts}
+
+    diff = _compute_diff(old_missing_since, set(new_bag_ids), now)
+    notifications = {}
+    if notify:
+        old_bag_ids = {(a, p): bag_id for a, p, bag_id, _ in old_contracts}
+        notifications = _build_notifications(diff, old_bag_ids, new_bag_ids)
+
+    # Nearly every key is still present; the caller rebuilds that set from
+    # its own keys, which is cheaper than unpickling it.
+    diff.still_present = set()
+    return diff, notifications
+
+
 async def sync_bags_job(ctx: Context) -> None:
     try:
         await asyncio.wait_for(
@@ -104,6 +132,7 @@ async def sync_bags_job(ctx: Context) -> None:
             timeout=SYNC_BAGS_TIMEOUT,
         )
     except asyncio.TimeoutError:
+        metrics.JOB_TIMEOUTS.labels("sync_bags_job").inc()
         logger.error(
             "sync_bags_job timed out after %ss",
             SYNC_BAGS_TIMEOUT,
@@ -136,7 +165,7 @@ async def _fetch_all_contracts(ctx: Context) -> t.Optional[list[ContractInfo]]:
                     max_retries,
                 )
                 if attempt < max_retries - 1:
-                    await asyncio.sleep(2)
+                    await asyncio.sleep(FETCH_RETRY_DELAY)
 
         if response is None:
             return None
@@ -155,7 +184,7 @@ async def _fetch_all_contracts(ctx: Context) -> t.Optional[list[ContractInfo]]:
         if len(all_contracts) >= response.total:
             break
         offset += limit
-        await asyncio.sleep(1)
+        await asyncio.sleep(FETCH_PAGE_DELAY)
 
     if len(all_contracts) != expected_total:
         logger.warning(
@@ -380,7 +409,14 @@ async def _sync_bags_impl(ctx: Context) -> None:
     is_first_run = not old_by_key and new_keys
     now = datetime.now(TIMEZONE)
 
-    diff = _compute_diff(old_by_key, new_keys, now)
+    diff, notifications = await ctx.cpu.run(
+        plan_sync,
+        [(*k, c.bag_id, c.missing_since) for k, c in old_by_key.items()],
+        [(*k, c.bag_id) for k, c in new_by_key.items()],
+        now,
+        not is_first_run,
+    )
+    diff.still_present = (new_keys & old_by_key.keys()) - diff.returned
     await _apply_db_changes(
         ctx,
         diff,
@@ -388,6 +424,7 @@ async def _sync_bags_impl(ctx: Context) -> None:
         new_by_key,
         now,
     )
+    await ctx.metrics_cache.bump(CacheNamespaces.BAGS)
 
     if is_first_run:
         logger.info(
@@ -396,10 +433,5 @@ async def _sync_bags_impl(ctx: Context) -> None:
         )
         return
 
-    notifications = _build_notifications(
-        diff,
-        old_by_key,
-        new_by_key,
-    )
     if notifications:
         await _send_notifications(ctx, notifications)
@@ -3,7 +3,10 @@ import logging
 
 from .update_providers import update_providers_job
 from .update_telemetry import update_telemetry_job
+from ....cache import CacheNamespaces
 from ....context import Context
+from ....events import EventTypes
+from ....monitoring import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +20,7 @@ async def sync_providers_job(ctx: Context) -> None:
             timeout=SYNC_PROVIDERS_TIMEOUT,
         )
     except asyncio.TimeoutError:
+        metrics.JOB_TIMEOUTS.labels("sync_providers_job").inc()
         logger.error(
             "sync_providers_job timed out after %ss",
             SYNC_PROVIDERS_TIMEOUT,
@@ -27,5 +31,17 @@ async def sync_providers_job(ctx: Context) -> None:
 
 
 async def _sync_providers_impl(ctx: Context) -> None:
-    await update_providers_job(ctx)
-    await update_telemetry_job(ctx)
+    try:
+        changed = await update_providers_job(ctx)
+        # Only bot processes keep an index; separate ones follow the bump below.
+        if "providers_index" in ctx:
+            await ctx.providers_index.rebuild(ctx.db.session_factory)
+        changed |= await update_telemetry_job(ctx)
+    finally:
+        # Either job may have committed before the other failed.
+        await ctx.metrics_cache.bump(CacheNamespaces.PROVIDERS)
+
+    # Published once both tables are fresh, so subscribers never observe
+    # new provider state paired with the previous telemetry sample.
+    if changed:
+        ctx.events.publish(EventTypes.PROVIDERS_CHANGED, changed)
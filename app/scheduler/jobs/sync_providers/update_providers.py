@@ -1,6 +1,8 @@
 import logging
 import typing as t
 
+from sqlalchemy import insert, select
+
 from ....api.mytonprovider import MytonproviderClient, Provider, ProviderSearchPayload
 from ....context import Context
 from ....database.helpers import now_rounded_min
@@ -25,28 +27,34 @@ async def iterate_providers(
         offset += limit
 
 
-async def update_providers_job(ctx: Context) -> None:
+async def update_providers_job(ctx: Context) -> t.Set[str]:
+    """Sync providers and return pubkeys whose alert-relevant state changed."""
     try:
         now = now_rounded_min()
-        provider_models = []
-        provider_history_models = []
-        async for provider in iterate_providers(ctx.mytonprovider):
-            data = provider.model_dump()
-
-            provider_data = data.copy()
-            provider_history_data = data.copy()
-
-            provider_data["updated_at"] = now
-            provider_models.append(ProviderModel(**provider_data))
-
-            provider_history_data["archived_at"] = now
-            provider_history_models.append(
-                ProviderHistoryModel(**provider_history_data)
-            )
+        rows = [provider.model_dump() async for provider in iterate_providers(ctx.mytonprovider)]
 
         async with UnitOfWork(ctx.db.session_factory) as uow:
-            await uow.provider.bulk_upsert(provider_models)
-            await uow.provider_history.bulk_upsert(provider_history_models)
+            result = await uow.session.execute(
+                select(
+                    ProviderModel.pubkey,
+                    ProviderModel.status,
+                    ProviderModel.status_ratio,
+                )
+            )
+            previous = {pubkey: (status, ratio) for pubkey, status, ratio in result}
+
+            await uow.provider.upsert_rows([{**row, "updated_at": now} for row in rows])
+            if rows:
+                await uow.session.execute(
+                    insert(ProviderHistoryModel.__table__).values(archived_at=now),
+                    rows,
+                )
+
+        return {
+            row["pubkey"]
+            for row in rows
+            if previous.get(row["pubkey"]) != (row["status"], row["status_ratio"])
+        }
     except Exception:
         logger.exception("update_providers_job failed")
         raise
@@ -1,47 +1,127 @@
+import asyncio
 import logging
+import typing as t
+from datetime import datetime
 
-from sqlalchemy.sql.expression import delete
-
+from ....config import TELEMETRY_STREAM, TELEMETRY_STREAM_BATCH
 from ....context import Context
 from ....database.helpers import now_rounded_min
-from ....database.models import TelemetryModel, TelemetryHistoryModel
+from ....database.ingest import (
+    delete_stale_telemetry,
+    fetch_telemetry_timestamps,
+    parse_telemetry,
+    telemetry_params,
+    write_telemetry,
+)
+from ....database.series import telemetry_points
 from ....database.unitofwork import UnitOfWork
 
 logger = logging.getLogger(__name__)
 
+# Batches buffered between the download and the writer; bounds peak memory.
+STREAM_QUEUE_SIZE = 2
+
+
+async def update_telemetry_job(ctx: Context) -> t.Set[str]:
+    """Sync telemetry and return pubkeys that reported a new sample."""
+    try:
+        if TELEMETRY_STREAM:
+            return await _update_telemetry_stream(ctx)
+        return await _update_telemetry(ctx)
+    except Exception:
+        logger.exception("update_telemetry_job failed")
+        raise
+
+
+async def _update_telemetry(ctx: Context) -> t.Set[str]:
+    now = now_rounded_min()
+    raw = await ctx.mytonprovider.telemetry_raw()
+    params = await ctx.cpu.run(parse_telemetry, raw)
+
+    async with UnitOfWork(ctx.db.session_factory) as uow:
+        previous = await fetch_telemetry_timestamps(uow.session)
+        await write_telemetry(uow.session, params, now)
+        await delete_stale_telemetry(
+            uow.session, (p["provider_pubkey"] for p in params)
+        )
+
+    if ctx.series is not None:
+        await ctx.series.write(telemetry_points(params, now))
+    return _changed_pubkeys(previous, params)
 
-async def update_telemetry_job(ctx: Context) -> None:
+
+async def _update_telemetry_stream(ctx: Context) -> t.Set[str]:
+    """Decode the response incrementally and write it batch by batch.
+
+    Each batch is committed in its own short transaction, so the SQLite
+    write lock is never held while waiting for the network. Stale rows are
+    removed only after the whole response has been consumed.
+    """
+    now = now_rounded_min()
+    queue: asyncio.Queue[t.Optional[t.List[t.Dict[str, t.Any]]]] = asyncio.Queue(
+        maxsize=STREAM_QUEUE_SIZE
+    )
+
+    async with UnitOfWork(ctx.db.session_factory) as uow:
+        previous = await fetch_telemetry_timestamps(uow.session)
+
+    async def produce() -> None:
+        batch: t.List[t.Dict[str, t.Any]] = []
+        try:
+            async for telemetry in ctx.mytonprovider.iter_telemetry():
+                batch.append(telemetry_params(telemetry))
+                if len(batch) >= TELEMETRY_STREAM_BATCH:
+                    await queue.put(batch)
+                    batch = []
+            if batch:
+                await queue.put(batch)
+        except Exception:
+            # Unblock the writer; the error is re-raised from `await producer`.
+            await queue.put(None)
+            raise
+        await queue.put(None)
+
+    producer = asyncio.create_task(produce())
     try:
-        now = now_rounded_min()
-        response = await ctx.mytonprovider.telemetry()
+        seen, changed = await _consume_batches(ctx, queue, previous, now)
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
 
-        telemetry_models = []
-        telemetry_history_models = []
-        for telemetry in response.providers:
-            data = telemetry.model_dump()
-            data["provider_pubkey"] = telemetry.storage.provider.pubkey.lower()
+    async with UnitOfWork(ctx.db.session_factory) as uow:
+        await delete_stale_telemetry(uow.session, seen)
 
-            telemetry_data = data.copy()
-            telemetry_history_data = data.copy()
+    return changed
 
-            telemetry_data["updated_at"] = now
-            telemetry_models.append(TelemetryModel(**telemetry_data))
 
-            telemetry_history_data["archived_at"] = now
-            telemetry_history_models.append(
-                TelemetryHistoryModel(**telemetry_history_data)
-            )
+async def _consume_batches(
+    ctx: Context,
+    queue: asyncio.Queue,
+    previous: t.Dict[str, int],
+    now: datetime,
+) -> t.Tuple[t.Set[str], t.Set[str]]:
+    seen: t.Set[str] = set()
+    changed: t.Set[str] = set()
 
+    while (batch := await queue.get()) is not None:
         async with UnitOfWork(ctx.db.session_factory) as uow:
-            await uow.telemetry_history.bulk_upsert(telemetry_history_models)
-            await uow.telemetry.bulk_upsert(telemetry_models)
-
-            current_pubkeys = tuple({m.provider_pubkey for m in telemetry_models})
-            if current_pubkeys:
-                stmt = delete(TelemetryModel).where(
-                    ~TelemetryModel.provider_pubkey.in_(current_pubkeys)
-                )
-                await uow.session.execute(stmt)
-    except Exception:
-        logger.exception("update_telemetry_job failed")
-        raise
+            await write_telemetry(uow.session, batch, now)
+        if ctx.series is not None:
+            await ctx.series.write(telemetry_points(batch, now))
+        seen.update(p["provider_pubkey"] for p in batch)
+        changed |= _changed_pubkeys(previous, batch)
+
+    return seen, changed
+
+
+def _changed_pubkeys(
+    previous: t.Dict[str, int],
+    params: t.List[t.Dict[str, t.Any]],
+) -> t.Set[str]:
+    return {
+        p["provider_pubkey"]
+        for p in params
+        if previous.get(p["provider_pubkey"]) != p["timestamp"]
+    }
@@ -8,11 +8,14 @@ from dataclasses import dataclass
 from datetime import datetime
 
 from ...api.toncenter import ToncenterClient, Transaction
+from ...cache import CacheNamespaces
 from ...config import TIMEZONE
 from ...context import Context
-from ...database.helpers import round_to_hour
-from ...database.models import WalletHistoryModel, WalletModel
+from ...database.helpers import now, round_to_hour
+from ...database.models import WalletHistoryModel
+from ...database.series import wallet_points
 from ...database.unitofwork import UnitOfWork
+from ...monitoring import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -43,11 +46,34 @@ class WalletMetrics:
         return self.transfer_in + self.earned - self.transfer_out - self.other_fees
 
 
+# (opcode, value, fwd_fee)
+CompactMessage = t.Tuple[t.Optional[str], t.Optional[int], t.Optional[int]]
+# (lt, now, total_fees, in_msg, out_msgs)
+CompactTransaction = t.Tuple[
+    int, int, int, t.Optional[CompactMessage], t.Tuple[CompactMessage, ...]
+]
+
+
+def compact_transaction(tx: Transaction) -> CompactTransaction:
+    """Keep the fields the wallet metrics read, as plain tuples.
+
+    Plain tuples keep memory low and pickle fast on the way to the CPU pool.
+    """
+    in_msg = tx.in_msg
+    return (
+        tx.lt,
+        tx.now,
+        tx.total_fees,
+        (in_msg.opcode, in_msg.value, in_msg.fwd_fee) if in_msg else None,
+        tuple((m.opcode, m.value, m.fwd_fee) for m in tx.out_msgs or []),
+    )
+
+
 async def collect_transactions(
     toncenter: ToncenterClient,
     address: str,
     from_lt: t.Optional[int] = None,
-) -> list[Transaction]:
+) -> list[CompactTransaction]:
     limit, result = 100, []
 
     async with toncenter:
@@ -63,7 +89,7 @@ async def collect_transactions(
                 break
 
             result.extend(
-                transaction
+                compact_transaction(transaction)
                 for transaction in transactions
                 if from_lt is None or transaction.lt > from_lt
             )
@@ -75,42 +101,44 @@ async def collect_transactions(
 
 
 def group_transactions_by_hour(
-    transactions: t.List[Transaction],
-) -> t.Dict[datetime, t.List[Transaction]]:
-    transactions_by_hour: t.Dict[datetime, list[Transaction]] = defaultdict(list)
+    transactions: t.List[CompactTransaction],
+) -> t.Dict[datetime, t.List[CompactTransaction]]:
+    transactions_by_hour: t.Dict[datetime, list[CompactTransaction]] = defaultdict(list)
 
-    for transaction in sorted(transactions, key=lambda tx: tx.now):
-        tx_datatime = datetime.fromtimestamp(transaction.now, tz=TIMEZONE)
+    for transaction in sorted(transactions, key=lambda tx: tx[1]):
+        tx_datatime = datetime.fromtimestamp(transaction[1], tz=TIMEZONE)
         tx_datetime_by_hour = round_to_hour(tx_datatime)
         transactions_by_hour[tx_datetime_by_hour].append(transaction)
     return transactions_by_hour
 
 
-def extract_transaction_metrics(tx: Transaction) -> WalletMetrics:
-    total_fees = tx.total_fees or 0
+def extract_transaction_metrics(tx: CompactTransaction) -> WalletMetrics:
+    _, _, total_fees, in_msg, out_msgs = tx
+    total_fees = total_fees or 0
     is_reward_received = False
     has_proof_payment = False
     metrics = WalletMetrics()
 
-    if tx.in_msg and tx.in_msg.value:
-        if tx.in_msg.opcode == "0xa91baf56":  # reward withdrawal
-            metrics.reward_received = tx.in_msg.value
+    if in_msg and in_msg[1]:
+        opcode, value, _ = in_msg
+        if opcode == "0xa91baf56":  # reward withdrawal
+            metrics.reward_received = value
             is_reward_received = True
         else:
-            metrics.transfer_in = tx.in_msg.value
+            metrics.transfer_in = value
 
-    for msg in tx.out_msgs or []:
-        if msg.opcode == "0x48f548ce":  # proof storage
-            metrics.proof_paid += msg.value
+    for opcode, value, fwd_fee in out_msgs:
+        if opcode == "0x48f548ce":  # proof storage
+            metrics.proof_paid += value
             has_proof_payment = True
         else:
-            metrics.transfer_out += msg.value
+            metrics.transfer_out += value
 
-        if msg.fwd_fee:
+        if fwd_fee:
             if has_proof_payment or is_reward_received:
-                metrics.revenue_fees += msg.fwd_fee
+                metrics.revenue_fees += fwd_fee
             else:
-                metrics.other_fees += msg.fwd_fee
+                metrics.other_fees += fwd_fee
 
     if is_reward_received or has_proof_payment:
         metrics.revenue_fees += total_fees
@@ -120,6 +148,36 @@ def extract_transaction_metrics(tx: Transaction) -> WalletMetrics:
     return metrics
 
 
+HourlyWalletData = t.Tuple[datetime, WalletMetrics, int, int]
+
+
+def summarize_transactions(
+    transactions: t.List[CompactTransaction],
+    lt: t.Optional[int],
+    balance: int,
+    earned: int,
+) -> t.Tuple[t.List[HourlyWalletData], t.Optional[int], int, int]:
+    """Aggregate new transactions per hour; runs in the CPU pool.
+
+    Returns ``(hour, metrics, last_lt, balance)`` for each hour, followed
+    by the wallet's final lt, balance and earned totals.
+    """
+    hourly_data = []
+    for tx_datetime_hour, transactions_in_hour in sorted(
+        group_transactions_by_hour(transactions).items()
+    ):
+        wallet_metrics = WalletMetrics()
+        for transaction in transactions_in_hour:
+            wallet_metrics.add(extract_transaction_metrics(transaction))
+
+        lt = max(tx[0] for tx in transactions_in_hour)
+        balance += wallet_metrics.balance
+        earned += wallet_metrics.earned
+        hourly_data.append((tx_datetime_hour, wallet_metrics, lt, balance))
+
+    return hourly_data, lt, balance, earned
+
+
 UPDATE_WALLETS_TIMEOUT = 4 * 60
 
 
@@ -130,6 +188,7 @@ async def update_wallets_job(ctx: Context) -> None:
             timeout=UPDATE_WALLETS_TIMEOUT,
         )
     except asyncio.TimeoutError:
+        metrics.JOB_TIMEOUTS.labels("update_wallets_job").inc()
         logger.error(
             "update_wallets_job timed out after %ss",
             UPDATE_WALLETS_TIMEOUT,
@@ -140,6 +199,13 @@ async def update_wallets_job(ctx: Context) -> None:
 
 
 async def _update_wallets_impl(ctx: Context) -> None:
+    try:
+        await _update_wallets(ctx)
+    finally:
+        await ctx.metrics_cache.bump(CacheNamespaces.WALLETS)
+
+
+async def _update_wallets(ctx: Context) -> None:
     async with UnitOfWork(ctx.db.session_factory) as uow:
         providers = await uow.provider.all()
 
@@ -159,22 +225,18 @@ async def _update_wallets_impl(ctx: Context) -> None:
         if transactions is None:
             continue
 
-        grouped_transactions = group_transactions_by_hour(transactions)
-
-        hourly_data = []
-        for tx_datetime_hour, transactions_in_hour in sorted(
-            grouped_transactions.items()
-        ):
-            wallet_metrics = WalletMetrics()
-            for transaction in transactions_in_hour:
-                wallet_metrics.add(extract_transaction_metrics(transaction))
-
-            last_wallet_lt = max(tx.lt for tx in transactions_in_hour)
-            last_wallet_balance += wallet_metrics.balance
-            last_wallet_earned += wallet_metrics.earned
-
-            hourly_data.append((tx_datetime_hour, wallet_metrics,
-                                last_wallet_lt, last_wallet_balance))
+        (
+            hourly_data,
+            last_wallet_lt,
+            last_wallet_balance,
+            last_wallet_earned,
+        ) = await ctx.cpu.run(
+            summarize_transactions,
+            transactions,
+            last_wallet_lt,
+            last_wallet_balance,
+            last_wallet_earned,
+        )
 
         wallet_history_models = []
         async with UnitOfWork(ctx.db.session_factory) as uow:
@@ -201,13 +263,21 @@ async def _update_wallets_impl(ctx: Context) -> None:
                         )
                     )
 
-            wallet_model = WalletModel(
-                provider_pubkey=provider.pubkey,
-                address=provider.address,
-                balance=last_wallet_balance,
-                earned=last_wallet_earned,
-                last_lt=last_wallet_lt,
-            )
-
-            await uow.wallet.upsert(wallet_model)
+            await uow.wallet.upsert_rows([{
+                "provider_pubkey": provider.pubkey,
+                "address": provider.address,
+                "balance": last_wallet_balance,
+                "earned": last_wallet_earned,
+                "last_lt": last_wallet_lt,
+                "updated_at": now(),
+            }])
             await uow.wallet_history.bulk_upsert(wallet_history_models)
+
+        if ctx.series is not None:
+            await ctx.series.write(
+                point
+                for model in wallet_history_models
+                for point in wallet_points(
+                    provider.pubkey, model.archived_at, model.earned, model.balance
+                )
+            )
@@ -1,4 +1,5 @@
 from contextlib import suppress
+from functools import partial
 
 from apscheduler.events import EVENT_JOB_ERROR
 from apscheduler.jobstores.base import JobLookupError
@@ -10,6 +11,8 @@ from . import jobs
 from .errors import on_job_error
 from ..config import TIMEZONE, SCHEDULER_URL
 from ..context import get_context
+from ..events import EventTypes
+from ..monitoring import JobMetrics
 
 
 class Scheduler:
@@ -20,13 +23,24 @@ class Scheduler:
     async def start(self) -> None:
         self.async_scheduler.add_jobstore(SQLAlchemyJobStore(SCHEDULER_URL))
         self.async_scheduler.add_listener(on_job_error, mask=EVENT_JOB_ERROR)
+        JobMetrics().register(self.async_scheduler)
         self.async_scheduler.start()
         self.add_jobs()
+        self.subscribe_events()
 
     async def shutdown(self) -> None:
         self.remove_jobs()
         self.async_scheduler.shutdown(wait=True)
 
+    @staticmethod
+    def subscribe_events() -> None:
+        ctx = get_context()
+
+        ctx.events.subscribe(
+            EventTypes.PROVIDERS_CHANGED,
+            partial(jobs.on_providers_changed, ctx),
+        )
+
     def add_jobs(self) -> None:
         ctx = get_context()
 
@@ -40,9 +54,11 @@ class Scheduler:
             max_instances=1,
             replace_existing=True,
         )
+        # Fresh telemetry is evaluated via EventTypes.PROVIDERS_CHANGED;
+        # the sweep only evaluates time-based conditions (e.g. PROVIDER_OFFLINE).
         self.async_scheduler.add_job(
             jobs.alerts_dispatch_job,
-            trigger=CronTrigger(minute="*", jitter=30),
+            trigger=CronTrigger(minute="*/5", jitter=30),
             kwargs={"ctx": ctx},
             id=jobs.alerts_dispatch_job.__name__,
             misfire_grace_time=30,
@@ -105,6 +121,27 @@ class Scheduler:
             max_instances=1,
             replace_existing=True,
         )
+        self.async_scheduler.add_job(
+            jobs.maintain_history_job,
+            trigger=CronTrigger(hour=0, minute=10, timezone=TIMEZONE),
+            kwargs={"ctx": ctx},
+            id=jobs.maintain_history_job.__name__,
+            misfire_grace_time=3600,
+            coalesce=True,
+            max_instances=1,
+            replace_existing=True,
+        )
+        # Right after each downsample job, while the pages it freed are fresh.
+        self.async_scheduler.add_job(
+            jobs.maintain_database_job,
+            trigger=CronTrigger(minute="25,55"),
+            kwargs={"ctx": ctx},
+            id=jobs.maintain_database_job.__name__,
+            misfire_grace_time=600,
+            coalesce=True,
+            max_instances=1,
+            replace_existing=True,
+        )
 
     def remove_jobs(self) -> None:
         for job in (
@@ -115,6 +152,8 @@ class Scheduler:
             jobs.monthly_report_job,
             jobs.downsample_providers_job,
             jobs.downsample_telemetry_job,
+            jobs.maintain_history_job,
+            jobs.maintain_database_job,
         ):
             with suppress(JobLookupError):
                 self.async_scheduler.remove_job(job.__name__)
@@ -0,0 +1,28 @@
+"""Defaults that let app.config import without a real .env file.
+
+The database is a fresh SQLite file unless BENCH_DB_URL names another
+one, such as a scratch PostgreSQL database (the suite drops its tables).
+"""
+
+import os
+import tempfile
+
+_DEFAULTS = {
+    "BOT_TOKEN": "123:benchmark",
+    "DEV_ID": "0",
+    "ADMIN_PASSWORD": "benchmark",
+    "REDIS_URL": "redis://localhost:6379/15",
+    "SCHEDULER_URL": "sqlite://",
+    "TONCENTER_API_KEY": "benchmark",
+    "MYTONPROVIDER_API_KEY": "benchmark",
+    "SUPPORTED_LOCALES": "en,ru,zh-TW",
+}
+
+
+def setup_env(db_path: str | None = None) -> str:
+    for key, value in _DEFAULTS.items():
+        os.environ.setdefault(key, value)
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="mtpb-"), "bench.sqlite3")
+    os.environ["DB_URL"] = os.environ.get("BENCH_DB_URL") or f"sqlite+aiosqlite:///{db_path}"
+    return db_path
@@ -0,0 +1,119 @@
+"""Provider menu click latency while sync_bags_job writes.
+
+Seeds the suite's synthetic network, then opens provider menus with a cold
+metrics cache, --concurrency clicks at a time: first with the database
+idle, then while sync_bags_job writes a freshly advanced network. Clicks
+read through the read-only engine (``reader``) and through the writer's
+pool (``writer``), which is where the getters read before.
+
+Usage: python -m benchmarks.click_latency [--scale medium]
+       [--seed 1] [--concurrency 4] [--clicks 200] [--port 8090]
+"""
+
+from ._env import setup_env
+
+setup_env()
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import itertools  # noqa: E402
+import logging  # noqa: E402
+import statistics  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+import typing as t  # noqa: E402
+
+from app.bot.dialogs.consts import PROVIDER_TABS  # noqa: E402
+from app.cache import CacheNamespaces  # noqa: E402
+from app.scheduler.jobs import sync_bags_job  # noqa: E402
+
+from .suite import (  # noqa: E402
+    MENU_PROVIDERS,
+    SCALES,
+    Bench,
+    build_bench,
+    close_bench,
+    first_subscriber,
+    open_provider_menu,
+)
+
+
+async def clicks(
+    bench: Bench,
+    read_session_factory: t.Any,
+    concurrency: int,
+    until: t.Callable[[int], bool],
+) -> t.List[float]:
+    """Click latencies in ms, until ``until(clicks made)`` is true."""
+    ctx = bench.ctx
+    user = await first_subscriber(bench)
+    targets = itertools.cycle(
+        itertools.product(bench.network.pubkeys[:MENU_PROVIDERS], PROVIDER_TABS)
+    )
+    latencies: t.List[float] = []
+
+    async def clicker() -> None:
+        while not until(len(latencies)):
+            pubkey, tab = next(targets)
+            await ctx.metrics_cache.bump(*CacheNamespaces)
+            started = time.perf_counter()
+            await open_provider_menu(ctx, user, pubkey, tab, read_session_factory)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(clicker() for _ in range(concurrency)))
+    return latencies
+
+
+def summary(latencies: t.List[float]) -> str:
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f"{len(ordered):>5} clicks  p50 {statistics.median(ordered):>8.1f} ms"
+        f"  p95 {p95:>8.1f} ms  max {ordered[-1]:>8.1f} ms"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    bench = await build_bench(args)
+    print(f"Seeded in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    db = bench.ctx.db
+    if db.read_engine is db.engine:
+        print("Note: this database has no separate read engine", file=sys.stderr)
+    modes = {"reader": db.read_session_factory, "writer": db.session_factory}
+    try:
+        for mode, factory in modes.items():
+            idle = await clicks(bench, factory, args.concurrency, lambda n: n >= args.clicks)
+
+            bench.network.advance()
+            sync = asyncio.create_task(sync_bags_job(bench.ctx))
+            started = time.perf_counter()
+            busy = await clicks(bench, factory, args.concurrency, lambda _: sync.done())
+            await sync
+            elapsed = time.perf_counter() - started
+
+            print(f"{mode:<7} idle  {summary(idle)}")
+            print(f"{mode:<7} sync  {summary(busy)}  (sync_bags {elapsed:.1f}s)")
+    finally:
+        await close_bench(bench)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="medium")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--clicks", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8090)
+    args = parser.parse_args()
+
+    args.providers, args.contracts, args.subscribers, args.hours = SCALES[args.scale]
+    args.workers = 0
+
+    logging.basicConfig(level=logging.ERROR)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Event loop lag while job phases run inline versus in the CPU pool.
+
+Runs each CPU-bound job phase on synthetic data, first on the loop and
+then through CpuPool, while a LoopLagMonitor samples the loop. Inline
+runs show the phase as loop lag; pooled runs should keep it flat.
+
+Usage: python -m benchmarks.cpu_offload [--providers 2000] [--contracts 100000]
+       [--transactions 50000] [--workers 2]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import typing as t
+from datetime import datetime
+
+from ._env import setup_env
+
+setup_env()
+
+from app.config import TIMEZONE  # noqa: E402
+from app.database.ingest import parse_telemetry  # noqa: E402
+from app.runtime import CpuPool, LoopLagMonitor  # noqa: E402
+from app.scheduler.jobs.sync_bags import plan_sync  # noqa: E402
+from app.scheduler.jobs.update_wallets import (  # noqa: E402
+    CompactTransaction,
+    summarize_transactions,
+)
+from .synthetic import pubkey_for, telemetry_payload  # noqa: E402
+
+
+def telemetry_raw(providers: int) -> bytes:
+    now = int(time.time())
+    items = [telemetry_payload(i, now) for i in range(providers)]
+    return json.dumps({"providers": items}).encode()
+
+
+def contracts(count: int) -> t.Tuple[list, list]:
+    rnd = random.Random(1)
+    now = datetime.now(TIMEZONE)
+    old, new = [], []
+    for i in range(count):
+        key = (f"EQ{i:062x}", pubkey_for(i % 500))
+        bag_id = f"{i:064x}"
+        if rnd.random() < 0.95:
+            missing = now if rnd.random() < 0.02 else None
+            old.append((*key, bag_id, missing))
+        if rnd.random() < 0.95:
+            new.append((*key, bag_id))
+    return old, new
+
+
+def transactions(count: int) -> t.List[CompactTransaction]:
+    rnd = random.Random(2)
+    start = int(time.time()) - count * 60
+    result = []
+    for i in range(count):
+        reward = rnd.random() < 0.5
+        in_msg = ("0xa91baf56" if reward else None, rnd.randint(1, 10**9), None)
+        out_msgs = tuple(
+            ("0x48f548ce", rnd.randint(1, 10**7), rnd.randint(1, 10**5))
+            for _ in range(rnd.randint(0, 2))
+        )
+        result.append((i, start + i * 60, rnd.randint(1, 10**6), in_msg, out_msgs))
+    return result
+
+
+async def measure(
+    name: str,
+    pool: CpuPool,
+    fn: t.Callable[..., t.Any],
+    *args: t.Any,
+) -> None:
+    monitor = LoopLagMonitor(interval=0.005, warn_threshold=float("inf"))
+    monitor.start()
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    await pool.run(fn, *args)
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(0.05)
+    await monitor.shutdown()
+    stats = monitor.stats()
+    mode = f"pool({pool.workers})" if pool.workers else "inline"
+    print(
+        f"{name:<24} {mode:<8} {elapsed * 1000:8.1f} ms   "
+        f"loop lag max={stats['lag_max_ms']:.1f} ms avg={stats['lag_avg_ms']:.2f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--providers", type=int, default=2000)
+    parser.add_argument("--contracts", type=int, default=100_000)
+    parser.add_argument("--transactions", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    raw = telemetry_raw(args.providers)
+    old, new = contracts(args.contracts)
+    txs = transactions(args.transactions)
+    now = datetime.now(TIMEZONE)
+    print(
+        f"telemetry {len(raw) / 1024**2:.1f} MiB, "
+        f"{len(old)}/{len(new)} contracts, {len(txs)} transactions"
+    )
+
+    for workers in (0, args.workers):
+        pool = CpuPool(workers)
+        pool.start()
+        try:
+            # Spawn the workers before timing anything.
+            await asyncio.gather(*(pool.run(int) for _ in range(workers)))
+            await measure("parse_telemetry", pool, parse_telemetry, raw)
+            await measure("plan_sync", pool, plan_sync, old, new, now, True)
+            await measure("summarize_transactions", pool, summarize_transactions, txs, None, 0, 0)
+        finally:
+            await pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
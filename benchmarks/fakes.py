@@ -0,0 +1,131 @@
+"""Local stand-ins for the Telegram Bot API, Mytonprovider and Toncenter.
+
+Each fake counts the calls it answers. The API fakes serve a
+SyntheticNetwork, so jobs see the same data the database was seeded from.
+"""
+
+import asyncio
+import itertools
+import time
+import typing as t
+from collections import Counter
+
+from aiohttp import web
+
+from .synthetic import SyntheticNetwork
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "Benchmark", "username": "benchmark_bot"}
+
+
+class FakeServer:
+
+    def __init__(self) -> None:
+        self.calls: Counter = Counter()
+
+    def setup(self, app: web.Application) -> None:
+        raise NotImplementedError
+
+    async def start(self, port: int) -> web.AppRunner:
+        return await serve(port, self)
+
+
+async def serve(port: int, *fakes: FakeServer) -> web.AppRunner:
+    """Serve several fakes from one local port."""
+    app = web.Application(client_max_size=64 * 1024**2)
+    for fake in fakes:
+        fake.setup(app)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+class FakeTelegram(FakeServer):
+    """Answers any Bot API method with a plausible result."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.webhook: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._message_ids = itertools.count(1)
+
+    def setup(self, app: web.Application) -> None:
+        app.router.add_post("/bot{token}/{method}", self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        self.calls[method] += 1
+        data = dict(await request.post())
+
+        result: t.Any = True
+        if method == "getMe":
+            result = BOT_USER
+        elif method == "setWebhook":
+            if not self.webhook.done():
+                self.webhook.set_result((data["url"], data.get("secret_token")))
+        elif method.startswith(("send", "edit")):
+            chat_id = int(data.get("chat_id") or 0)
+            result = {
+                "message_id": next(self._message_ids),
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": BOT_USER,
+                "text": data.get("text", ""),
+            }
+        return web.json_response({"ok": True, "result": result})
+
+
+class FakeMytonprovider(FakeServer):
+    """Serves ``/api/v1`` providers, telemetry and contracts."""
+
+    def __init__(self, network: SyntheticNetwork) -> None:
+        super().__init__()
+        self.network = network
+
+    def setup(self, app: web.Application) -> None:
+        app.router.add_post("/api/v1/providers/search", self.providers)
+        app.router.add_get("/api/v1/providers", self.telemetry)
+        app.router.add_post("/api/v1/contracts/bags", self.contracts)
+
+    async def providers(self, request: web.Request) -> web.Response:
+        self.calls["providers/search"] += 1
+        payload = await request.json()
+        return web.json_response(
+            self.network.providers_page(payload.get("offset", 0), payload.get("limit", 100))
+        )
+
+    async def telemetry(self, request: web.Request) -> web.Response:
+        self.calls["providers"] += 1
+        return web.Response(
+            body=self.network.telemetry_body(),
+            content_type="application/json",
+        )
+
+    async def contracts(self, request: web.Request) -> web.Response:
+        self.calls["contracts/bags"] += 1
+        payload = await request.json()
+        return web.json_response(
+            self.network.contracts_page(payload.get("offset", 0), payload.get("limit", 500))
+        )
+
+
+class FakeToncenter(FakeServer):
+    """Serves ``/api/v3/transactions`` for the network's provider wallets."""
+
+    def __init__(self, network: SyntheticNetwork) -> None:
+        super().__init__()
+        self.network = network
+
+    def setup(self, app: web.Application) -> None:
+        app.router.add_get("/api/v3/transactions", self.transactions)
+
+    async def transactions(self, request: web.Request) -> web.Response:
+        self.calls["transactions"] += 1
+        query = request.query
+        start_lt = query.get("start_lt")
+        return web.json_response(
+            self.network.transactions_page(
+                query["account"],
+                int(start_lt) if start_lt else None,
+                int(query.get("limit", 100)),
+            )
+        )
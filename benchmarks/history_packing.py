@@ -0,0 +1,83 @@
+"""Compare telemetry_history size and scan time for JSON vs packed storage.
+
+Usage: python -m benchmarks.history_packing [--providers 200] [--samples 30]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from ._env import setup_env
+
+DB_PATH = setup_env()
+
+from sqlalchemy import select, text  # noqa: E402
+
+from app.api.mytonprovider import Telemetry  # noqa: E402
+from app.database.database import Database  # noqa: E402
+from app.database.helpers import now_rounded_min  # noqa: E402
+from app.database.ingest import telemetry_params, write_telemetry  # noqa: E402
+from app.database.models import TelemetryHistoryModel  # noqa: E402
+from app.database.repack import PACKED_COLUMNS, repack  # noqa: E402
+from .synthetic import telemetry_payload  # noqa: E402
+
+_table = TelemetryHistoryModel.__table__
+
+
+async def fill(db: Database, providers: int, samples: int) -> None:
+    now = now_rounded_min()
+    for sample in range(samples):
+        params = [
+            telemetry_params(
+                Telemetry.model_validate(telemetry_payload(i, 1_700_000_000 + sample))
+            )
+            for i in range(providers)
+        ]
+        async with db.session_factory() as session:
+            async with session.begin():
+                await write_telemetry(session, params, now)
+
+
+async def scan(db: Database) -> tuple[float, list]:
+    cols = [_table.c.id, *(_table.c[name] for name in PACKED_COLUMNS)]
+    started = time.perf_counter()
+    async with db.session_factory() as session:
+        rows = (await session.execute(select(*cols).order_by(_table.c.id))).all()
+    return time.perf_counter() - started, [tuple(row) for row in rows]
+
+
+async def measure(db: Database) -> dict:
+    async with db.engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM"))
+        await conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+    elapsed, rows = await scan(db)
+    return {
+        "db_bytes": os.path.getsize(DB_PATH),
+        "scan_ms": round(elapsed * 1000, 2),
+        "rows": rows,
+    }
+
+
+async def main(providers: int, samples: int) -> None:
+    db = Database()
+    await db.start()
+    await fill(db, providers, samples)
+
+    plain = await measure(db)
+    await repack(db, packed=True)
+    packed = await measure(db)
+    await db.shutdown()
+
+    assert plain.pop("rows") == packed.pop("rows"), "packed rows decode differently"
+    print(json.dumps({"rows": providers * samples, "json": plain, "packed": packed}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--providers", type=int, default=200)
+    parser.add_argument("--samples", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(main(args.providers, args.samples))
@@ -0,0 +1,115 @@
+"""Render every alerts.* template in every locale, parsed per call vs precompiled.
+
+Before timing, renders locale-aware filters in all locales concurrently
+and checks every result against a sequential render.
+
+Usage: python -m benchmarks.i18n_render [--rounds 200]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from ._env import setup_env
+
+setup_env()
+
+from app.bot.utils.i18n import I18N  # noqa: E402
+from .synthetic import pubkey_for  # noqa: E402
+
+BAGS = [pubkey_for(i) for i in range(5)]
+
+CONTEXT = {
+    "provider": SimpleNamespace(pubkey=pubkey_for(0)),
+    "report": {
+        "start_date": "2025-01-01",
+        "end_date": "2025-01-31",
+        "earned_nanoton": 12_345_000_000,
+        "traffic_in_bytes": 3 * 10**12,
+        "traffic_out_bytes": 5 * 10**11,
+        "used_space_bytes": 7 * 10**12,
+    },
+    "service_name": "ton-storage",
+    "added_count": 7,
+    "added_list": BAGS,
+    "removed_count": 2,
+    "removed_list": BAGS[:2],
+    "failed_count": 6,
+    "failed_list": BAGS,
+    "recovered_count": 1,
+    "recovered_list": BAGS[:1],
+}
+
+
+def alert_templates(i18n: I18N):
+    """(locale, key, source) for every alerts.* template."""
+    return [
+        (locale, key, source)
+        for locale, bundle in i18n.bundles.items()
+        for key, source in bundle.strings.items()
+        if key.startswith("alerts.")
+    ]
+
+
+async def render_parsed(i18n: I18N, keys) -> None:
+    for locale, _, source in keys:
+        env = i18n.bundles[locale].env
+        await env.from_string(source).render_async(**CONTEXT)
+
+
+async def render_compiled(i18n: I18N, keys) -> None:
+    for locale, key, _ in keys:
+        await i18n.bundles[locale].templates[key].render_async(**CONTEXT)
+
+
+async def check_concurrent(i18n: I18N, tasks_per_locale: int = 50) -> None:
+    source = "{{ ts|ago }} / {{ seconds|durationformat }}"
+    kwargs = {"ts": datetime.now() - timedelta(hours=5), "seconds": 90_000}
+    expected = {
+        locale: await i18n.localizer(locale)(default=source, **kwargs)
+        for locale in i18n.bundles
+    }
+
+    async def render(locale: str) -> str:
+        await asyncio.sleep(0)
+        return await i18n.localizer(locale)(default=source, **kwargs)
+
+    jobs = [locale for locale in i18n.bundles for _ in range(tasks_per_locale)]
+    results = await asyncio.gather(*(render(locale) for locale in jobs))
+    mismatches = [
+        (locale, got) for locale, got in zip(jobs, results) if got != expected[locale]
+    ]
+    if mismatches:
+        raise AssertionError(f"Cross-locale renders: {mismatches[:5]}")
+    print(f"concurrent renders: {len(jobs)} across {len(expected)} locales, all match")
+
+
+async def measure(render, i18n: I18N, keys, rounds: int) -> float:
+    await render(i18n, keys)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await render(i18n, keys)
+    return (time.perf_counter() - started) / (rounds * len(keys)) * 1e6
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    i18n = I18N()
+    keys = alert_templates(i18n)
+    await check_concurrent(i18n)
+    print(f"{len(keys)} templates across {len(i18n.bundles)} locales")
+
+    parsed = await measure(render_parsed, i18n, keys, args.rounds)
+    compiled = await measure(render_compiled, i18n, keys, args.rounds)
+    print(f"from_string per render: {parsed:8.1f} us/render")
+    print(f"precompiled:            {compiled:8.1f} us/render")
+    print(f"speedup:                {parsed / compiled:8.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
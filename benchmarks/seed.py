@@ -0,0 +1,156 @@
+"""Fill a database with a SyntheticNetwork's current state and history.
+
+History is hourly for the network's ``hours``, like rows left behind by
+the downsample jobs. Import after ``setup_env()``.
+"""
+
+import copy
+import typing as t
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.alert.thresholds import THRESHOLDS
+from app.alert.types import AlertTypes
+from app.api.mytonprovider import Provider, Telemetry
+from app.config import TIMEZONE
+from app.database.database import Database
+from app.database.helpers import round_to_hour
+from app.database.ingest import telemetry_params, write_telemetry
+from app.database.models import (
+    ContractModel,
+    ProviderHistoryModel,
+    ProviderModel,
+    TelemetryHistoryModel,
+    UserAlertSettingModel,
+    UserModel,
+    UserSubscriptionModel,
+    WalletHistoryModel,
+    WalletModel,
+)
+from .synthetic import SyntheticNetwork, address_for
+
+CHUNK = 5000
+
+
+async def _insert(session: AsyncSession, table: t.Any, rows: t.List[dict]) -> None:
+    for start in range(0, len(rows), CHUNK):
+        await session.execute(insert(table), rows[start:start + CHUNK])
+
+
+def history_hours(network: SyntheticNetwork) -> t.List[datetime]:
+    """Hourly timestamps older than the downsample window, oldest first."""
+    now = datetime.fromtimestamp(network.started, TIMEZONE)
+    last = round_to_hour(now) - timedelta(hours=2)
+    return [last - timedelta(hours=h) for h in range(network.hours - 1, -1, -1)]
+
+
+def telemetry_sample(params: t.Dict[str, t.Any], hour: int, at: datetime) -> t.Dict[str, t.Any]:
+    """A copy of ``params`` as reported ``hour`` hours into the history."""
+    sample = {**params, "storage": copy.deepcopy(params["storage"])}
+    sample["timestamp"] = int(at.timestamp())
+    sample["bytes_recv"] = params["bytes_recv"] + hour * 3_600_000_000
+    sample["bytes_sent"] = params["bytes_sent"] + hour * 7_200_000_000
+    provider = sample["storage"]["provider"]
+    provider["used_provider_space"] = round(provider["used_provider_space"] + hour * 0.05, 2)
+    sample["archived_at"] = at
+    return sample
+
+
+async def seed_providers(session: AsyncSession, network: SyntheticNetwork) -> None:
+    now = datetime.fromtimestamp(network.now, TIMEZONE)
+    providers = [Provider.model_validate(p).model_dump() for p in network.provider_payloads()]
+    await _insert(
+        session,
+        ProviderModel.__table__,
+        [{**p, "updated_at": now} for p in providers],
+    )
+    await _insert(
+        session,
+        ProviderHistoryModel.__table__,
+        [{**p, "archived_at": at} for at in history_hours(network) for p in providers],
+    )
+
+
+async def seed_telemetry(session: AsyncSession, network: SyntheticNetwork) -> None:
+    current = [
+        telemetry_params(Telemetry.model_validate(payload))
+        for payload in network.telemetry_payloads()
+    ]
+    history = []
+    hours = history_hours(network)
+    for params in current:
+        for hour, at in enumerate(hours):
+            history.append(telemetry_sample(params, hour, at))
+    await _insert(session, TelemetryHistoryModel.__table__, history)
+    await write_telemetry(session, current, datetime.fromtimestamp(network.now, TIMEZONE))
+
+
+async def seed_wallets(session: AsyncSession, network: SyntheticNetwork) -> None:
+    wallets, history = [], []
+    hours = history_hours(network)
+    for index, pubkey in enumerate(network.pubkeys):
+        address = address_for("provider", index)
+        earned = balance = 0
+        for hour, at in enumerate(hours):
+            earned_hour = (index % 7 + 1) * 10**7
+            earned += earned_hour
+            balance += earned_hour
+            history.append({
+                "provider_pubkey": pubkey,
+                "address": address,
+                "earned": earned_hour,
+                "balance": balance,
+                "last_lt": network.base_lt - len(hours) + hour,
+                "archived_at": at,
+            })
+        wallets.append({
+            "provider_pubkey": pubkey,
+            "address": address,
+            "earned": earned,
+            "balance": balance,
+            "last_lt": network.base_lt,
+        })
+    await _insert(session, WalletModel.__table__, wallets)
+    await _insert(session, WalletHistoryModel.__table__, history)
+
+
+async def seed_contracts(session: AsyncSession, network: SyntheticNetwork) -> None:
+    await _insert(session, ContractModel.__table__, list(network.contracts.values()))
+
+
+async def seed_users(session: AsyncSession, network: SyntheticNetwork) -> None:
+    types = [alert_type.value for alert_type in AlertTypes]
+    created_at = datetime.fromtimestamp(network.started, TIMEZONE)
+    users, settings, subscriptions = [], [], []
+    for user_id, language_code, pubkeys in network.subscriptions():
+        users.append({
+            "user_id": user_id,
+            "username": f"user{user_id}",
+            "full_name": f"User {user_id}",
+            "language_code": language_code,
+            "created_at": created_at,
+        })
+        settings.append({
+            "user_id": user_id,
+            "enabled": True,
+            "types": types,
+            "thresholds_data": THRESHOLDS,
+        })
+        subscriptions.extend(
+            {"user_id": user_id, "provider_pubkey": pubkey} for pubkey in pubkeys
+        )
+    await _insert(session, UserModel.__table__, users)
+    await _insert(session, UserAlertSettingModel.__table__, settings)
+    await _insert(session, UserSubscriptionModel.__table__, subscriptions)
+
+
+async def seed_database(db: Database, network: SyntheticNetwork) -> None:
+    async with db.session_factory() as session:
+        async with session.begin():
+            await seed_providers(session, network)
+            await seed_telemetry(session, network)
+            await seed_wallets(session, network)
+            await seed_contracts(session, network)
+            await seed_users(session, network)
@@ -0,0 +1,483 @@
+"""Reproducible scenarios for the jobs, alerts and the provider menu.
+
+Seeds a fresh SQLite database from a SyntheticNetwork and serves the same
+network from fake Mytonprovider, Toncenter and Telegram endpoints on
+--port, so every run of a scale and seed starts from the same state. The
+sync scenarios advance the network one cycle before each round. A round
+records wall time, SQL statements and SQL time, and the calls made to
+the fake APIs; results are written as JSON for ``compare``.
+
+Usage: python -m benchmarks.suite run [--scale small|medium|large]
+       [--providers N] [--contracts M] [--subscribers K] [--hours H]
+       [--seed 1] [--rounds 3] [--workers 0] [--port 8090]
+       [--scenario NAME ...] [--output results.json]
+       python -m benchmarks.suite compare BASE.json HEAD.json [--threshold 0.2]
+
+The metrics cache needs Redis at REDIS_URL (database 15 by default). Set
+BENCH_DB_URL to run against another database, e.g. a scratch PostgreSQL.
+"""
+
+from ._env import setup_env
+
+setup_env()
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import logging  # noqa: E402
+import math  # noqa: E402
+import platform  # noqa: E402
+import statistics  # noqa: E402
+import subprocess  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+import typing as t  # noqa: E402
+from dataclasses import dataclass  # noqa: E402
+from datetime import timedelta  # noqa: E402
+from types import SimpleNamespace  # noqa: E402
+
+from aiogram import Bot  # noqa: E402
+from aiogram.client.default import DefaultBotProperties  # noqa: E402
+from aiogram.client.session.aiohttp import AiohttpSession  # noqa: E402
+from aiogram.client.telegram import TelegramAPIServer  # noqa: E402
+from aiohttp import web  # noqa: E402
+from redis.asyncio import Redis  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from sulguk import SULGUK_PARSE_MODE, AiogramSulgukMiddleware  # noqa: E402
+
+from app.alert.manager import AlertManager  # noqa: E402
+from app.api.mytonprovider import MytonproviderClient, Provider, Telemetry  # noqa: E402
+from app.api.toncenter import ToncenterClient  # noqa: E402
+from app.bot.broadcaster import Broadcaster  # noqa: E402
+from app.bot.dialogs.consts import PROVIDER_TABS  # noqa: E402
+from app.bot.dialogs.getters import provider_menu  # noqa: E402
+from app.bot.utils.i18n import I18N  # noqa: E402
+from app.bot.utils.profiles import UserProfile  # noqa: E402
+from app.bot.utils.snapshots import ProvidersIndex  # noqa: E402
+from app.cache import CacheNamespaces, MetricsCache  # noqa: E402
+from app.config import BOT_TOKEN, REDIS_URL  # noqa: E402
+from app.context import Context, set_context  # noqa: E402
+from app.database.database import Database  # noqa: E402
+from app.database.helpers import now, round_to_hour  # noqa: E402
+from app.database.ingest import telemetry_params  # noqa: E402
+from app.database.models import (  # noqa: E402
+    BaseModel,
+    ProviderHistoryModel,
+    TelemetryHistoryModel,
+)
+from app.database.unitofwork import UnitOfWork  # noqa: E402
+from app.events import EventBus  # noqa: E402
+from app.monitoring import SqlProfiler  # noqa: E402
+from app.roles import Roles  # noqa: E402
+from app.runtime import CpuPool  # noqa: E402
+from app.scheduler.jobs import sync_bags  # noqa: E402
+from app.scheduler.jobs import (  # noqa: E402
+    downsample_providers_job,
+    downsample_telemetry_job,
+    monthly_report_job,
+    sync_bags_job,
+    sync_providers_job,
+    update_wallets_job,
+)
+
+from .fakes import FakeMytonprovider, FakeTelegram, FakeToncenter, serve  # noqa: E402
+from .seed import seed_database, telemetry_sample  # noqa: E402
+from .synthetic import SyntheticNetwork  # noqa: E402
+
+# providers, contracts, subscribers, hours of history
+SCALES: t.Dict[str, t.Tuple[int, int, int, int]] = {
+    "small": (50, 5_000, 200, 48),
+    "medium": (200, 50_000, 1_000, 24 * 45),
+    "large": (1_000, 200_000, 5_000, 24 * 45),
+}
+# Providers opened per provider_menu round, each on every tab.
+MENU_PROVIDERS = 20
+
+
+class Bench:
+    """The context, the network and the fakes the scenarios run against."""
+
+    def __init__(
+        self,
+        ctx: Context,
+        network: SyntheticNetwork,
+        fakes: t.Dict[str, t.Any],
+        runner: web.AppRunner,
+    ) -> None:
+        self.ctx = ctx
+        self.network = network
+        self.fakes = fakes
+        self.runner = runner
+
+    def calls(self) -> t.Dict[str, int]:
+        return {name: sum(fake.calls.values()) for name, fake in self.fakes.items()}
+
+
+@dataclass
+class Scenario:
+    name: str
+    run: t.Callable[[Bench], t.Awaitable[None]]
+    # Untimed setup before every round.
+    prepare: t.Optional[t.Callable[[Bench], t.Awaitable[None]]] = None
+
+
+SCENARIOS: t.Dict[str, Scenario] = {}
+
+
+def scenario(
+    name: str,
+    prepare: t.Optional[t.Callable[[Bench], t.Awaitable[None]]] = None,
+) -> t.Callable:
+    def decorator(run: t.Callable[[Bench], t.Awaitable[None]]) -> t.Callable:
+        SCENARIOS[name] = Scenario(name, run, prepare)
+        return run
+    return decorator
+
+
+async def advance(bench: Bench) -> None:
+    bench.network.advance()
+
+
+async def cold_cache(bench: Bench) -> None:
+    await bench.ctx.metrics_cache.bump(*CacheNamespaces)
+
+
+def minute_window() -> t.List[t.Any]:
+    """Per-minute timestamps of the hour the downsample jobs thin out."""
+    start = round_to_hour(now()) - timedelta(hours=2)
+    return [start + timedelta(minutes=m) for m in range(60)]
+
+
+async def fill_providers_window(bench: Bench) -> None:
+    providers = [Provider.model_validate(p).model_dump() for p in bench.network.provider_payloads()]
+    rows = [{**p, "archived_at": at} for at in minute_window() for p in providers]
+    async with UnitOfWork(bench.ctx.db.session_factory) as uow:
+        await uow.session.execute(insert(ProviderHistoryModel.__table__), rows)
+
+
+async def fill_telemetry_window(bench: Bench) -> None:
+    current = [
+        telemetry_params(Telemetry.model_validate(payload))
+        for payload in bench.network.telemetry_payloads()
+    ]
+    rows = [telemetry_sample(params, 0, at) for at in minute_window() for params in current]
+    async with UnitOfWork(bench.ctx.db.session_factory) as uow:
+        await uow.session.execute(insert(TelemetryHistoryModel.__table__), rows)
+
+
+@scenario("sync_providers", prepare=advance)
+async def run_sync_providers(bench: Bench) -> None:
+    await sync_providers_job(bench.ctx)
+
+
+@scenario("sync_bags", prepare=advance)
+async def run_sync_bags(bench: Bench) -> None:
+    await sync_bags_job(bench.ctx)
+
+
+@scenario("update_wallets", prepare=advance)
+async def run_update_wallets(bench: Bench) -> None:
+    await update_wallets_job(bench.ctx)
+
+
+@scenario("alerts_dispatch")
+async def run_alerts_dispatch(bench: Bench) -> None:
+    await AlertManager(bench.ctx).dispatch()
+
+
+@scenario("monthly_report")
+async def run_monthly_report(bench: Bench) -> None:
+    await monthly_report_job(bench.ctx)
+
+
+@scenario("downsample_telemetry", prepare=fill_telemetry_window)
+async def run_downsample_telemetry(bench: Bench) -> None:
+    await downsample_telemetry_job(bench.ctx)
+
+
+@scenario("downsample_providers", prepare=fill_providers_window)
+async def run_downsample_providers(bench: Bench) -> None:
+    await downsample_providers_job(bench.ctx)
+
+
+async def first_subscriber(bench: Bench) -> UserProfile:
+    user_id, _, _ = next(bench.network.subscriptions())
+    async with UnitOfWork(bench.ctx.db.session_factory) as uow:
+        return UserProfile.from_model(await uow.user.get(user_id=user_id))
+
+
+async def open_provider_menu(
+    ctx: Context,
+    user: UserProfile,
+    pubkey: str,
+    tab: str,
+    read_session_factory: t.Optional[t.Any] = None,
+) -> None:
+    """Render one provider tab the way a click does, in one update."""
+    read_session_factory = read_session_factory or ctx.db.read_session_factory
+    async with (
+        UnitOfWork(ctx.db.session_factory, lazy=True) as uow,
+        UnitOfWork(read_session_factory, lazy=True) as read_uow,
+    ):
+        widget_data: t.Dict[str, t.Any] = {}
+        manager = SimpleNamespace(
+            start_data={"provider_pubkey": pubkey, "provider_tab": tab},
+            dialog_data={},
+            middleware_data={"user_model": user, "uow": uow, "read_uow": read_uow, "ctx": ctx},
+            current_context=lambda: SimpleNamespace(widget_data=widget_data),
+        )
+        await provider_menu(manager)
+
+
+async def open_provider_menus(bench: Bench) -> None:
+    """Render every tab of the first providers, one update each."""
+    user = await first_subscriber(bench)
+    for pubkey in bench.network.pubkeys[:MENU_PROVIDERS]:
+        for tab in PROVIDER_TABS:
+            await open_provider_menu(bench.ctx, user, pubkey, tab)
+
+
+@scenario("provider_menu", prepare=cold_cache)
+async def run_provider_menu(bench: Bench) -> None:
+    await open_provider_menus(bench)
+
+
+@scenario("provider_menu_cached")
+async def run_provider_menu_cached(bench: Bench) -> None:
+    await open_provider_menus(bench)
+
+
+async def measure(bench: Bench, scenario: Scenario) -> t.Dict[str, t.Any]:
+    if scenario.prepare is not None:
+        await scenario.prepare(bench)
+
+    before = bench.calls()
+    # The profile follows the scenario's task and the tasks it starts.
+    profiler = SqlProfiler(math.inf)
+    handle = profiler.begin(0)
+    profile = handle[0]
+    started = time.perf_counter()
+    try:
+        await scenario.run(bench)
+    finally:
+        elapsed = time.perf_counter() - started
+        profiler.finish(handle, scenario.name)
+    after = bench.calls()
+
+    return {
+        "ms": round(elapsed * 1000, 2),
+        "statements": profile.statements,
+        "rows": profile.rows,
+        "sql_ms": round(profile.seconds * 1000, 2),
+        "api_calls": after["mytonprovider"] + after["toncenter"]
+        - before["mytonprovider"] - before["toncenter"],
+        "telegram_calls": after["telegram"] - before["telegram"],
+    }
+
+
+def summarize(runs: t.List[t.Dict[str, t.Any]]) -> t.Dict[str, t.Any]:
+    timings = [run["ms"] for run in runs]
+    return {
+        "median_ms": round(statistics.median(timings), 2),
+        "best_ms": min(timings),
+        "statements": round(statistics.median(run["statements"] for run in runs)),
+        "sql_ms": round(statistics.median(run["sql_ms"] for run in runs), 2),
+        "runs": runs,
+    }
+
+
+def git_revision() -> t.Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+async def build_bench(args: argparse.Namespace) -> Bench:
+    network = SyntheticNetwork(
+        args.providers,
+        args.contracts,
+        args.subscribers,
+        args.hours,
+        seed=args.seed,
+    )
+    fakes = {
+        "mytonprovider": FakeMytonprovider(network),
+        "toncenter": FakeToncenter(network),
+        "telegram": FakeTelegram(),
+    }
+    runner = await serve(args.port, *fakes.values())
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    ctx = Context()
+    set_context(ctx)
+    ctx.role = Roles.ALL
+    ctx.db = Database()
+    ctx.series = None
+    ctx.events = EventBus()
+    ctx.redis = Redis.from_url(url=REDIS_URL)
+    ctx.metrics_cache = MetricsCache(ctx.redis)
+    ctx.i18n = I18N()
+    ctx.cpu = CpuPool(args.workers)
+    ctx.mytonprovider = MytonproviderClient(base_url=f"{base_url}/api/", rps=10_000)
+    ctx.toncenter = ToncenterClient(base_url=f"{base_url}/api", rps=10_000)
+    ctx.bot = Bot(
+        BOT_TOKEN,
+        session=AiohttpSession(api=TelegramAPIServer.from_base(base_url)),
+        default=DefaultBotProperties(
+            parse_mode=SULGUK_PARSE_MODE,
+            link_preview_is_disabled=True,
+        ),
+    )
+    ctx.bot.session.middleware(AiogramSulgukMiddleware())
+    ctx.broadcaster = Broadcaster(ctx.bot)
+    ctx.providers_index = ProvidersIndex()
+    ctx.started_at = time.time()
+
+    await ctx.redis.flushdb()
+    async with ctx.db.engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.drop_all)
+    await ctx.db.start()
+    await seed_database(ctx.db, network)
+    await ctx.providers_index.rebuild(ctx.db.session_factory)
+    ctx.cpu.start()
+    await ctx.mytonprovider.ensure_session()
+    await ctx.toncenter.ensure_session()
+    # Only the fakes are on the other end.
+    sync_bags.FETCH_PAGE_DELAY = 0
+    sync_bags.FETCH_RETRY_DELAY = 0
+    return Bench(ctx, network, fakes, runner)
+
+
+async def close_bench(bench: Bench) -> None:
+    ctx = bench.ctx
+    await ctx.mytonprovider.close()
+    await ctx.toncenter.close()
+    await ctx.cpu.shutdown()
+    await ctx.bot.session.close()
+    await ctx.i18n.shutdown()
+    await ctx.events.shutdown()
+    await ctx.db.shutdown()
+    await ctx.redis.aclose()
+    await bench.runner.cleanup()
+
+
+async def run(args: argparse.Namespace) -> t.Dict[str, t.Any]:
+    names = args.scenario or list(SCENARIOS)
+
+    started = time.perf_counter()
+    bench = await build_bench(args)
+    print(f"Seeded in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    results: t.Dict[str, t.Any] = {}
+    try:
+        for name in names:
+            runs = []
+            for _ in range(args.rounds):
+                runs.append(await measure(bench, SCENARIOS[name]))
+            results[name] = summarize(runs)
+            print(
+                f"{name:<22} median {results[name]['median_ms']:>10.1f} ms"
+                f"  {results[name]['statements']:>7} statements",
+                file=sys.stderr,
+            )
+    finally:
+        await close_bench(bench)
+
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": int(time.time()),
+            "scale": args.scale,
+            "providers": args.providers,
+            "contracts": args.contracts,
+            "subscribers": args.subscribers,
+            "hours": args.hours,
+            "seed": args.seed,
+            "rounds": args.rounds,
+            "workers": args.workers,
+        },
+        "scenarios": results,
+    }
+
+
+def compare(base_path: str, head_path: str, threshold: float) -> int:
+    """Print per-scenario changes; non-zero if any median slowed past the threshold."""
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(head_path) as f:
+        head = json.load(f)
+
+    params = ("providers", "contracts", "subscribers", "hours", "seed")
+    if any(base["meta"].get(p) != head["meta"].get(p) for p in params):
+        print("Warning: the results were produced with different parameters")
+
+    regressions = 0
+    print(f"{'scenario':<22} {'base ms':>10} {'head ms':>10} {'change':>8} {'statements':>17}")
+    for name, result in head["scenarios"].items():
+        previous = base["scenarios"].get(name)
+        if previous is None:
+            print(f"{name:<22} {'-':>10} {result['median_ms']:>10.1f}")
+            continue
+        change = result["median_ms"] / previous["median_ms"] - 1 if previous["median_ms"] else 0.0
+        slower = change > threshold
+        regressions += slower
+        print(
+            f"{name:<22} {previous['median_ms']:>10.1f} {result['median_ms']:>10.1f}"
+            f" {change:>+8.1%} {previous['statements']:>8} -> {result['statements']:<6}"
+            f"{'  SLOWER' if slower else ''}"
+        )
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the scenarios")
+    run_parser.add_argument("--scale", choices=SCALES, default="small")
+    run_parser.add_argument("--providers", type=int)
+    run_parser.add_argument("--contracts", type=int)
+    run_parser.add_argument("--subscribers", type=int)
+    run_parser.add_argument("--hours", type=int)
+    run_parser.add_argument("--seed", type=int, default=1)
+    run_parser.add_argument("--rounds", type=int, default=3)
+    run_parser.add_argument("--workers", type=int, default=0)
+    run_parser.add_argument("--port", type=int, default=8090)
+    run_parser.add_argument("--scenario", action="append", choices=SCENARIOS)
+    run_parser.add_argument("--output")
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        raise SystemExit(compare(args.base, args.head, args.threshold))
+
+    defaults = SCALES[args.scale]
+    for name, default in zip(("providers", "contracts", "subscribers", "hours"), defaults):
+        if getattr(args, name) is None:
+            setattr(args, name, default)
+
+    logging.basicConfig(level=logging.WARNING)
+    result = asyncio.run(run(args))
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""Deterministic synthetic data shaped like the Mytonprovider and Toncenter APIs.
+
+Payload builders depend only on their arguments. ``SyntheticNetwork``
+derives a whole network from a seed; only timestamps follow the clock.
+"""
+
+import json
+import random
+import time
+import typing as t
+
+REWARD_OPCODE = "0xa91baf56"
+PROOF_OPCODE = "0x48f548ce"
+LOCALES = ("en", "ru", "zh-TW")
+COUNTRIES = (
+    ("Germany", "DE", "Falkenstein", "Europe/Berlin"),
+    ("Finland", "FI", "Helsinki", "Europe/Helsinki"),
+    ("United States", "US", "Ashburn", "America/New_York"),
+    ("Singapore", "SG", "Singapore", "Asia/Singapore"),
+)
+# Reasons reported by provider checks; None means not checked yet.
+REASONS = (None, 0, 0, 0, 0, 0, 101, 201, 401)
+
+
+def pubkey_for(index: int) -> str:
+    return f"{index:064x}"
+
+
+def address_for(kind: str, index: int) -> str:
+    """A 48-character user-friendly-looking address, unique per kind."""
+    return f"EQ{kind[:2].upper()}{index:044x}"
+
+
+def telemetry_payload(
+    index: int,
+    timestamp: int,
+    rnd: t.Optional[random.Random] = None,
+) -> t.Dict[str, t.Any]:
+    rnd = rnd or random.Random(index)
+    pubkey = pubkey_for(index)
+
+    def triple(scale: float) -> t.List[float]:
+        return [round(rnd.random() * scale, 2) for _ in range(3)]
+
+    return {
+        "bytes_recv": index * 1_000_000 + timestamp,
+        "bytes_sent": index * 2_000_000 + timestamp,
+        "cpu_info": {
+            "cpu_count": rnd.choice([4, 8, 16, 32]),
+            "cpu_load": triple(8),
+            "cpu_name": "AMD EPYC 7502P 32-Core Processor",
+            "is_virtual": rnd.random() < 0.3,
+            "product_name": "Standard PC",
+        },
+        "disks_load": {"nvme0n1": triple(50), "sda": triple(10)},
+        "disks_load_percent": {"nvme0n1": triple(100), "sda": triple(100)},
+        "git_hashes": {"ton-storage": "a1b2c3d", "ton-storage-provider": "e4f5a6b"},
+        "iops": {"nvme0n1": triple(5000), "sda": triple(500)},
+        "net_load": triple(100),
+        "net_recv": triple(50),
+        "net_sent": triple(50),
+        "pings": {f"10.0.0.{i}": round(rnd.random() * 100, 2) for i in range(8)},
+        "pps": triple(10000),
+        "ram": {"total": 64.0, "usage": 32.0, "usage_percent": 50.0},
+        "storage": {
+            "disk_name": "/dev/nvme0n1",
+            "free_disk_space": 1200.0,
+            "provider": {
+                "max_bag_size_bytes": 40_000_000_000,
+                "pubkey": pubkey.upper(),
+                "service_uptime": timestamp - 1_700_000_000,
+                "total_provider_space": 2000.0,
+                "used_provider_space": round(rnd.random() * 2000, 2),
+            },
+            "pubkey": pubkey,
+            "service_uptime": timestamp - 1_700_000_000,
+            "total_disk_space": 4000.0,
+            "used_disk_space": 2800.0,
+        },
+        "swap": {"total": 8.0, "usage": 0.5, "usage_percent": 6.25},
+        "telemetry_pass": None,
+        "timestamp": timestamp,
+        "uname": {
+            "machine": "x86_64",
+            "release": "6.1.0-18-amd64",
+            "sysname": "Linux",
+            "version": "#1 SMP PREEMPT_DYNAMIC Debian 6.1.76-1",
+        },
+    }
+
+
+def provider_payload(index: int, timestamp: int) -> t.Dict[str, t.Any]:
+    rnd = random.Random(index)
+    country, iso, city, zone = COUNTRIES[index % len(COUNTRIES)]
+    online = rnd.random() < 0.9
+    return {
+        "location": {"country": country, "country_iso": iso, "city": city, "time_zone": zone},
+        "status": 0 if online else 2,
+        "pubkey": pubkey_for(index),
+        "address": address_for("provider", index),
+        "uptime": round(rnd.uniform(80, 100), 2),
+        "status_ratio": round(rnd.uniform(0.8, 1.0), 3),
+        "working_time": rnd.randint(86_400, 86_400 * 365),
+        "rating": round(rnd.uniform(0, 5), 2),
+        "max_span": 86_400 * 30,
+        "price": rnd.randint(1, 100) * 10**7,
+        "min_span": 3600,
+        "max_bag_size_bytes": 40_000_000_000,
+        "reg_time": 1_700_000_000 + index * 600,
+        "last_online_check_time": timestamp if online else timestamp - 7200,
+        "is_send_telemetry": True,
+        "telemetry": {
+            "storage_git_hash": "a1b2c3d",
+            "provider_git_hash": "e4f5a6b",
+            "qd64_disk_read_speed": "1.2 GiB/s",
+            "qd64_disk_write_speed": "800 MiB/s",
+            "country": country,
+            "isp": "Hetzner Online GmbH",
+            "cpu_name": "AMD EPYC 7502P 32-Core Processor",
+            "updated_at": timestamp,
+            "total_provider_space": 2000.0,
+            "used_provider_space": round(rnd.random() * 2000, 2),
+            "total_ram": 64.0,
+            "usage_ram": 32.0,
+            "ram_usage_percent": 50.0,
+            "speedtest_download": rnd.randint(100, 10_000) * 10**6,
+            "speedtest_upload": rnd.randint(100, 10_000) * 10**6,
+            "speedtest_ping": round(rnd.uniform(1, 50), 2),
+            "cpu_number": rnd.choice([4, 8, 16, 32]),
+            "cpu_is_virtual": rnd.random() < 0.3,
+        },
+    }
+
+
+def contract_payload(
+    index: int,
+    provider_pubkey: str,
+    rnd: random.Random,
+) -> t.Dict[str, t.Any]:
+    return {
+        "address": address_for("contract", index),
+        "provider_pubkey": provider_pubkey,
+        "bag_id": f"{index:064x}",
+        "owner_address": address_for("owner", index % 997),
+        "size": rnd.randint(1, 4000) * 10**6,
+        "reason": rnd.choice(REASONS),
+        "reason_timestamp": 1_700_000_000 + index,
+    }
+
+
+def message_payload(
+    lt: int,
+    timestamp: int,
+    opcode: t.Optional[str],
+    value: int,
+    fwd_fee: int,
+) -> t.Dict[str, t.Any]:
+    # Toncenter sends amounts as strings.
+    return {
+        "hash": f"m{lt:x}",
+        "source": None,
+        "destination": None,
+        "value": str(value),
+        "fwd_fee": str(fwd_fee),
+        "ihr_fee": "0",
+        "created_lt": str(lt),
+        "created_at": str(timestamp),
+        "opcode": opcode,
+        "ihr_disabled": True,
+        "bounce": False,
+        "bounced": False,
+        "import_fee": None,
+    }
+
+
+def transaction_payload(
+    account: str,
+    lt: int,
+    timestamp: int,
+    rnd: random.Random,
+) -> t.Dict[str, t.Any]:
+    kind = rnd.random()
+    out_msgs = []
+    if kind < 0.3:
+        in_msg = message_payload(lt, timestamp, REWARD_OPCODE, rnd.randint(1, 10**9), 0)
+    elif kind < 0.8:
+        in_msg = message_payload(lt, timestamp, None, 0, 0)
+        out_msgs.append(
+            message_payload(lt + 1, timestamp, PROOF_OPCODE, rnd.randint(1, 10**7), 10**5)
+        )
+    else:
+        in_msg = message_payload(lt, timestamp, None, rnd.randint(1, 10**10), 0)
+    return {
+        "account": account,
+        "hash": f"t{lt:x}",
+        "lt": str(lt),
+        "now": timestamp,
+        "orig_status": "active",
+        "end_status": "active",
+        "total_fees": str(rnd.randint(10**5, 10**6)),
+        "prev_trans_hash": f"t{lt - 2:x}",
+        "prev_trans_lt": str(lt - 2),
+        "description": {},
+        "in_msg": in_msg,
+        "out_msgs": out_msgs,
+        "account_state_before": None,
+        "account_state_after": None,
+        "mc_block_seqno": lt // 1000,
+    }
+
+
+class SyntheticNetwork:
+    """N providers, M contracts, K subscribers and H hours of history.
+
+    Every value is derived from ``seed``, so two runs with the same
+    arguments see the same network. Timestamps are anchored at the
+    current minute. ``advance()`` moves the network one sync cycle
+    forward: telemetry reports a minute later, a few contracts appear,
+    disappear or change their reason, and every wallet gets new
+    transactions. The changes of a cycle depend only on the seed and the
+    cycle number.
+    """
+
+    def __init__(
+        self,
+        providers: int,
+        contracts: int,
+        subscribers: int,
+        hours: int,
+        seed: int = 1,
+        transactions_per_cycle: int = 4,
+    ) -> None:
+        self.providers = providers
+        self.subscribers = subscribers
+        self.hours = hours
+        self.seed = seed
+        self.transactions_per_cycle = transactions_per_cycle
+
+        self.started = int(time.time()) // 60 * 60
+        self.cycle = 0
+
+        self.pubkeys = [pubkey_for(i) for i in range(providers)]
+        rnd = random.Random(seed)
+        # A few providers store most bags, like the real network.
+        weights = [1 / (i + 1) for i in range(providers)]
+        owners = rnd.choices(range(providers), weights=weights, k=contracts)
+        self.contracts: t.Dict[t.Tuple[str, str], t.Dict[str, t.Any]] = {}
+        for index, owner in enumerate(owners):
+            contract = contract_payload(index, self.pubkeys[owner], rnd)
+            self.contracts[(contract["address"], contract["provider_pubkey"])] = contract
+        self._next_contract = contracts
+        self._removed: t.List[t.Dict[str, t.Any]] = []
+
+        # Wallet chains start empty; seeded wallets point at this lt.
+        self.base_lt = 10**12
+        self.transactions: t.Dict[str, t.List[t.Dict[str, t.Any]]] = {
+            address_for("provider", i): [] for i in range(providers)
+        }
+        self._telemetry_body: t.Optional[t.Tuple[int, bytes]] = None
+
+    @property
+    def now(self) -> int:
+        return self.started + self.cycle * 60
+
+    def provider_payloads(self) -> t.List[t.Dict[str, t.Any]]:
+        return [provider_payload(i, self.now) for i in range(self.providers)]
+
+    def telemetry_payloads(self, timestamp: t.Optional[int] = None) -> t.List[t.Dict[str, t.Any]]:
+        timestamp = self.now if timestamp is None else timestamp
+        return [telemetry_payload(i, timestamp) for i in range(self.providers)]
+
+    def telemetry_body(self) -> bytes:
+        """The ``GET /providers`` response of the current cycle, encoded once."""
+        if self._telemetry_body is None or self._telemetry_body[0] != self.cycle:
+            body = json.dumps({"providers": self.telemetry_payloads()}).encode()
+            self._telemetry_body = self.cycle, body
+        return self._telemetry_body[1]
+
+    def subscriptions(self) -> t.Iterator[t.Tuple[int, str, t.List[str]]]:
+        """``(user_id, language_code, pubkeys)`` for every subscriber."""
+        rnd = random.Random(self.seed + 1)
+        for k in range(self.subscribers):
+            count = min(self.providers, 1 + k % 3)
+            pubkeys = [self.pubkeys[i] for i in rnd.sample(range(self.providers), count)]
+            yield 100_000 + k, LOCALES[k % len(LOCALES)], pubkeys
+
+    def advance(self) -> None:
+        self.cycle += 1
+        rnd = random.Random(self.seed * 1_000_003 + self.cycle)
+
+        keys = list(self.contracts)
+        churn = max(len(keys) // 200, 1)
+        for key in rnd.sample(keys, min(churn, len(keys))):
+            self._removed.append(self.contracts.pop(key))
+        for _ in range(min(churn // 2, len(self._removed))):
+            contract = self._removed.pop(rnd.randrange(len(self._removed)))
+            self.contracts[(contract["address"], contract["provider_pubkey"])] = contract
+        for _ in range(churn):
+            owner = self.pubkeys[rnd.randrange(self.providers)]
+            contract = contract_payload(self._next_contract, owner, rnd)
+            self._next_contract += 1
+            self.contracts[(contract["address"], contract["provider_pubkey"])] = contract
+        for key in rnd.sample(list(self.contracts), min(churn * 2, len(self.contracts))):
+            self.contracts[key] = {**self.contracts[key], "reason": rnd.choice(REASONS)}
+
+        lt = self.base_lt + self.cycle * 1000
+        for address, chain in self.transactions.items():
+            for i in range(self.transactions_per_cycle):
+                chain.append(transaction_payload(address, lt + i * 2, self.now - i, rnd))
+
+    def contracts_page(self, offset: int, limit: int) -> t.Dict[str, t.Any]:
+        contracts = list(self.contracts.values())
+        return {"contracts": contracts[offset:offset + limit], "total": len(contracts)}
+
+    def providers_page(self, offset: int, limit: int) -> t.Dict[str, t.Any]:
+        end = min(offset + limit, self.providers)
+        return {"providers": [provider_payload(i, self.now) for i in range(offset, end)]}
+
+    def transactions_page(
+        self,
+        account: str,
+        start_lt: t.Optional[int],
+        limit: int,
+    ) -> t.Dict[str, t.Any]:
+        chain = self.transactions.get(account, [])
+        if start_lt is not None:
+            chain = [tx for tx in chain if int(tx["lt"]) >= start_lt]
+        return {"transactions": chain[:limit]}
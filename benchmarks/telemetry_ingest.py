@@ -0,0 +1,97 @@
+"""Compare ORM merge ingest against the Core executemany path.
+
+Usage: python -m benchmarks.telemetry_ingest [--providers 1000] [--rounds 5]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from ._env import setup_env
+
+setup_env()
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.api.mytonprovider import TelemetryResponse  # noqa: E402
+from app.database.database import Database  # noqa: E402
+from app.database.helpers import now_rounded_min  # noqa: E402
+from app.database.ingest import (  # noqa: E402
+    delete_stale_telemetry,
+    telemetry_params,
+    write_telemetry,
+)
+from app.database.models import TelemetryHistoryModel, TelemetryModel  # noqa: E402
+from app.database.unitofwork import UnitOfWork  # noqa: E402
+from .synthetic import telemetry_payload  # noqa: E402
+
+
+async def orm_ingest(db: Database, response: TelemetryResponse) -> None:
+    now = now_rounded_min()
+    telemetry_models, history_models = [], []
+    for telemetry in response.providers:
+        data = telemetry.model_dump()
+        data["provider_pubkey"] = telemetry.storage.provider.pubkey.lower()
+        current, history = data.copy(), data.copy()
+        current["updated_at"] = now
+        history["archived_at"] = now
+        telemetry_models.append(TelemetryModel(**current))
+        history_models.append(TelemetryHistoryModel(**history))
+
+    async with UnitOfWork(db.session_factory) as uow:
+        await uow.telemetry_history.bulk_upsert(history_models)
+        await uow.telemetry.bulk_upsert(telemetry_models)
+        pubkeys = tuple({m.provider_pubkey for m in telemetry_models})
+        await uow.session.execute(
+            delete(TelemetryModel).where(~TelemetryModel.provider_pubkey.in_(pubkeys))
+        )
+
+
+async def core_ingest(db: Database, response: TelemetryResponse) -> None:
+    now = now_rounded_min()
+    params = [telemetry_params(telemetry) for telemetry in response.providers]
+    async with UnitOfWork(db.session_factory) as uow:
+        await write_telemetry(uow.session, params, now)
+        await delete_stale_telemetry(uow.session, (p["provider_pubkey"] for p in params))
+
+
+async def measure(db, ingest, response, rounds: int) -> list[float]:
+    await ingest(db, response)  # warm-up, also creates the current rows
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await ingest(db, response)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def main(providers: int, rounds: int) -> None:
+    db = Database()
+    await db.start()
+
+    timestamp = int(time.time())
+    response = TelemetryResponse.model_validate(
+        {"providers": [telemetry_payload(i, timestamp) for i in range(providers)]}
+    )
+
+    results = {}
+    for name, ingest in (("orm_merge", orm_ingest), ("core_executemany", core_ingest)):
+        timings = await measure(db, ingest, response, rounds)
+        results[name] = {
+            "providers": providers,
+            "rounds": rounds,
+            "best_ms": round(min(timings) * 1000, 2),
+            "mean_ms": round(sum(timings) / len(timings) * 1000, 2),
+        }
+
+    await db.shutdown()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--providers", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.providers, args.rounds))
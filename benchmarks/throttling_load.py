@@ -0,0 +1,96 @@
+"""Drive ThrottlingMiddleware with bursts from many users against a real Redis.
+
+Every simulated user sends ``--burst`` updates back to back, ``--rounds``
+times. With a cooldown rule only the first update of each burst may pass;
+the script checks that, and reports how many updates were answered from
+the local negative cache instead of Redis.
+
+Usage: python -m benchmarks.throttling_load [--users 50000] [--burst 5]
+       [--rounds 2] [--concurrency 500]
+(uses REDIS_URL, database 15 by default; its throttling:* keys are deleted)
+"""
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+from ._env import setup_env
+
+setup_env()
+
+from redis.asyncio import Redis  # noqa: E402
+
+from app.bot.middlewares.throttling import ThrottlingMiddleware  # noqa: E402
+from app.cache import RateLimiter  # noqa: E402
+from app.config import REDIS_URL  # noqa: E402
+
+
+class CountingLimiter(RateLimiter):
+    calls = 0
+
+    async def hit(self, name, subject, rule):
+        self.calls += 1
+        return await super().hit(name, subject, rule)
+
+
+async def clear(redis: Redis, prefix: str) -> None:
+    async for key in redis.scan_iter(match=f"{prefix}:*", count=1000):
+        await redis.delete(key)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--ttl", type=float, default=30.0)
+    args = parser.parse_args()
+
+    redis = Redis.from_url(REDIS_URL)
+    limiter = CountingLimiter(redis, prefix="throttling-load")
+    await clear(redis, limiter.prefix)
+
+    middleware = ThrottlingMiddleware(default_ttl=args.ttl)
+    middleware._limiter = limiter
+    passed = [0] * args.users
+
+    async def handler(_, data) -> None:
+        passed[data["event_from_user"].id] += 1
+
+    async def user_session(user_id: int) -> None:
+        data = {"event_from_user": SimpleNamespace(id=user_id)}
+        for _ in range(args.burst):
+            await middleware(handler, None, dict(data))
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(user_id: int) -> None:
+        async with semaphore:
+            await user_session(user_id)
+
+    try:
+        for round_no in range(1, args.rounds + 1):
+            calls_before = limiter.calls
+            started = time.perf_counter()
+            await asyncio.gather(*(limited(u) for u in range(args.users)))
+            elapsed = time.perf_counter() - started
+            updates = args.users * args.burst
+            print(
+                f"round {round_no}: {updates} updates in {elapsed:.2f}s "
+                f"({updates / elapsed:,.0f}/s), "
+                f"{limiter.calls - calls_before} Redis calls"
+            )
+
+        over = [u for u, count in enumerate(passed) if count != 1]
+        if over:
+            raise AssertionError(f"{len(over)} users passed != 1 time, e.g. {over[:5]}")
+        print(f"{args.users} users: exactly one update each passed the cooldown")
+    finally:
+        await clear(redis, limiter.prefix)
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
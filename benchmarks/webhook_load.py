@@ -0,0 +1,178 @@
+"""Replay synthetic updates into the bot's webhook, against a fake Telegram.
+
+Starts a fake Bot API on --telegram-port that answers every method and
+counts calls. Start the bot with
+
+    TELEGRAM_API_URL=http://127.0.0.1:8081 WEBHOOK_URL=http://127.0.0.1:8080 \\
+        python -m app
+
+and the harness picks up the webhook URL and secret from its setWebhook
+call (or pass --webhook). It then posts --updates updates from --users
+users with --concurrency requests in flight, and prints response codes,
+latency percentiles, throughput and the bot's pool stats once the
+accepted updates are handled.
+
+Usage: python -m benchmarks.webhook_load [--users 1000] [--updates 20000]
+       [--concurrency 200] [--telegram-port 8081] [--webhook URL]
+       [--drain-timeout 120]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import typing as t
+from collections import Counter
+
+from aiohttp import ClientSession
+
+from .fakes import BOT_USER, FakeTelegram
+
+
+def synthetic_update(update_id: int, user_id: int) -> t.Dict[str, t.Any]:
+    user = {
+        "id": user_id,
+        "is_bot": False,
+        "first_name": f"User {user_id}",
+        "username": f"user{user_id}",
+        "language_code": "en",
+    }
+    chat = {"id": user_id, "type": "private"}
+    now = int(time.time())
+    kind = random.random()
+    if kind < 0.4:
+        return {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": now,
+                "chat": chat,
+                "from": user,
+                "text": random.choice(["/start", "/help"]),
+                "entities": [{"type": "bot_command", "offset": 0, "length": 5}],
+            },
+        }
+    if kind < 0.8:
+        return {
+            "update_id": update_id,
+            "callback_query": {
+                "id": str(update_id),
+                "from": user,
+                "chat_instance": str(user_id),
+                "data": "hide",
+                "message": {
+                    "message_id": update_id,
+                    "date": now,
+                    "chat": chat,
+                    "from": BOT_USER,
+                    "text": "...",
+                },
+            },
+        }
+    return {
+        "update_id": update_id,
+        "inline_query": {
+            "id": str(update_id),
+            "from": user,
+            "query": random.choice(["providers", "list providers", "providers 00"]),
+            "offset": "",
+            "chat_type": "sender",
+        },
+    }
+
+
+def percentile(values: t.List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+async def replay(
+    url: str,
+    secret: t.Optional[str],
+    users: int,
+    updates: int,
+    concurrency: int,
+    drain_timeout: float,
+) -> None:
+    headers = {"Content-Type": "application/json"}
+    if secret:
+        headers["X-Telegram-Bot-Api-Secret-Token"] = secret
+
+    statuses: Counter = Counter()
+    latencies: t.List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with ClientSession(headers=headers) as http:
+
+        async def post(update_id: int) -> None:
+            body = json.dumps(synthetic_update(update_id, random.randint(1, users)))
+            async with semaphore:
+                started = time.perf_counter()
+                async with http.post(url, data=body) as response:
+                    await response.read()
+                    statuses[response.status] += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(post(i) for i in range(1, updates + 1)))
+        elapsed = time.perf_counter() - started
+
+        # Accepted updates are still being handled; wait for the pool to idle.
+        deadline = time.perf_counter() + drain_timeout
+        while True:
+            async with http.get(f"{url}/stats") as response:
+                stats = await response.json()
+            if not (stats["queued"] or stats["busy"]) or time.perf_counter() > deadline:
+                break
+            await asyncio.sleep(0.5)
+        drained = time.perf_counter() - started
+
+    print(f"{updates} updates from {users} users posted in {elapsed:.2f}s ({updates / elapsed:,.0f}/s)")
+    print(f"accepted updates handled after {drained:.2f}s ({stats['processed'] / drained:,.0f}/s)")
+    print(f"responses: {dict(statuses)}")
+    print(
+        "latency ms: "
+        f"p50={percentile(latencies, 0.5) * 1000:.1f} "
+        f"p99={percentile(latencies, 0.99) * 1000:.1f} "
+        f"max={max(latencies, default=0) * 1000:.1f}"
+    )
+    print(f"pool: {json.dumps(stats)}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--updates", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--telegram-port", type=int, default=8081)
+    parser.add_argument("--webhook", help="skip waiting for setWebhook")
+    parser.add_argument("--secret")
+    parser.add_argument("--drain-timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    telegram = FakeTelegram()
+    runner = await telegram.start(args.telegram_port)
+    try:
+        if args.webhook:
+            url, secret = args.webhook, args.secret
+        else:
+            print(f"fake Telegram on :{args.telegram_port}, waiting for setWebhook...")
+            url, secret = await telegram.webhook
+        await replay(
+            url,
+            secret,
+            args.users,
+            args.updates,
+            args.concurrency,
+            args.drain_timeout,
+        )
+        print(f"Bot API calls: {dict(telegram.calls.most_common())}")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
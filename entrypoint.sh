@@ -3,4 +3,4 @@ set -e
 
 alembic upgrade head
 
-exec python -m app
+exec python -m app "$@"